@@ -0,0 +1,305 @@
+"""
+FFmpeg helpers shared by the baby tools
+
+Encoder selection, stream probing and clip concatenation used by both
+BabyCapCut and BabyOpusClip:
+- H.264 encoder detection and encoder options
+- ffprobe stream layout and duration
+- Lossless joins through the concat demuxer, with the file list on stdin
+- Re-encoded joins through the concat filter or xfade crossfades
+"""
+
+import functools
+import json
+import os
+import subprocess
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+def nvenc_args(preset: str = 'p4', cq: int = 23, tune: str = 'hq') -> List[str]:
+    """
+    Return h264_nvenc options for VBR constant-quality encoding.
+
+    -b:v 0 lifts NVENC's default bitrate cap, which would otherwise limit
+    quality below the -cq target on detailed footage.
+    """
+    return ['-preset', preset, '-tune', tune, '-rc', 'vbr', '-cq', str(cq), '-b:v', '0']
+
+
+# H.264 encoders in preference order, with rate control roughly matching
+# libx264's default quality; the last entry is the software fallback
+H264_ENCODERS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ('h264_nvenc', tuple(nvenc_args())),
+    ('h264_qsv', ('-preset', 'fast', '-global_quality', '23')),
+    ('libx264', ('-preset', 'fast')),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _list_encoders(ffmpeg_path: str) -> str:
+    """Return an FFmpeg binary's -encoders listing, empty if it can't run."""
+    try:
+        return subprocess.run(
+            [ffmpeg_path, '-hide_banner', '-encoders'],
+            capture_output=True, text=True, timeout=30
+        ).stdout
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug("Encoder listing failed", ffmpeg=ffmpeg_path, error=str(e))
+        return ''
+
+
+@functools.lru_cache(maxsize=None)
+def encoder_works(ffmpeg_path: str, encoder: str) -> bool:
+    """
+    Check whether an FFmpeg binary can encode with a given encoder.
+
+    FFmpeg builds list hardware encoders whether or not a device is present,
+    so a listed encoder is confirmed with a one-frame test encode.
+    """
+    if encoder not in _list_encoders(ffmpeg_path):
+        return False
+    try:
+        probe = subprocess.run([
+            ffmpeg_path, '-hide_banner', '-v', 'error',
+            '-f', 'lavfi', '-i', 'color=c=black:s=256x256:d=0.1',
+            '-frames:v', '1',
+            '-c:v', encoder,
+            '-f', 'null', '-'
+        ], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.debug("Encoder test failed", encoder=encoder, error=str(e))
+        return False
+    if probe.returncode != 0:
+        return False
+    logger.info("Encoder available", encoder=encoder)
+    return True
+
+
+def detect_h264_encoder(ffmpeg_path: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Pick the fastest working H.264 encoder for an FFmpeg binary.
+
+    Returns:
+        (encoder name, encoder options) from H264_ENCODERS; libx264 if no
+        hardware encoder works
+    """
+    for name, args in H264_ENCODERS[:-1]:
+        if encoder_works(ffmpeg_path, name):
+            return name, args
+    return H264_ENCODERS[-1]
+
+
+def escape_concat_path(path: str) -> str:
+    """
+    Escape a path for a single-quoted concat demuxer 'file' line.
+
+    A quote can't appear inside quotes, so it closes the string, adds an
+    escaped quote and reopens it.
+    """
+    return path.replace("'", "'\\''")
+
+
+def probe_streams(ffprobe_path: str, video_path: str) -> Optional[Dict]:
+    """
+    Probe the stream layout and duration of a video.
+
+    Returns:
+        Dict with 'signature' (per-stream parameters concat copying needs
+        to match), 'duration', 'width', 'height', 'frame_rate' and
+        'has_audio', or None if the file couldn't be probed
+    """
+    try:
+        result = subprocess.run([
+            ffprobe_path, '-v', 'error',
+            '-show_entries',
+            'stream=codec_type,codec_name,width,height,r_frame_rate,'
+            'sample_rate,channels,time_base:format=duration',
+            '-of', 'json',
+            video_path
+        ], capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            return None
+        info = json.loads(result.stdout)
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        logger.debug("Stream probe failed", video=video_path, error=str(e))
+        return None
+
+    streams = info.get('streams', [])
+    video = next((stream for stream in streams if stream.get('codec_type') == 'video'), None)
+    if video is None:
+        return None
+
+    frame_rate = video.get('r_frame_rate') or '30/1'
+    if frame_rate.startswith('0/'):
+        frame_rate = '30/1'
+
+    return {
+        'signature': tuple(
+            (
+                stream.get('codec_type'), stream.get('codec_name'),
+                stream.get('width'), stream.get('height'),
+                stream.get('sample_rate'), stream.get('channels'),
+                stream.get('time_base')
+            )
+            for stream in streams
+        ),
+        'duration': float(info.get('format', {}).get('duration', 0) or 0),
+        'width': video.get('width'),
+        'height': video.get('height'),
+        'frame_rate': frame_rate,
+        'has_audio': any(stream.get('codec_type') == 'audio' for stream in streams),
+    }
+
+
+def join_command(
+    ffmpeg_path: str,
+    video_paths: List[str],
+    probes: List[Optional[Dict]],
+    output_path: str,
+    encoder_args: Sequence[str],
+    transition_duration: float = 0.0,
+    decode_args: Sequence[str] = (),
+    output_args: Sequence[str] = (),
+) -> List[str]:
+    """
+    Build an FFmpeg command that re-encodes clips into one video.
+
+    Every clip is scaled and padded to the first clip's frame size and
+    frame rate. With a transition, neighbours are joined by xfade and
+    acrossfade; otherwise by the concat filter. Audio is kept only if
+    every clip has an audio stream.
+
+    Args:
+        ffmpeg_path: Path to ffmpeg executable
+        video_paths: Clips to join, in order
+        probes: probe_streams() result for each clip
+        output_path: Output video path
+        encoder_args: Video encoder options, starting with '-c:v'
+        transition_duration: Crossfade length in seconds (0 for hard cuts)
+        decode_args: Options placed before each '-i'
+        output_args: Options placed just before the output path
+    """
+    first = probes[0] or {}
+    width, height = first.get('width') or 1920, first.get('height') or 1080
+    frame_rate = first.get('frame_rate') or '30/1'
+    with_audio = all(probe and probe['has_audio'] for probe in probes)
+
+    command = [ffmpeg_path, '-y']
+    filters = []
+    for i, path in enumerate(video_paths):
+        command += [*decode_args, '-i', path]
+        filters.append(
+            f'[{i}:v]scale={width}:{height}:force_original_aspect_ratio=decrease,'
+            f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,'
+            f'fps={frame_rate},format=yuv420p,settb=AVTB[v{i}]'
+        )
+
+    count = len(video_paths)
+    if transition_duration > 0:
+        # xfade offsets are measured on the joined timeline, which loses
+        # one transition's worth of time at every join
+        durations = [probe['duration'] for probe in probes]
+        fade = min(transition_duration, min(durations) / 2)
+        video_label, audio_label = 'v0', '0:a'
+        offset = 0.0
+        for i in range(1, count):
+            offset += durations[i - 1] - fade
+            filters.append(
+                f'[{video_label}][v{i}]xfade=transition=fade:'
+                f'duration={fade:.3f}:offset={offset:.3f}[x{i}]'
+            )
+            video_label = f'x{i}'
+            if with_audio:
+                filters.append(f'[{audio_label}][{i}:a]acrossfade=d={fade:.3f}[a{i}]')
+                audio_label = f'a{i}'
+        video_out, audio_out = f'[{video_label}]', f'[{audio_label}]'
+    else:
+        labels = ''.join(
+            f'[v{i}][{i}:a]' if with_audio else f'[v{i}]' for i in range(count)
+        )
+        outputs = '[v][a]' if with_audio else '[v]'
+        filters.append(f'{labels}concat=n={count}:v=1:a={int(with_audio)}{outputs}')
+        video_out, audio_out = '[v]', '[a]'
+
+    command += ['-filter_complex', ';'.join(filters), '-map', video_out]
+    if with_audio:
+        command += ['-map', audio_out, '-c:a', 'aac']
+    return command + [*encoder_args, *output_args, output_path]
+
+
+def concatenate(
+    ffmpeg_path: str,
+    ffprobe_path: str,
+    video_paths: List[str],
+    output_path: str,
+    encoder_args: Sequence[str],
+    transition_duration: float = 0.0,
+    decode_args: Sequence[str] = (),
+    output_args: Sequence[str] = (),
+    copy_args: Optional[Sequence[str]] = None,
+) -> Optional[subprocess.CompletedProcess]:
+    """
+    Join clips into one video with as little re-encoding as possible.
+
+    Without transitions, clips whose streams match are joined by the concat
+    demuxer with no re-encode; mismatched clips go through the concat
+    filter. Crossfades are rendered with xfade/acrossfade in a single pass.
+
+    Args:
+        ffmpeg_path: Path to ffmpeg executable
+        ffprobe_path: Path to ffprobe executable
+        video_paths: Clips to join, in order
+        output_path: Output video path
+        encoder_args: Video encoder options for re-encoded joins
+        transition_duration: Crossfade length in seconds (0 for hard cuts)
+        decode_args: Options placed before each '-i' of re-encoded joins
+        output_args: Options placed just before the output path
+        copy_args: Output options for stream-copy joins instead of
+            output_args, which may hold encoder-only options; defaults to
+            output_args
+
+    Returns:
+        The finished FFmpeg process, or None if crossfade durations
+        couldn't be probed
+    """
+    probes = [probe_streams(ffprobe_path, path) for path in video_paths]
+
+    if transition_duration <= 0 or len(video_paths) == 1:
+        signatures = [probe['signature'] if probe else None for probe in probes]
+        if None in signatures or len(set(signatures)) == 1:
+            # Matching streams concatenate losslessly; the list is fed to
+            # the concat demuxer on stdin, so no temp file is needed
+            cwd = os.getcwd()
+            concat_list = ''.join(
+                f"file '{escape_concat_path(os.path.join(cwd, path))}'\n"
+                for path in video_paths
+            )
+            return subprocess.run([
+                ffmpeg_path, '-y',
+                '-f', 'concat',
+                '-safe', '0',
+                '-protocol_whitelist', 'pipe,file',
+                '-i', 'pipe:0',
+                '-c', 'copy',
+                *(output_args if copy_args is None else copy_args),
+                output_path
+            ], input=concat_list, capture_output=True, text=True, timeout=600)
+
+        # Stream copy would corrupt mismatched clips; re-encode instead
+        logger.info("Clip streams differ, re-encoding concatenation", clips=len(video_paths))
+        transition_duration = 0.0
+    elif None in probes:
+        logger.error("Could not probe clip durations for crossfade")
+        return None
+
+    return subprocess.run(
+        join_command(
+            ffmpeg_path, video_paths, probes, output_path, encoder_args,
+            transition_duration, decode_args, output_args,
+        ),
+        capture_output=True, text=True, timeout=600 * len(video_paths)
+    )
@@ -4,45 +4,676 @@ Audio Processing Tools
 Provides wrappers for:
 - Pydub: Audio manipulation (trim, adjust volume, convert formats)
 - Librosa: Audio analysis and feature extraction
-- Whisper: Automatic speech recognition for captions
+- Whisper: Automatic speech recognition for captions (faster-whisper
+  backend used when installed)
 """
 
-import uuid
+import atexit
+import copy
+import functools
+import itertools
+import os
+import secrets
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
-# Pydub import (optional)
+# NumPy import (optional, used for vectorized sample math)
 try:
-    from pydub import AudioSegment
-    from pydub.silence import split_on_silence
+    import numpy as np
 
-    PYDUB_AVAILABLE = True
+    NUMPY_AVAILABLE = True
 except ImportError:
-    PYDUB_AVAILABLE = False
-    logger.warning("Pydub not available. Install with: pip install pydub")
+    NUMPY_AVAILABLE = False
 
-# Librosa import (optional)
+# soundfile import (optional, used for fast native-rate loading)
 try:
-    import librosa
-    import numpy as np
+    import soundfile as sf
 
-    LIBROSA_AVAILABLE = True
-except ImportError:
-    LIBROSA_AVAILABLE = False
-    logger.warning("Librosa not available. Install with: pip install librosa")
+    SOUNDFILE_AVAILABLE = NUMPY_AVAILABLE
+except (ImportError, OSError):
+    SOUNDFILE_AVAILABLE = False
 
-# Whisper import (optional)
-try:
-    import whisper
+# Pydub, PyAV, Librosa and Whisper are imported on first use rather than at
+# module load: librosa pulls in numba/scipy and Whisper pulls in torch, which
+# would otherwise add seconds to every `import src.tools`. The _ensure_*
+# helpers import the package once, bind it as a module global and cache
+# whether it is available.
+_optional_deps: dict[str, bool] = {}
 
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-    logger.warning("Whisper not available. Install with: pip install openai-whisper")
+
+def _ensure_pydub() -> bool:
+    """Import Pydub on first use; return whether it is available."""
+    global AudioSegment, split_on_silence
+    if "pydub" not in _optional_deps:
+        try:
+            from pydub import AudioSegment
+            from pydub.silence import split_on_silence
+
+            _optional_deps["pydub"] = True
+        except ImportError:
+            _optional_deps["pydub"] = False
+            logger.warning("Pydub not available. Install with: pip install pydub")
+    return _optional_deps["pydub"]
+
+
+def _ensure_pyav() -> bool:
+    """Import PyAV on first use; return whether in-process encoding is available."""
+    global av
+    if "av" not in _optional_deps:
+        try:
+            import av
+
+            _optional_deps["av"] = NUMPY_AVAILABLE
+        except ImportError:
+            _optional_deps["av"] = False
+    return _optional_deps["av"]
+
+
+def _ensure_librosa() -> bool:
+    """Import Librosa on first use; return whether it is available."""
+    global librosa
+    if "librosa" not in _optional_deps:
+        try:
+            import librosa
+
+            _optional_deps["librosa"] = True
+        except ImportError:
+            _optional_deps["librosa"] = False
+            logger.warning("Librosa not available. Install with: pip install librosa")
+    return _optional_deps["librosa"]
+
+
+def _ensure_faster_whisper() -> bool:
+    """Import faster-whisper (preferred Whisper backend) on first use."""
+    global FasterWhisperModel
+    if "faster_whisper" not in _optional_deps:
+        try:
+            from faster_whisper import WhisperModel as FasterWhisperModel
+
+            _optional_deps["faster_whisper"] = True
+        except ImportError:
+            _optional_deps["faster_whisper"] = False
+    return _optional_deps["faster_whisper"]
+
+
+def _ensure_whisper() -> bool:
+    """Import a Whisper backend on first use; return whether one is available."""
+    global whisper
+    if "whisper" not in _optional_deps:
+        if _ensure_faster_whisper():
+            _optional_deps["whisper"] = True
+        else:
+            try:
+                import whisper
+
+                _optional_deps["whisper"] = True
+            except ImportError:
+                _optional_deps["whisper"] = False
+                logger.warning("Whisper not available. Install with: pip install openai-whisper")
+    return _optional_deps["whisper"]
+
+
+# Availability flags kept as module attributes for callers, resolved lazily
+_LAZY_AVAILABILITY_FLAGS = {
+    "PYDUB_AVAILABLE": _ensure_pydub,
+    "PYAV_AVAILABLE": _ensure_pyav,
+    "LIBROSA_AVAILABLE": _ensure_librosa,
+    "FASTER_WHISPER_AVAILABLE": _ensure_faster_whisper,
+    "WHISPER_AVAILABLE": _ensure_whisper,
+}
+
+
+def __getattr__(name: str):
+    ensure = _LAZY_AVAILABILITY_FLAGS.get(name)
+    if ensure is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return ensure()
+
+
+def _new_name_nonce() -> str:
+    """Per-process filename tag: PID plus random bits, so recycled PIDs differ."""
+    return f"{os.getpid():x}{secrets.token_hex(2)}"
+
+
+# Output filename uniqueness comes from a per-process nonce and a counter
+# instead of a fresh uuid4 (an OS CSPRNG read) per file
+_name_nonce = _new_name_nonce()
+_name_counter = itertools.count()
+
+
+def _reset_name_generator() -> None:
+    """Give forked worker processes their own nonce and counter."""
+    global _name_nonce, _name_counter
+    _name_nonce = _new_name_nonce()
+    _name_counter = itertools.count()
+
+
+os.register_at_fork(after_in_child=_reset_name_generator)
+
+
+def _gen_name(prefix: str, ext: str) -> str:
+    """Return a process-unique output filename like `prefix_<nonce>_<n>.ext`."""
+    return f"{prefix}_{_name_nonce}_{next(_name_counter):06x}{ext}"
+
+
+# Containers whose audio track is extracted to WAV once before decoding
+_VIDEO_CONTAINER_EXTENSIONS = {".mp4", ".m4v", ".mov", ".mkv", ".webm", ".avi"}
+
+# Extracted WAVs keyed by (path, mtime, size, sample_rate, channels), oldest first
+_EXTRACTED_AUDIO: dict[tuple, str] = {}
+_EXTRACTED_AUDIO_MAX = 8
+# Extractions in progress, so concurrent callers for one file wait on a
+# single ffmpeg run while other files extract in parallel
+_EXTRACTING: dict[tuple, Future] = {}
+# Guards the two dicts above; never held while ffmpeg runs
+_extract_lock = threading.Lock()
+_extract_dir: Optional[str] = None
+
+
+def _use_extract_dir(path: str) -> None:
+    """
+    Process-pool initializer: extract into a directory the parent removes.
+
+    Pool workers exit without running atexit handlers, so WAVs written to
+    a worker's own temporary directory would never be deleted.
+    """
+    global _extract_dir
+    _extract_dir = path
+    # Entries inherited over fork belong to the parent; evicting them here
+    # would delete its files
+    _EXTRACTED_AUDIO.clear()
+
+
+def _fast_extract_audio(
+    path: str,
+    ffmpeg_path: str = "ffmpeg",
+    sample_rate: Optional[int] = None,
+    channels: Optional[int] = None,
+) -> Optional[str]:
+    """
+    Extract the audio track of a video file to a cached temporary WAV.
+
+    Only the audio stream is demuxed (-vn), so the video track is never
+    decoded, and the WAV can then be read in-process by soundfile or
+    Pydub. Extractions are reused while the source is unchanged; the
+    oldest are deleted beyond _EXTRACTED_AUDIO_MAX and the rest at exit.
+    Concurrent calls for one source share a single extraction, while
+    different sources extract in parallel.
+
+    Args:
+        path: Input media path
+        ffmpeg_path: Path to ffmpeg executable
+        sample_rate: Resample to this rate (native rate if None)
+        channels: Downmix to this many channels (native layout if None)
+
+    Returns:
+        Path to the WAV, or None if path isn't a video container or
+        extraction failed (callers then use the original path)
+    """
+    global _extract_dir
+    if Path(path).suffix.lower() not in _VIDEO_CONTAINER_EXTENSIONS:
+        return None
+
+    stat = os.stat(path)
+    key = (str(Path(path).resolve()), stat.st_mtime, stat.st_size, sample_rate, channels)
+
+    with _extract_lock:
+        cached = _EXTRACTED_AUDIO.get(key)
+        if cached is not None and Path(cached).exists():
+            return cached
+
+        pending = _EXTRACTING.get(key)
+        if pending is None:
+            pending = _EXTRACTING[key] = Future()
+            if _extract_dir is None:
+                _extract_dir = tempfile.mkdtemp(prefix="audio_extract_")
+                atexit.register(shutil.rmtree, _extract_dir, True)
+            wav_path = os.path.join(_extract_dir, _gen_name("track", ".wav"))
+        else:
+            wav_path = None
+
+    if wav_path is None:
+        return pending.result()
+
+    extracted = None
+    try:
+        cmd = [ffmpeg_path, "-y", "-i", path, "-vn", "-c:a", "pcm_s16le"]
+        if sample_rate:
+            cmd += ["-ar", str(sample_rate)]
+        if channels:
+            cmd += ["-ac", str(channels)]
+        cmd.append(wav_path)
+
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug("Audio track extraction failed", input=path, error=str(e))
+            return None
+        if result.returncode != 0:
+            logger.debug("Audio track extraction failed", input=path, stderr=result.stderr)
+            return None
+        extracted = wav_path
+        return extracted
+    finally:
+        with _extract_lock:
+            del _EXTRACTING[key]
+            if extracted is not None:
+                _EXTRACTED_AUDIO[key] = extracted
+                while len(_EXTRACTED_AUDIO) > _EXTRACTED_AUDIO_MAX:
+                    stale_key = next(iter(_EXTRACTED_AUDIO))
+                    Path(_EXTRACTED_AUDIO.pop(stale_key)).unlink(missing_ok=True)
+        pending.set_result(extracted)
+
+
+# Loaded Whisper models, keyed by (model name, compute type), shared by all
+# WhisperTool instances
+_WHISPER_MODELS: dict[tuple[str, str], Any] = {}
+# Serializes loads so concurrent first calls don't each load the weights
+_WHISPER_LOCK = threading.Lock()
+# Models that have already run their warm-up transcription
+_WARMED_WHISPER_MODELS: set[tuple[str, str]] = set()
+
+# Sample rate Whisper models expect for in-memory audio
+WHISPER_SAMPLE_RATE = 16000
+
+
+@functools.lru_cache(maxsize=1)
+def _whisper_device() -> str:
+    """
+    Return "cuda" when the Whisper backend can use a CUDA device, otherwise "cpu".
+
+    faster-whisper runs on CTranslate2, which is asked directly, since
+    torch may not be installed alongside it.
+    """
+    if _ensure_faster_whisper():
+        import ctranslate2
+
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+@functools.lru_cache(maxsize=1)
+def _whisper_workers() -> int:
+    """
+    Return how many transcriptions one faster-whisper model runs concurrently.
+
+    One per CUDA device, otherwise one per four CPU cores.
+    """
+    if not _ensure_faster_whisper():
+        return 1
+    import ctranslate2
+
+    return ctranslate2.get_cuda_device_count() or max(1, (os.cpu_count() or 1) // 4)
+
+
+# Quantization types CTranslate2 (and so faster-whisper) accepts
+WHISPER_COMPUTE_TYPES = frozenset({
+    "auto",
+    "default",
+    "int8",
+    "int8_float32",
+    "int8_float16",
+    "int8_bfloat16",
+    "int16",
+    "float16",
+    "bfloat16",
+    "float32",
+})
+
+
+def _resolve_compute_type(compute_type: str) -> str:
+    """Resolve "auto" to float16 on CUDA and int8 on CPU."""
+    if compute_type != "auto":
+        return compute_type
+    return "float16" if _whisper_device() == "cuda" else "int8"
+
+
+def _get_whisper_model(model_name: str, compute_type: str = "auto", warm_up: bool = False):
+    """
+    Return the shared Whisper model for model_name, loading it on first use.
+
+    compute_type selects faster-whisper's quantization; the reference
+    Whisper backend ignores it and runs fp16 on CUDA, fp32 on CPU.
+    faster-whisper models get one replica per GPU, or CPU workers
+    splitting the cores, so concurrent calls run in parallel.
+
+    warm_up transcribes a second of silence once per model, so CUDA
+    initialization and kernel selection happen before the first real input.
+    """
+    compute_type = _resolve_compute_type(compute_type)
+    key = (model_name, compute_type)
+    with _WHISPER_LOCK:
+        model = _WHISPER_MODELS.get(key)
+        if model is None:
+            device = _whisper_device()
+            if _ensure_faster_whisper():
+                gpus = 0
+                if device == "cuda":
+                    import ctranslate2
+
+                    gpus = ctranslate2.get_cuda_device_count()
+                workers = _whisper_workers()
+                logger.info(
+                    "Loading faster-whisper model",
+                    model=model_name,
+                    device=device,
+                    compute_type=compute_type,
+                    workers=workers,
+                )
+                model = FasterWhisperModel(
+                    model_name,
+                    device=device,
+                    device_index=list(range(gpus)) if gpus else 0,
+                    compute_type=compute_type,
+                    num_workers=workers,
+                    cpu_threads=max(1, (os.cpu_count() or 1) // workers),
+                )
+            else:
+                logger.info("Loading Whisper model", model=model_name, device=device)
+                model = whisper.load_model(model_name, device=device)
+            _WHISPER_MODELS[key] = model
+
+        if warm_up and NUMPY_AVAILABLE and key not in _WARMED_WHISPER_MODELS:
+            _WARMED_WHISPER_MODELS.add(key)
+            try:
+                _run_whisper(model, np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32))
+            except Exception as e:
+                logger.warning("Whisper warm-up failed", model=model_name, error=str(e))
+    return model
+
+
+@functools.lru_cache(maxsize=2)
+def _load_whisper_audio(audio_path: str, mtime: float):
+    """
+    Decode audio to the mono float32 16 kHz array Whisper consumes.
+
+    Passing the array to the model skips the ffmpeg subprocess Whisper
+    spawns to decode a path. Decoded arrays are memoized on (path, mtime);
+    the cache is kept small because an hour of audio is ~230MB.
+
+    Returns:
+        NumPy array, or None if the file can't be decoded in-process
+        (the caller then hands Whisper the path instead)
+    """
+    if not SOUNDFILE_AVAILABLE:
+        return None
+
+    try:
+        source = _fast_extract_audio(
+            audio_path, sample_rate=WHISPER_SAMPLE_RATE, channels=1
+        ) or audio_path
+        data, sr = sf.read(source, dtype="float32", always_2d=False)
+    except Exception as e:
+        logger.debug("In-process decode failed, Whisper will decode", audio=audio_path, error=str(e))
+        return None
+
+    if data.ndim == 2:
+        data = data.mean(axis=1)
+    if sr != WHISPER_SAMPLE_RATE:
+        if not _ensure_librosa():
+            return None
+        data = librosa.resample(data, orig_sr=sr, target_sr=WHISPER_SAMPLE_RATE)
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+
+def _run_whisper(model, audio) -> dict:
+    """
+    Transcribe with either backend and return a reference-Whisper style dict.
+
+    audio may be a file path or a 16 kHz float32 array; both backends accept either.
+
+    faster-whisper yields segments lazily, so they are collected into the
+    {"text", "segments", "language"} shape the rest of this module expects.
+    """
+    if _ensure_faster_whisper() and isinstance(model, FasterWhisperModel):
+        segments, info = model.transcribe(audio, beam_size=1, vad_filter=True)
+        segment_dicts = [
+            {"id": segment.id, "start": segment.start, "end": segment.end, "text": segment.text}
+            for segment in segments
+        ]
+        return {
+            "text": "".join(segment["text"] for segment in segment_dicts),
+            "segments": segment_dicts,
+            "language": info.language,
+        }
+
+    return model.transcribe(audio, fp16=_whisper_device() == "cuda")
+
+
+# Export format -> (PyAV container format, encoder) for in-process exports
+_PYAV_EXPORT_FORMATS = {
+    "mp3": ("mp3", "libmp3lame"),
+    "flac": ("flac", "flac"),
+    "ogg": ("ogg", "libvorbis"),
+    "m4a": ("ipod", "aac"),
+    "aac": ("adts", "aac"),
+}
+
+# Pydub sample width (bytes) -> (NumPy dtype, PyAV packed sample format, WAV PCM codec)
+_PYAV_SAMPLE_FORMATS = {
+    2: ("int16", "s16", "pcm_s16le"),
+    4: ("int32", "s32", "pcm_s32le"),
+}
+
+_PYAV_LAYOUTS = {1: "mono", 2: "stereo"}
+
+# Export format -> source audio codecs that can be remuxed into it as-is
+_REMUX_COMPATIBLE_CODECS = {
+    "mp3": {"mp3"},
+    "flac": {"flac"},
+    "ogg": {"vorbis", "opus", "flac"},
+    "m4a": {"aac", "alac"},
+    "aac": {"aac"},
+}
+
+# Samples per channel pushed into the encoder per AudioFrame
+_PYAV_FRAME_SAMPLES = 4096
+
+
+def _export_with_pyav(segment, output_path: str, fmt: str) -> bool:
+    """
+    Encode an AudioSegment with PyAV instead of spawning ffmpeg.
+
+    Returns:
+        True if the file was written, False if the format/layout is not
+        handled here and the caller should fall back to AudioSegment.export
+    """
+    fmt = fmt.lower()
+    sample_format = _PYAV_SAMPLE_FORMATS.get(segment.sample_width)
+    layout = _PYAV_LAYOUTS.get(segment.channels)
+    if sample_format is None or layout is None:
+        return False
+
+    dtype, av_format, pcm_codec = sample_format
+    if fmt == "wav":
+        container_format, codec = "wav", pcm_codec
+    elif fmt in _PYAV_EXPORT_FORMATS:
+        container_format, codec = _PYAV_EXPORT_FORMATS[fmt]
+    else:
+        return False
+
+    samples = np.frombuffer(segment.raw_data, dtype=dtype).reshape(-1, segment.channels)
+
+    with av.open(output_path, mode="w", format=container_format) as container:
+        stream = container.add_stream(codec, rate=segment.frame_rate)
+        stream.layout = layout
+
+        for start in range(0, len(samples), _PYAV_FRAME_SAMPLES):
+            chunk = samples[start:start + _PYAV_FRAME_SAMPLES]
+            frame = av.AudioFrame.from_ndarray(
+                np.ascontiguousarray(chunk).reshape(1, -1),
+                format=av_format,
+                layout=layout,
+            )
+            frame.sample_rate = segment.frame_rate
+            frame.pts = start
+            for packet in stream.encode(frame):
+                container.mux(packet)
+
+        for packet in stream.encode(None):
+            container.mux(packet)
+
+    return True
+
+
+# Pydub sample width (bytes) -> signed NumPy sample dtype for gain math
+_PCM_DTYPES = {1: "int8", 2: "int16", 4: "int32"}
+
+
+def _apply_gain(segment, gain: float):
+    """
+    Scale a segment's samples by a linear gain factor with NumPy.
+
+    Samples are truncated and clipped to the sample range like
+    audioop.mul, so the output matches Pydub's own gain arithmetic.
+
+    Returns:
+        New AudioSegment, or None if the sample width is not supported
+    """
+    dtype = _PCM_DTYPES.get(segment.sample_width)
+    if not NUMPY_AVAILABLE or dtype is None:
+        return None
+
+    info = np.iinfo(dtype)
+    work_dtype = np.float64 if segment.sample_width == 4 else np.float32
+    samples = np.frombuffer(segment.raw_data, dtype=dtype).astype(work_dtype)
+    samples *= gain
+    np.clip(samples, info.min, info.max, out=samples)
+    return segment._spawn(samples.astype(dtype).tobytes())
+
+
+def _adjust_segment_volume(segment, db_change: float):
+    """Apply a dB gain change to a segment (NumPy fast path for `segment + db`)."""
+    adjusted = _apply_gain(segment, 10 ** (db_change / 20))
+    return adjusted if adjusted is not None else segment + db_change
+
+
+def _normalize_segment(segment, headroom: float = 0.1):
+    """Normalize a segment's peak to headroom dB below full scale (like AudioSegment.normalize)."""
+    dtype = _PCM_DTYPES.get(segment.sample_width)
+    if not NUMPY_AVAILABLE or dtype is None:
+        return segment.normalize(headroom=headroom)
+
+    samples = np.frombuffer(segment.raw_data, dtype=dtype)
+    if samples.size == 0:
+        return segment
+    peak = int(np.abs(samples.astype(np.int64)).max())
+    if peak == 0:
+        return segment
+
+    target_peak = segment.max_possible_amplitude * 10 ** (-headroom / 20)
+    return _apply_gain(segment, target_peak / peak)
+
+
+def _concat_segments(segments: list):
+    """
+    Concatenate AudioSegments with a single raw-data join.
+
+    Repeated `+=` copies the whole running result on every append, which is
+    quadratic in the number of segments. Mismatched segments are first
+    converted to the highest frame rate, channel count and sample width
+    among them, the same format Pydub picks when adding segments.
+    """
+    frame_rate = max(segment.frame_rate for segment in segments)
+    channels = max(segment.channels for segment in segments)
+    sample_width = max(segment.sample_width for segment in segments)
+
+    raw_chunks = []
+    for segment in segments:
+        if segment.frame_rate != frame_rate:
+            segment = segment.set_frame_rate(frame_rate)
+        if segment.channels != channels:
+            segment = segment.set_channels(channels)
+        if segment.sample_width != sample_width:
+            segment = segment.set_sample_width(sample_width)
+        raw_chunks.append(segment.raw_data)
+
+    return segments[0]._spawn(
+        b"".join(raw_chunks),
+        overrides={
+            "frame_rate": frame_rate,
+            "channels": channels,
+            "sample_width": sample_width,
+        },
+    )
+
+
+def _probe_duration(audio_path: str, ffprobe_path: str = "ffprobe") -> Optional[float]:
+    """
+    Read a file's duration from its metadata without decoding samples.
+
+    Tries soundfile's header parse first, then `ffprobe -show_entries
+    format=duration`.
+
+    Returns:
+        Duration in seconds or None if neither could read it
+    """
+    if SOUNDFILE_AVAILABLE:
+        try:
+            return float(sf.info(audio_path).duration)
+        except Exception as e:
+            logger.debug("soundfile info failed", audio=audio_path, error=str(e))
+
+    try:
+        result = subprocess.run(
+            [
+                ffprobe_path, "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=nw=1:nk=1",
+                audio_path,
+            ],
+            capture_output=True, text=True, timeout=30,
+        )
+        if result.returncode == 0:
+            return float(result.stdout.strip())
+    except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+        logger.debug("ffprobe duration failed", audio=audio_path, error=str(e))
+    return None
+
+
+def _map_in_pool(executor: Executor, func: Callable, *iterables) -> list:
+    """
+    Map func over iterables in an executor, returning results in input order.
+
+    The tool methods dispatched here already log and return None on failure,
+    so an error is only raised for pool-level problems (e.g. pickling).
+    """
+    with executor:
+        return list(executor.map(func, *iterables))
+
+
+def _map_in_processes(max_workers: Optional[int], func: Callable, *iterables) -> list:
+    """
+    Map func in worker processes that extract audio into a scratch directory.
+
+    The directory belongs to this call and is removed once the pool has
+    shut down, since the workers' own cleanup never runs.
+    """
+    with tempfile.TemporaryDirectory(prefix="audio_extract_") as scratch:
+        return _map_in_pool(
+            ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_use_extract_dir,
+                initargs=(scratch,),
+            ),
+            func,
+            *iterables,
+        )
 
 
 class PydubTool:
@@ -57,20 +688,108 @@ class PydubTool:
     - Adjusting volume
     """
 
-    def __init__(self, output_dir: str = "./output/audio"):
+    def __init__(
+        self,
+        output_dir: str = "./output/audio",
+        ffmpeg_path: str = "ffmpeg",
+        ffprobe_path: str = "ffprobe",
+    ):
         """
         Initialize Pydub tool.
 
         Args:
             output_dir: Directory for output files
+            ffmpeg_path: Path to ffmpeg executable (used for stream copies)
+            ffprobe_path: Path to ffprobe executable (used for codec probing)
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = ffprobe_path
 
     @property
     def available(self) -> bool:
         """Check if Pydub is available."""
-        return PYDUB_AVAILABLE
+        return _ensure_pydub()
+
+    def _load_segment(self, input_path: str):
+        """Decode a file to an AudioSegment, reusing extracted audio for video inputs."""
+        source = _fast_extract_audio(input_path, self.ffmpeg_path) or input_path
+        return AudioSegment.from_file(source)
+
+    def _export(self, segment, output_path: str, fmt: str) -> None:
+        """Export a segment in-process via PyAV, falling back to Pydub's ffmpeg export."""
+        if _ensure_pyav():
+            try:
+                if _export_with_pyav(segment, output_path, fmt):
+                    return
+            except Exception as e:
+                logger.warning("PyAV export failed, using ffmpeg", format=fmt, error=str(e))
+
+        segment.export(output_path, format=fmt)
+
+    def _probe_audio_codec(self, input_path: str) -> Optional[str]:
+        """Return the codec name of the first audio stream, or None if unknown."""
+        try:
+            result = subprocess.run(
+                [
+                    self.ffprobe_path, "-v", "error",
+                    "-select_streams", "a:0",
+                    "-show_entries", "stream=codec_name",
+                    "-of", "default=nw=1:nk=1",
+                    input_path,
+                ],
+                capture_output=True, text=True, timeout=30,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug("Codec probe failed", input=input_path, error=str(e))
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+
+    def _convert_without_reencode(
+        self,
+        input_path: str,
+        output_format: str,
+        output_path: str,
+    ) -> bool:
+        """
+        Convert without decoding when the source already fits the target.
+
+        Same-extension conversions are a plain file copy; a compatible codec
+        in a different container is remuxed with `ffmpeg -c:a copy`.
+
+        Returns:
+            True if output_path was written, False to fall back to re-encoding
+        """
+        output_format = output_format.lower()
+        source_format = Path(input_path).suffix.lstrip(".").lower()
+
+        if source_format == output_format:
+            if Path(input_path).resolve() != Path(output_path).resolve():
+                shutil.copyfile(input_path, output_path)
+            return True
+
+        compatible = _REMUX_COMPATIBLE_CODECS.get(output_format)
+        if not compatible or self._probe_audio_codec(input_path) not in compatible:
+            return False
+
+        result = subprocess.run(
+            [
+                self.ffmpeg_path, "-y",
+                "-i", input_path,
+                "-vn",
+                "-c:a", "copy",
+                "-f", _PYAV_EXPORT_FORMATS[output_format][0],
+                output_path,
+            ],
+            capture_output=True, text=True, timeout=600,
+        )
+        if result.returncode != 0:
+            logger.debug("Stream copy failed, re-encoding", stderr=result.stderr)
+            return False
+        return True
 
     def convert_format(
         self,
@@ -89,19 +808,27 @@ class PydubTool:
         Returns:
             Path to output file or None if failed
         """
-        if not PYDUB_AVAILABLE:
+        if not _ensure_pydub():
             logger.error("Pydub not available")
             return None
 
         try:
-            audio = AudioSegment.from_file(input_path)
-
             if output_path is None:
                 output_path = str(
-                    self.output_dir / f"converted_{uuid.uuid4().hex[:8]}.{output_format}"
+                    self.output_dir / _gen_name("converted", f".{output_format}")
                 )
 
-            audio.export(output_path, format=output_format)
+            if self._convert_without_reencode(input_path, output_format, output_path):
+                logger.info(
+                    "Audio converted without re-encoding",
+                    input=input_path,
+                    output=output_path,
+                    format=output_format,
+                )
+                return output_path
+
+            audio = self._load_segment(input_path)
+            self._export(audio, output_path, output_format)
             logger.info(
                 "Audio converted", input=input_path, output=output_path, format=output_format
             )
@@ -125,26 +852,16 @@ class PydubTool:
         Returns:
             Path to output file or None if failed
         """
-        if not PYDUB_AVAILABLE:
-            logger.error("Pydub not available")
-            return None
-
-        try:
-            audio = AudioSegment.from_file(input_path)
-            normalized = audio.normalize()
-
-            if output_path is None:
-                ext = Path(input_path).suffix
-                output_path = str(
-                    self.output_dir / f"normalized_{uuid.uuid4().hex[:8]}{ext}"
-                )
+        if output_path is None:
+            ext = Path(input_path).suffix
+            output_path = str(
+                self.output_dir / _gen_name("normalized", ext)
+            )
 
-            normalized.export(output_path, format=Path(output_path).suffix[1:])
-            logger.info("Audio normalized", input=input_path, output=output_path)
-            return output_path
-        except Exception as e:
-            logger.error("Audio normalize failed", error=str(e))
-            return None
+        result = self.process(input_path, [("normalize",)], output_path)
+        if result:
+            logger.info("Audio normalized", input=input_path, output=result)
+        return result
 
     def trim_silence(
         self,
@@ -165,12 +882,12 @@ class PydubTool:
         Returns:
             Path to output file or None if failed
         """
-        if not PYDUB_AVAILABLE:
+        if not _ensure_pydub():
             logger.error("Pydub not available")
             return None
 
         try:
-            audio = AudioSegment.from_file(input_path)
+            audio = self._load_segment(input_path)
             chunks = split_on_silence(
                 audio,
                 min_silence_len=min_silence_len,
@@ -181,18 +898,16 @@ class PydubTool:
                 logger.warning("No non-silent chunks found")
                 return None
 
-            # Concatenate non-silent chunks
-            result = chunks[0]
-            for chunk in chunks[1:]:
-                result += chunk
+            # Concatenate non-silent chunks (all slices of one source, same format)
+            result = _concat_segments(chunks)
 
             if output_path is None:
                 ext = Path(input_path).suffix
                 output_path = str(
-                    self.output_dir / f"trimmed_{uuid.uuid4().hex[:8]}{ext}"
+                    self.output_dir / _gen_name("trimmed", ext)
                 )
 
-            result.export(output_path, format=Path(output_path).suffix[1:])
+            self._export(result, output_path, Path(output_path).suffix[1:])
             logger.info("Silence trimmed", input=input_path, output=output_path)
             return output_path
         except Exception as e:
@@ -216,7 +931,7 @@ class PydubTool:
         Returns:
             Path to output file or None if failed
         """
-        if not PYDUB_AVAILABLE:
+        if not _ensure_pydub():
             logger.error("Pydub not available")
             return None
 
@@ -225,21 +940,21 @@ class PydubTool:
                 logger.error("No audio files to merge")
                 return None
 
-            result = AudioSegment.from_file(audio_paths[0])
+            segments = [self._load_segment(path) for path in audio_paths]
 
-            for path in audio_paths[1:]:
-                audio = AudioSegment.from_file(path)
-                if crossfade > 0:
+            if crossfade > 0:
+                result = segments[0]
+                for audio in segments[1:]:
                     result = result.append(audio, crossfade=crossfade)
-                else:
-                    result += audio
+            else:
+                result = _concat_segments(segments)
 
             if output_path is None:
                 output_path = str(
-                    self.output_dir / f"merged_{uuid.uuid4().hex[:8]}.mp3"
+                    self.output_dir / _gen_name("merged", ".mp3")
                 )
 
-            result.export(output_path, format=Path(output_path).suffix[1:])
+            self._export(result, output_path, Path(output_path).suffix[1:])
             logger.info(
                 "Audio files merged", count=len(audio_paths), output=output_path
             )
@@ -265,29 +980,142 @@ class PydubTool:
         Returns:
             Path to output file or None if failed
         """
-        if not PYDUB_AVAILABLE:
+        if output_path is None:
+            ext = Path(input_path).suffix
+            output_path = str(
+                self.output_dir / _gen_name("volume", ext)
+            )
+
+        result = self.process(input_path, [("gain", db_change)], output_path)
+        if result:
+            logger.info(
+                "Volume adjusted", input=input_path, db_change=db_change, output=result
+            )
+        return result
+
+    def process(
+        self,
+        input_path: str,
+        ops: list[tuple],
+        output_path: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Apply a chain of operations with one decode and one export.
+
+        Chaining normalize/adjust_volume/convert_format calls decodes and
+        re-encodes the file at every step; this keeps the audio in memory
+        between operations.
+
+        Args:
+            input_path: Path to input audio file
+            ops: Operations applied in order, each a tuple of name and args:
+                ("normalize",), ("gain", db_change), ("export", format)
+            output_path: Path for output file (auto-generated if None)
+
+        Returns:
+            Path to output file or None if failed
+        """
+        if not _ensure_pydub():
             logger.error("Pydub not available")
             return None
 
         try:
-            audio = AudioSegment.from_file(input_path)
-            adjusted = audio + db_change
+            audio = self._load_segment(input_path)
+            output_format = None
+
+            for name, *args in ops:
+                if name == "normalize":
+                    audio = _normalize_segment(audio, *args)
+                elif name == "gain":
+                    audio = _adjust_segment_volume(audio, *args)
+                elif name == "export":
+                    (output_format,) = args
+                else:
+                    raise ValueError(f"Unknown audio operation: {name}")
 
             if output_path is None:
-                ext = Path(input_path).suffix
+                ext = f".{output_format}" if output_format else Path(input_path).suffix
                 output_path = str(
-                    self.output_dir / f"volume_{uuid.uuid4().hex[:8]}{ext}"
+                    self.output_dir / _gen_name("processed", ext)
                 )
+            if output_format is None:
+                output_format = Path(output_path).suffix[1:]
 
-            adjusted.export(output_path, format=Path(output_path).suffix[1:])
+            self._export(audio, output_path, output_format)
             logger.info(
-                "Volume adjusted", input=input_path, db_change=db_change, output=output_path
+                "Audio processed",
+                input=input_path,
+                ops=[op[0] for op in ops],
+                output=output_path,
             )
             return output_path
         except Exception as e:
-            logger.error("Adjust volume failed", error=str(e))
+            logger.error("Audio process failed", error=str(e))
             return None
 
+    def batch_convert_format(
+        self,
+        input_paths: list[str],
+        output_format: str,
+        max_workers: Optional[int] = None,
+    ) -> list[Optional[str]]:
+        """
+        Convert many audio files in parallel worker processes.
+
+        Args:
+            input_paths: Paths to input audio files
+            output_format: Target format (mp3, wav, ogg, flac)
+            max_workers: Worker process count (defaults to CPU count)
+
+        Returns:
+            Output path (or None if that file failed) for each input, in order
+        """
+        if not input_paths:
+            return []
+
+        results = _map_in_processes(
+            max_workers,
+            self.convert_format,
+            input_paths,
+            repeat(output_format),
+        )
+        logger.info(
+            "Batch conversion completed",
+            count=len(input_paths),
+            succeeded=sum(result is not None for result in results),
+        )
+        return results
+
+    def batch_normalize(
+        self,
+        input_paths: list[str],
+        max_workers: Optional[int] = None,
+    ) -> list[Optional[str]]:
+        """
+        Normalize many audio files in parallel worker processes.
+
+        Args:
+            input_paths: Paths to input audio files
+            max_workers: Worker process count (defaults to CPU count)
+
+        Returns:
+            Output path (or None if that file failed) for each input, in order
+        """
+        if not input_paths:
+            return []
+
+        results = _map_in_processes(
+            max_workers,
+            self.normalize,
+            input_paths,
+        )
+        logger.info(
+            "Batch normalize completed",
+            count=len(input_paths),
+            succeeded=sum(result is not None for result in results),
+        )
+        return results
+
     def get_duration(self, audio_path: str) -> Optional[float]:
         """
         Get audio duration in seconds.
@@ -298,18 +1126,133 @@ class PydubTool:
         Returns:
             Duration in seconds or None if failed
         """
-        if not PYDUB_AVAILABLE:
+        duration = _probe_duration(audio_path, self.ffprobe_path)
+        if duration is not None:
+            return duration
+
+        # Metadata unreadable: fall back to a full decode
+        if not _ensure_pydub():
             logger.error("Pydub not available")
             return None
 
         try:
-            audio = AudioSegment.from_file(audio_path)
+            audio = self._load_segment(audio_path)
             return len(audio) / 1000.0
         except Exception as e:
             logger.error("Get duration failed", error=str(e))
             return None
 
 
+def _load_native(audio_path: str):
+    """
+    Load audio as mono float32 at its native sample rate.
+
+    Reads with soundfile when possible, skipping librosa.load's default
+    resample to 22050 Hz. Because analysis runs at the native rate,
+    tempo and spectral values can differ slightly from older results.
+
+    Returns:
+        Tuple of (samples, sample_rate)
+    """
+    if SOUNDFILE_AVAILABLE:
+        try:
+            source = _fast_extract_audio(audio_path) or audio_path
+            y, sr = sf.read(source, dtype="float32", always_2d=False)
+            if y.ndim == 2:
+                y = y.mean(axis=1)
+            return y, sr
+        except Exception as e:
+            logger.debug("soundfile load failed, using librosa", audio=audio_path, error=str(e))
+
+    return librosa.load(audio_path, sr=None)
+
+
+# Analysis caches are module-level and keyed on (path, mtime, size) so they
+# are shared by every LibrosaTool and don't keep tool instances alive.
+
+
+@functools.lru_cache(maxsize=2)
+def _load_cached(audio_path: str, mtime: float, size: int):
+    """Memoized _load_native so beat tracking and spectral analysis decode once."""
+    return _load_native(audio_path)
+
+
+@functools.lru_cache(maxsize=64)
+def _beat_track(audio_path: str, mtime: float, size: int, hop_length: int):
+    """
+    Run the beat tracker once per unchanged file.
+
+    detect_tempo and get_beat_times both project from this result, so
+    the onset envelope and beat-tracking pass are shared between them
+    without paying for the spectral analysis analyze_audio adds.
+
+    Returns:
+        Tuple of (tempo in BPM, read-only array of beat times in seconds)
+    """
+    y, sr = _load_cached(audio_path, mtime, size)
+
+    tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr, hop_length=hop_length)
+    # Handle both scalar and array return types from librosa
+    tempo_value = float(tempo[0]) if hasattr(tempo, "__len__") else float(tempo)
+    beat_times = librosa.frames_to_time(beat_frames, sr=sr, hop_length=hop_length)
+    # Handed out directly by get_beat_times_array, so guard the cached copy
+    beat_times.setflags(write=False)
+    return tempo_value, beat_times
+
+
+@functools.lru_cache(maxsize=64)
+def _audio_features(
+    audio_path: str, mtime: float, size: int, n_fft: int, hop_length: int
+) -> Mapping[str, Any]:
+    """
+    Compute the full analyze_audio feature set for one unchanged file.
+
+    Built on the cached beat-tracking result. The mapping is shared by
+    every caller, so it is returned read-only.
+    """
+    tempo_value, beat_times = _beat_track(audio_path, mtime, size, hop_length)
+    y, sr = _load_cached(audio_path, mtime, size)
+
+    # One magnitude STFT shared by all spectral features and RMS
+    magnitude = np.abs(librosa.stft(y, n_fft=n_fft, hop_length=hop_length))
+
+    # Spectral features
+    spectral_centroids = librosa.feature.spectral_centroid(S=magnitude, sr=sr)[0]
+    spectral_rolloff = librosa.feature.spectral_rolloff(S=magnitude, sr=sr)[0]
+
+    # RMS energy
+    rms = librosa.feature.rms(S=magnitude, frame_length=n_fft)[0]
+
+    # Zero crossing rate
+    zcr = librosa.feature.zero_crossing_rate(y, hop_length=hop_length)[0]
+
+    return MappingProxyType({
+        "tempo_bpm": tempo_value,
+        "beat_count": len(beat_times),
+        "duration_seconds": float(librosa.get_duration(y=y, sr=sr)),
+        "sample_rate": sr,
+        "spectral_centroid_mean": float(np.mean(spectral_centroids)),
+        "spectral_rolloff_mean": float(np.mean(spectral_rolloff)),
+        "rms_mean": float(np.mean(rms)),
+        "rms_std": float(np.std(rms)),
+        "zero_crossing_rate_mean": float(np.mean(zcr)),
+    })
+
+
+@functools.lru_cache(maxsize=32)
+def _transcribe_cached(
+    audio_path: str, mtime: float, model_name: str, compute_type: str
+) -> dict:
+    """
+    Run Whisper inference, memoized on (path, mtime, model, precision).
+
+    The cached dict is shared; callers hand out copies of it.
+    """
+    model = _get_whisper_model(model_name, compute_type)
+    audio = _load_whisper_audio(audio_path, mtime)
+    return _run_whisper(model, audio if audio is not None else audio_path)
+
+
 class LibrosaTool:
     """
     Librosa wrapper for audio analysis.
@@ -321,6 +1264,10 @@ class LibrosaTool:
     - Feature extraction
     """
 
+    # Analysis frame sizes, pinned so results don't shift with librosa defaults
+    N_FFT = 2048
+    HOP_LENGTH = 512
+
     def __init__(self):
         """Initialize Librosa tool."""
         pass
@@ -328,7 +1275,16 @@ class LibrosaTool:
     @property
     def available(self) -> bool:
         """Check if Librosa is available."""
-        return LIBROSA_AVAILABLE
+        return _ensure_librosa()
+
+    def _load(self, audio_path: str):
+        """Load audio as mono float32 at its native sample rate."""
+        return _load_native(audio_path)
+
+    def _file_key(self, audio_path: str) -> tuple[str, float, int]:
+        """Return the (path, mtime, size) cache key for audio_path."""
+        stat = os.stat(audio_path)
+        return audio_path, stat.st_mtime, stat.st_size
 
     def detect_tempo(self, audio_path: str) -> Optional[float]:
         """
@@ -340,45 +1296,57 @@ class LibrosaTool:
         Returns:
             Tempo in BPM or None if failed
         """
-        if not LIBROSA_AVAILABLE:
+        if not _ensure_librosa():
             logger.error("Librosa not available")
             return None
 
         try:
-            y, sr = librosa.load(audio_path)
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
-            # Handle both scalar and array return types from librosa
-            tempo_value = float(tempo[0]) if hasattr(tempo, "__len__") else float(tempo)
+            tempo_value, _ = _beat_track(*self._file_key(audio_path), self.HOP_LENGTH)
             logger.info("Tempo detected", audio=audio_path, bpm=tempo_value)
             return tempo_value
         except Exception as e:
             logger.error("Tempo detection failed", error=str(e))
             return None
 
-    def get_beat_times(self, audio_path: str) -> Optional[list[float]]:
+    def get_beat_times_array(self, audio_path: str) -> Optional["np.ndarray"]:
         """
-        Get beat timestamps in audio.
+        Get beat timestamps in audio as a NumPy array.
+
+        Use this over get_beat_times when the result feeds back into NumPy
+        or librosa; it skips boxing every beat into a Python float. The
+        array is read-only because it is shared with the beat-tracking cache.
 
         Args:
             audio_path: Path to audio file
 
         Returns:
-            List of beat times in seconds or None if failed
+            Read-only float array of beat times in seconds or None if failed
         """
-        if not LIBROSA_AVAILABLE:
+        if not _ensure_librosa():
             logger.error("Librosa not available")
             return None
 
         try:
-            y, sr = librosa.load(audio_path)
-            _, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
-            beat_times = librosa.frames_to_time(beat_frames, sr=sr)
+            _, beat_times = _beat_track(*self._file_key(audio_path), self.HOP_LENGTH)
             logger.info("Beats detected", audio=audio_path, count=len(beat_times))
-            return beat_times.tolist()
+            return beat_times
         except Exception as e:
             logger.error("Beat detection failed", error=str(e))
             return None
 
+    def get_beat_times(self, audio_path: str) -> Optional[list[float]]:
+        """
+        Get beat timestamps in audio.
+
+        Args:
+            audio_path: Path to audio file
+
+        Returns:
+            List of beat times in seconds or None if failed
+        """
+        beat_times = self.get_beat_times_array(audio_path)
+        return beat_times.tolist() if beat_times is not None else None
+
     def analyze_audio(self, audio_path: str) -> Optional[dict]:
         """
         Comprehensive audio analysis.
@@ -389,45 +1357,46 @@ class LibrosaTool:
         Returns:
             Dictionary with audio features or None if failed
         """
-        if not LIBROSA_AVAILABLE:
+        if not _ensure_librosa():
             logger.error("Librosa not available")
             return None
 
         try:
-            y, sr = librosa.load(audio_path)
-
-            # Basic features
-            tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
-            tempo_value = float(tempo[0]) if hasattr(tempo, "__len__") else float(tempo)
-
-            # Spectral features
-            spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-
-            # RMS energy
-            rms = librosa.feature.rms(y=y)[0]
-
-            # Zero crossing rate
-            zcr = librosa.feature.zero_crossing_rate(y)[0]
-
-            analysis = {
-                "tempo_bpm": tempo_value,
-                "beat_count": len(beat_frames),
-                "duration_seconds": float(librosa.get_duration(y=y, sr=sr)),
-                "sample_rate": sr,
-                "spectral_centroid_mean": float(np.mean(spectral_centroids)),
-                "spectral_rolloff_mean": float(np.mean(spectral_rolloff)),
-                "rms_mean": float(np.mean(rms)),
-                "rms_std": float(np.std(rms)),
-                "zero_crossing_rate_mean": float(np.mean(zcr)),
-            }
-
+            analysis = dict(
+                _audio_features(*self._file_key(audio_path), self.N_FFT, self.HOP_LENGTH)
+            )
             logger.info("Audio analyzed", audio=audio_path)
             return analysis
         except Exception as e:
             logger.error("Audio analysis failed", error=str(e))
             return None
 
+    def batch_analyze(
+        self,
+        audio_paths: list[str],
+        max_workers: Optional[int] = None,
+    ) -> list[Optional[dict]]:
+        """
+        Analyze many audio files in parallel worker processes.
+
+        Args:
+            audio_paths: Paths to audio files
+            max_workers: Worker process count (defaults to CPU count)
+
+        Returns:
+            Analysis dict (or None if that file failed) for each input, in order
+        """
+        if not audio_paths:
+            return []
+
+        results = _map_in_processes(
+            max_workers,
+            self.analyze_audio,
+            audio_paths,
+        )
+        logger.info("Batch analysis completed", count=len(audio_paths))
+        return results
+
     def get_duration(self, audio_path: str) -> Optional[float]:
         """
         Get audio duration.
@@ -438,12 +1407,15 @@ class LibrosaTool:
         Returns:
             Duration in seconds or None if failed
         """
-        if not LIBROSA_AVAILABLE:
+        if not _ensure_librosa():
             logger.error("Librosa not available")
             return None
 
         try:
-            return float(librosa.get_duration(filename=audio_path))
+            duration = _probe_duration(audio_path)
+            if duration is not None:
+                return duration
+            return float(librosa.get_duration(path=audio_path))
         except Exception as e:
             logger.error("Get duration failed", error=str(e))
             return None
@@ -459,15 +1431,23 @@ class WhisperTool:
     - Creating SRT subtitle files
     """
 
-    def __init__(self, model_name: str = "base", output_dir: str = "./output/captions"):
+    def __init__(
+        self,
+        model_name: str = "base",
+        output_dir: str = "./output/captions",
+        compute_type: str = "auto",
+    ):
         """
         Initialize Whisper tool.
 
         Args:
             model_name: Whisper model size (tiny, base, small, medium, large)
             output_dir: Directory for output files
+            compute_type: faster-whisper precision (int8, int8_float16, float16,
+                float32); "auto" uses float16 on CUDA and int8 on CPU
         """
         self.model_name = model_name
+        self.compute_type = compute_type
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self._model = None
@@ -475,13 +1455,12 @@ class WhisperTool:
     @property
     def available(self) -> bool:
         """Check if Whisper is available."""
-        return WHISPER_AVAILABLE
+        return _ensure_whisper()
 
     def _load_model(self):
-        """Lazy load the Whisper model."""
-        if self._model is None and WHISPER_AVAILABLE:
-            logger.info("Loading Whisper model", model=self.model_name)
-            self._model = whisper.load_model(self.model_name)
+        """Lazy load the Whisper model from the shared model cache."""
+        if self._model is None and _ensure_whisper():
+            self._model = _get_whisper_model(self.model_name, self.compute_type)
         return self._model
 
     def transcribe(self, audio_path: str) -> Optional[dict]:
@@ -494,13 +1473,15 @@ class WhisperTool:
         Returns:
             Transcription result dict with 'text' and 'segments' or None if failed
         """
-        if not WHISPER_AVAILABLE:
+        if not _ensure_whisper():
             logger.error("Whisper not available")
             return None
 
         try:
-            model = self._load_model()
-            result = model.transcribe(audio_path)
+            mtime = os.stat(audio_path).st_mtime
+            result = copy.deepcopy(
+                _transcribe_cached(audio_path, mtime, self.model_name, self.compute_type)
+            )
             logger.info(
                 "Audio transcribed",
                 audio=audio_path,
@@ -524,7 +1505,7 @@ class WhisperTool:
         Returns:
             List of caption dicts with 'text', 'start', 'end' or None if failed
         """
-        if not WHISPER_AVAILABLE:
+        if not _ensure_whisper():
             logger.error("Whisper not available")
             return None
 
@@ -547,6 +1528,38 @@ class WhisperTool:
             logger.error("Caption generation failed", error=str(e))
             return None
 
+    def batch_generate_captions(
+        self,
+        audio_paths: list[str],
+        max_workers: int = 2,
+    ) -> list[Optional[list[dict]]]:
+        """
+        Generate captions for many audio files concurrently.
+
+        Threads are used rather than processes so all calls share the one
+        loaded model; max_workers bounds how many transcriptions run at once.
+
+        Args:
+            audio_paths: Paths to audio files
+            max_workers: Maximum concurrent transcriptions
+
+        Returns:
+            Caption list (or None if that file failed) for each input, in order
+        """
+        if not audio_paths:
+            return []
+
+        # Load once up front so worker threads don't race to load the model
+        self._load_model()
+
+        results = _map_in_pool(
+            ThreadPoolExecutor(max_workers=max_workers),
+            self.generate_captions,
+            audio_paths,
+        )
+        logger.info("Batch captions generated", count=len(audio_paths))
+        return results
+
     def create_srt(
         self,
         audio_path: str,
@@ -562,30 +1575,30 @@ class WhisperTool:
         Returns:
             Path to SRT file or None if failed
         """
-        if not WHISPER_AVAILABLE:
+        if not _ensure_whisper():
             logger.error("Whisper not available")
             return None
 
         try:
-            result = self.transcribe(audio_path)
-            if not result:
+            captions = self.generate_captions(audio_path)
+            if captions is None:
                 return None
 
             if output_path is None:
                 output_path = str(
-                    self.output_dir / f"captions_{uuid.uuid4().hex[:8]}.srt"
+                    self.output_dir / _gen_name("captions", ".srt")
                 )
 
-            with open(output_path, "w") as f:
-                for i, segment in enumerate(result.get("segments", []), 1):
-                    # Format timestamps for SRT
-                    start = self._format_srt_time(segment["start"])
-                    end = self._format_srt_time(segment["end"])
-                    text = segment["text"].strip()
+            # Format all SRT timestamps in one vectorized pass
+            starts = self._format_srt_times([caption["start"] for caption in captions])
+            ends = self._format_srt_times([caption["end"] for caption in captions])
 
-                    f.write(f"{i}\n")
-                    f.write(f"{start} --> {end}\n")
-                    f.write(f"{text}\n\n")
+            # Build the whole file in memory and write it with one call
+            blocks = [
+                f"{i}\n{start} --> {end}\n{caption['text']}\n\n"
+                for i, (caption, start, end) in enumerate(zip(captions, starts, ends), 1)
+            ]
+            Path(output_path).write_text("".join(blocks))
 
             logger.info("SRT file created", audio=audio_path, output=output_path)
             return output_path
@@ -600,3 +1613,19 @@ class WhisperTool:
         secs = int(seconds % 60)
         millis = int((seconds % 1) * 1000)
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+    def _format_srt_times(self, seconds: list[float]) -> list[str]:
+        """Format many offsets as SRT timestamps, splitting fields with NumPy."""
+        if not NUMPY_AVAILABLE:
+            return [self._format_srt_time(value) for value in seconds]
+
+        values = np.asarray(seconds, dtype=np.float64)
+        # Same arithmetic as _format_srt_time, applied to the whole array
+        hours = (values // 3600).astype(np.int64).tolist()
+        minutes = ((values % 3600) // 60).astype(np.int64).tolist()
+        secs = (values % 60).astype(np.int64).tolist()
+        millis = ((values % 1) * 1000).astype(np.int64).tolist()
+        return [
+            f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+            for h, m, s, ms in zip(hours, minutes, secs, millis)
+        ]
@@ -8,14 +8,472 @@ Provides basic analytics tracking using SQLite:
 - Basic reporting
 """
 
+import hashlib
+import heapq
+import json
+import math
+import os
+import queue
 import sqlite3
+import struct
+import threading
+import time
 import uuid
+import weakref
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Iterator, Optional, List, Dict, Any
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+    logger.warning("msgpack not available, storing event properties as JSON. Install with: pip install msgpack")
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+try:
+    import apsw
+    APSW_AVAILABLE = True
+except ImportError:
+    APSW_AVAILABLE = False
+
+_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',  # 256 MB
+    'PRAGMA cache_size=-65536',  # 64 MB
+    'PRAGMA wal_autocheckpoint=1000',
+    'PRAGMA foreign_keys=OFF',
+)
+
+# Per-connection settings for the read pool; journal_mode persists in the file.
+_READ_PRAGMAS = (
+    'PRAGMA query_only=1',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-65536',
+)
+
+_CREATE_EVENTS_SQL = '''
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp INTEGER NOT NULL,
+        event_type TEXT NOT NULL,
+        page_url_id INTEGER,
+        user_agent_id INTEGER,
+        referrer_id INTEGER,
+        session_id TEXT,
+        user_id TEXT,
+        properties BLOB,
+        ip_address TEXT
+    )
+'''
+
+_INSERT_EVENT_SQL = '''
+    INSERT INTO events (
+        timestamp, event_type, page_url_id, user_agent_id,
+        referrer_id, session_id, user_id, properties, ip_address
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Repetitive text columns are interned into (id, value) dictionary tables;
+# keyed by their position in a buffered event row.
+_DICTIONARY_COLUMNS = (
+    (2, 'page_url', 'urls'),
+    (3, 'user_agent', 'user_agents'),
+    (4, 'referrer', 'referrers'),
+)
+
+_ID_CACHE_SIZE = 10000
+
+# Columns returned by get_events_by_type, in SELECT order
+_EVENT_COLUMNS = (
+    'id', 'timestamp', 'event_type', 'page_url', 'user_agent', 'referrer',
+    'session_id', 'user_id', 'properties', 'ip_address',
+)
+
+# Control items for the background writer queue
+_FLUSH = object()
+_STOP = object()
+
+# Process-wide (writer, write lock, reader pool) per database file, so
+# instances created per request reuse open connections instead of
+# reopening the .db/-wal/-shm files and re-running schema setup. Open
+# instances are counted per file; the last close() closes the connections.
+_CONNECTIONS: Dict[str, tuple] = {}
+_CONNECTION_USERS: Counter = Counter()
+_CONNECTIONS_LOCK = threading.Lock()
+
+# Rollup tables and bucket widths in milliseconds, keyed by granularity
+_ROLLUPS = {
+    'hour': ('events_hourly', 3_600_000),
+    'day': ('events_daily', 86_400_000),
+}
+
+# Formatted once so each flush binds against the same statement strings,
+# which sqlite3's per-connection statement cache reuses without re-parsing.
+_UPSERT_ROLLUP_SQL = {
+    granularity: f'''
+    INSERT INTO {table} (bucket, page_url, event_type, events, sessions, users)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(bucket, page_url, event_type) DO UPDATE SET
+        events = events + excluded.events,
+        sessions = hll_merge(sessions, excluded.sessions),
+        users = hll_merge(users, excluded.users)
+'''
+    for granularity, (table, _) in _ROLLUPS.items()
+}
+
+_HLL_PRECISION = 12  # 4096 registers, ~1.6% standard error
+_HLL_INV_POW2 = [2.0 ** -rank for rank in range(65)]
+
+# Sparse sketches store (register index, rank) pairs, three bytes each
+_HLL_SPARSE_ENTRY = struct.Struct('>HB')
+
+
+class _HyperLogLog:
+    """
+    Mergeable distinct-count sketch with one byte per register.
+    
+    Most rollup buckets see only a few sessions, so sketches with at most
+    m/8 non-empty registers are serialized sparsely as sorted (index, rank)
+    pairs; fuller sketches are stored as the dense m-byte register array.
+    A serialized sketch is dense exactly when its length is m.
+    """
+    
+    def __init__(self, registers: Optional[bytes] = None, precision: int = _HLL_PRECISION):
+        self.precision = precision
+        if registers and len(registers) == 1 << precision:
+            self.registers = bytearray(registers)
+        else:
+            self.registers = bytearray(1 << precision)
+            if registers:
+                self.merge(registers)
+    
+    def add(self, value: str):
+        """Add a value to the sketch."""
+        digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+        h = int.from_bytes(digest, 'big')
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+    
+    def merge(self, registers: bytes):
+        """Merge another serialized sketch into this one (register-wise max)."""
+        if len(registers) == len(self.registers):
+            self.registers = bytearray(map(max, self.registers, registers))
+            return
+        own = self.registers
+        for index, rank in _HLL_SPARSE_ENTRY.iter_unpack(registers):
+            if rank > own[index]:
+                own[index] = rank
+    
+    def estimate(self) -> int:
+        """Estimate the number of distinct values added."""
+        m = len(self.registers)
+        zeros = self.registers.count(0)
+        
+        # Linear counting is more accurate while many registers are empty
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m / sum(_HLL_INV_POW2[r] for r in self.registers)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+    
+    def to_bytes(self) -> bytes:
+        """Serialize registers for storage, sparsely while few are set."""
+        m = len(self.registers)
+        if m - self.registers.count(0) > m // 8:
+            return bytes(self.registers)
+        pack = _HLL_SPARSE_ENTRY.pack
+        return b''.join(pack(index, rank) for index, rank in enumerate(self.registers) if rank)
+
+
+def _hll_merge(left: Optional[bytes], right: Optional[bytes]) -> Optional[bytes]:
+    """SQL scalar function merging two serialized sketches."""
+    if left is None or right is None:
+        return left if right is None else right
+    sketch = _HyperLogLog(left)
+    sketch.merge(right)
+    return sketch.to_bytes()
+
+
+class _HLLUnion:
+    """SQL aggregate merging serialized sketches into one."""
+    
+    def __init__(self):
+        self.sketch: Optional[_HyperLogLog] = None
+    
+    def step(self, registers: Optional[bytes]):
+        if registers is None:
+            return
+        if self.sketch is None:
+            self.sketch = _HyperLogLog(registers)
+        else:
+            self.sketch.merge(registers)
+    
+    def finalize(self) -> Optional[bytes]:
+        return self.sketch.to_bytes() if self.sketch else None
+
+
+def _encode_properties(properties: Dict[str, Any]) -> Any:
+    """Serialize event properties, as a msgpack BLOB when available."""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(properties, use_bin_type=True)
+    return json.dumps(properties)
+
+
+def _decode_properties(value: Any) -> Dict[str, Any]:
+    """Deserialize stored properties; TEXT values are legacy JSON."""
+    if isinstance(value, bytes):
+        return msgpack.unpackb(value, raw=False)
+    return json.loads(value)
+
+
+def _register_functions(conn: sqlite3.Connection):
+    """Register the sketch functions used by rollup queries."""
+    conn.create_function('hll_merge', 2, _hll_merge, deterministic=True)
+    conn.create_aggregate('hll_union', 1, _HLLUnion)
+
+
+def _count_distinct(sketch: Optional[bytes], values: set) -> int:
+    """Combine a stored sketch with raw values; exact when there is no sketch."""
+    if sketch is None:
+        return len(values)
+    merged = _HyperLogLog(sketch)
+    for value in values:
+        merged.add(value)
+    return merged.estimate()
+
+
+def _now_ms() -> int:
+    """Current time as integer epoch milliseconds."""
+    return time.time_ns() // 1_000_000
+
+
+def _to_ms(ts: datetime) -> int:
+    """Convert a datetime (naive values are local time) to epoch milliseconds."""
+    return int(ts.timestamp() * 1000)
+
+
+def _pick_granularity(start: datetime, end: datetime) -> str:
+    """Use hourly rollups for ranges up to two days, daily beyond that."""
+    return 'hour' if end - start <= timedelta(days=2) else 'day'
+
+
+def _bucket_start(ts: int, granularity: str) -> int:
+    """Floor an epoch-millisecond timestamp to the start of its rollup bucket."""
+    return ts - ts % _ROLLUPS[granularity][1]
+
+
+def _rollup_rows(rows: List[tuple], granularity: str) -> List[tuple]:
+    """
+    Aggregate event rows per (bucket, page_url, event_type).
+    
+    Rows use the event insert layout; returns rollup upsert parameters.
+    """
+    counts: Counter = Counter()
+    sessions: Dict[tuple, _HyperLogLog] = {}
+    users: Dict[tuple, _HyperLogLog] = {}
+    
+    for row in rows:
+        key = (_bucket_start(row[0], granularity), row[2] or '', row[1])
+        counts[key] += 1
+        if row[5]:
+            sessions.setdefault(key, _HyperLogLog()).add(row[5])
+        if row[6]:
+            users.setdefault(key, _HyperLogLog()).add(row[6])
+    
+    return [
+        key + (
+            count,
+            sessions[key].to_bytes() if key in sessions else None,
+            users[key].to_bytes() if key in users else None
+        )
+        for key, count in counts.items()
+    ]
+
+
+class _EventWriter:
+    """
+    Background writer that batches queued event rows into SQLite.
+    
+    Holds everything a write needs but not the BabyAnalytics instance, so
+    an instance that is dropped without close() can still be collected;
+    its finalizer then stops the thread once queued rows are written.
+    """
+    
+    def __init__(
+        self,
+        ingest,
+        write_lock: threading.Lock,
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int
+    ):
+        self.ingest = ingest
+        self.write_lock = write_lock
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.last_write_ok = True
+        self.id_cache: Dict[str, OrderedDict] = {
+            table: OrderedDict() for _, _, table in _DICTIONARY_COLUMNS
+        }
+        self.thread = threading.Thread(
+            target=self._drain, name="baby-analytics-writer", daemon=True
+        )
+        self.thread.start()
+    
+    def stop(self):
+        """Ask the thread to write what is queued and exit, without waiting."""
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+    
+    def _lookup_ids(self, cursor, table: str, values: set) -> Dict[str, int]:
+        """
+        Resolve dictionary values missing from the id cache, inserting new ones.
+        
+        Runs inside the flush transaction; callers add the returned ids to
+        the cache only after commit so a rollback cannot leave stale ids.
+        
+        Args:
+            cursor: Cursor on the ingest connection
+            table: Dictionary table name
+            values: Values to resolve
+            
+        Returns:
+            Dict of value to id for values that were not cached
+        """
+        cache = self.id_cache[table]
+        missing = [value for value in values if value not in cache]
+        found: Dict[str, int] = {}
+        
+        if missing:
+            cursor.executemany(
+                f'INSERT OR IGNORE INTO {table} (value) VALUES (?)',
+                [(value,) for value in missing]
+            )
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                cursor.execute(
+                    f'SELECT value, id FROM {table} WHERE value IN ({",".join("?" * len(chunk))})',
+                    chunk
+                )
+                found.update((value, row_id) for value, row_id in cursor.fetchall())
+        
+        return found
+    
+    def _cache_ids(self, table: str, ids: Dict[str, int]):
+        """Add resolved ids to a table's bounded LRU cache."""
+        cache = self.id_cache[table]
+        cache.update(ids)
+        while len(cache) > _ID_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def _drain(self):
+        """Background writer loop: batch queued rows by size and time."""
+        rows: List[tuple] = []
+        taken = 0
+        deadline = None
+        
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+                taken += 1
+            except queue.Empty:
+                item = _FLUSH  # flush_interval elapsed
+            
+            if item is not _FLUSH and item is not _STOP:
+                rows.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(rows) < self.batch_size:
+                    continue
+            
+            if rows:
+                self.last_write_ok = self._write_batch(rows)
+            rows, deadline = [], None
+            
+            for _ in range(taken):
+                self.queue.task_done()
+            taken = 0
+            
+            if item is _STOP:
+                return
+    
+    def _write_batch(self, rows: List[tuple]) -> bool:
+        """
+        Write event rows and their rollups in one transaction.
+        
+        Args:
+            rows: Event rows built by _event_row
+            
+        Returns:
+            True if successful
+        """
+        try:
+            with self.write_lock:
+                cursor = self.ingest.cursor()
+                cursor.execute('BEGIN')
+                try:
+                    new_ids = {}
+                    id_rows = [list(row) for row in rows]
+                    for index, _, table in _DICTIONARY_COLUMNS:
+                        values = {row[index] for row in rows if row[index] is not None}
+                        new_ids[table] = self._lookup_ids(cursor, table, values)
+                        cache = self.id_cache[table]
+                        for id_row in id_rows:
+                            value = id_row[index]
+                            if value is None:
+                                continue
+                            if value in cache:
+                                cache.move_to_end(value)
+                                id_row[index] = cache[value]
+                            else:
+                                id_row[index] = new_ids[table][value]
+                    
+                    cursor.executemany(_INSERT_EVENT_SQL, id_rows)
+                    for granularity, sql in _UPSERT_ROLLUP_SQL.items():
+                        cursor.executemany(
+                            sql,
+                            _rollup_rows(rows, granularity)
+                        )
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    raise
+                cursor.execute('COMMIT')
+                
+                for table, ids in new_ids.items():
+                    self._cache_ids(table, ids)
+            
+            logger.debug("Events flushed", count=len(rows))
+            return True
+            
+        except Exception as e:
+            logger.error("Flush events failed", error=str(e), dropped=len(rows))
+            return False
+
 
 class BabyAnalytics:
     """
@@ -29,64 +487,367 @@ class BabyAnalytics:
     - Basic reporting
     """
     
-    def __init__(self, db_path: str = "./analytics.db"):
+    def __init__(
+        self,
+        db_path: str = "./analytics.db",
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        read_pool_size: int = 4,
+        queue_size: int = 10000
+    ):
         """
         Initialize Baby Analytics.
         
         Args:
             db_path: Path to SQLite database file
+            batch_size: Number of buffered events that triggers a flush
+            flush_interval: Seconds after which buffered events are flushed
+            read_pool_size: Number of read-only connections used by reports
+            queue_size: Maximum events waiting for the background writer
         """
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row  # Return rows as dicts
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped_events = 0
+        self._ddb = None
+        self._ddb_lock = threading.Lock()
+        self._ddb_failed = False
+        
+        # SQLite allows a single writer: all writes go through one
+        # autocommit connection guarded by a lock, while reports check out
+        # read-only connections that WAL lets run alongside the writer.
+        # Connections are shared by every instance using the same file.
+        self._shared_key = None if db_path == ':memory:' else os.path.abspath(db_path)
+        with _CONNECTIONS_LOCK:
+            shared = _CONNECTIONS.get(self._shared_key)
+            if shared:
+                self._writer, self._ingest, self._write_lock, self._readers = shared
+            else:
+                self._open_connections(read_pool_size)
+                if self._shared_key:
+                    _CONNECTIONS[self._shared_key] = (
+                        self._writer, self._ingest, self._write_lock, self._readers
+                    )
+            if self._shared_key:
+                _CONNECTION_USERS[self._shared_key] += 1
+        
+        # Callers only enqueue; a daemon thread batches rows into SQLite
+        self._events = _EventWriter(
+            self._ingest, self._write_lock, batch_size, flush_interval, queue_size
+        )
+        self._queue = self._events.queue
+        self._id_cache = self._events.id_cache
+        self._writer_thread = self._events.thread
+        self._finalizer = weakref.finalize(self, self._events.stop)
+    
+    def _open_connections(self, read_pool_size: int):
+        """Open and configure the writer and read pool, creating the schema."""
+        self._write_lock = threading.Lock()
+        self._writer = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        _register_functions(self._writer)
+        self._configure_pragmas()
         self._create_tables()
+        self._ingest = self._open_ingest()
+        
+        self._readers: queue.Queue = queue.Queue()
+        if self.db_path == ':memory:':
+            # Each connection to ':memory:' opens its own empty database
+            return
+        for _ in range(max(1, read_pool_size)):
+            self._readers.put(self._open_reader())
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Write connection."""
+        return self._writer
+    
+    def _configure_pragmas(self):
+        """Tune SQLite for an ingest-heavy, read-mostly workload."""
+        # WAL lets readers proceed during writes; NORMAL sync is durable
+        # across application crashes and only fsyncs at checkpoints.
+        for pragma in _PRAGMAS:
+            self._writer.execute(pragma)
+    
+    def _open_ingest(self):
+        """
+        Open the connection used for event batch writes.
+        
+        apsw binds parameters straight through SQLite's C API, skipping the
+        stdlib's per-call statement cache lookup and type adaptation on the
+        hottest statements. Schema changes, pruning and reports stay on
+        sqlite3; every write is serialized by the shared write lock.
+        
+        Returns:
+            apsw connection, or the sqlite3 writer when apsw is unavailable
+        """
+        if not APSW_AVAILABLE or self.db_path == ':memory:':
+            return self._writer
+        
+        conn = apsw.Connection(self.db_path)
+        conn.setbusytimeout(5000)
+        conn.createscalarfunction('hll_merge', _hll_merge, 2, deterministic=True)
+        for pragma in _PRAGMAS:
+            conn.cursor().execute(pragma).fetchall()
+        return conn
+    
+    def _open_reader(self) -> sqlite3.Connection:
+        """Open a read-only connection for the report pool."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        _register_functions(conn)
+        for pragma in _READ_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def _read(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read connection from the pool."""
+        if self.db_path == ':memory:':
+            # Reports on an in-memory database read through the writer
+            with self._write_lock:
+                yield self._writer
+            return
+        
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    def _duckdb(self):
+        """
+        Get a DuckDB cursor over the SQLite file for exact scans.
+        
+        DuckDB's columnar, vectorized engine is much faster than SQLite
+        for full-range COUNT/COUNT(DISTINCT) aggregates. The file is
+        attached read-only on first use; when DuckDB or its sqlite
+        extension is unavailable, callers fall back to the read pool.
+        
+        Returns:
+            DuckDB cursor, or None if DuckDB cannot be used
+        """
+        if not DUCKDB_AVAILABLE or self._shared_key is None or self._ddb_failed:
+            return None
+        
+        with self._ddb_lock:
+            if self._ddb is None:
+                try:
+                    conn = duckdb.connect(':memory:')
+                    try:
+                        conn.execute('LOAD sqlite')
+                    except duckdb.Error:
+                        conn.execute('INSTALL sqlite')
+                        conn.execute('LOAD sqlite')
+                    path = self._shared_key.replace("'", "''")
+                    conn.execute(f"ATTACH '{path}' AS s (TYPE sqlite, READ_ONLY)")
+                    self._ddb = conn
+                except Exception as e:
+                    self._ddb_failed = True
+                    logger.warning("DuckDB unavailable, using SQLite for exact scans", error=str(e))
+                    return None
+            # Each cursor is an independent connection to the same attachment
+            return self._ddb.cursor()
     
     def _create_tables(self):
         """Create database tables if they don't exist."""
-        cursor = self.conn.cursor()
+        cursor = self._writer.cursor()
+        
+        for _, _, table in _DICTIONARY_COLUMNS:
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY,
+                    value TEXT UNIQUE NOT NULL
+                )
+            ''')
+        
+        cursor.execute('PRAGMA table_info(events)')
+        if 'page_url' in {row[1] for row in cursor.fetchall()}:
+            self._migrate_dictionary_columns()
+        
+        cursor.execute(_CREATE_EVENTS_SQL)
         
+        # Events with their dictionary values resolved, for row-level reads
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TIMESTAMP NOT NULL,
-                event_type TEXT NOT NULL,
-                page_url TEXT,
-                user_agent TEXT,
-                referrer TEXT,
-                session_id TEXT,
-                user_id TEXT,
-                properties TEXT,
-                ip_address TEXT
-            )
+            CREATE VIEW IF NOT EXISTS events_view AS
+            SELECT
+                e.id, e.timestamp, e.event_type,
+                u.value AS page_url, a.value AS user_agent, r.value AS referrer,
+                e.session_id, e.user_id, e.properties, e.ip_address
+            FROM events e
+            LEFT JOIN urls u ON u.id = e.page_url_id
+            LEFT JOIN user_agents a ON a.id = e.user_agent_id
+            LEFT JOIN referrers r ON r.id = e.referrer_id
         ''')
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS sessions (
                 session_id TEXT PRIMARY KEY,
                 user_id TEXT,
-                start_time TIMESTAMP NOT NULL,
-                last_activity TIMESTAMP NOT NULL,
+                start_time INTEGER NOT NULL,
+                last_activity INTEGER NOT NULL,
                 page_views INTEGER DEFAULT 0,
                 events INTEGER DEFAULT 0
             )
         ''')
         
+        # Sessions are maintained inside SQLite as events are inserted, so a
+        # batched executemany into events needs no per-session round trips.
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_events_session
+            AFTER INSERT ON events
+            WHEN NEW.session_id IS NOT NULL
+            BEGIN
+                INSERT INTO sessions (session_id, user_id, start_time, last_activity, page_views, events)
+                VALUES (
+                    NEW.session_id, NEW.user_id, NEW.timestamp, NEW.timestamp,
+                    NEW.event_type = 'pageview', 1
+                )
+                ON CONFLICT(session_id) DO UPDATE SET
+                    last_activity = MAX(last_activity, NEW.timestamp),
+                    page_views = page_views + (NEW.event_type = 'pageview'),
+                    events = events + 1;
+            END
+        ''')
+        
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_events_timestamp 
             ON events(timestamp)
         ''')
         
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_events_type 
-            ON events(event_type)
+            CREATE INDEX IF NOT EXISTS idx_events_page 
+            ON events(page_url_id)
+        ''')
+        
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")
+        existing = {row[0] for row in cursor.fetchall()}
+        
+        # Databases written before timestamps were stored as epoch
+        # milliseconds: convert them and rebuild the rollups.
+        cursor.execute("SELECT 1 FROM events WHERE typeof(timestamp) = 'text' LIMIT 1")
+        if cursor.fetchone():
+            self._migrate_timestamps()
+            for table, _ in _ROLLUPS.values():
+                cursor.execute(f'DROP TABLE IF EXISTS {table}')
+                existing.discard(table)
+        
+        # Per-bucket event counts and session/user sketches maintained by
+        # flush(); page_url is stored as '' when missing so the primary key
+        # can match on upsert.
+        for table, _ in _ROLLUPS.values():
+            if table in existing:
+                cursor.execute(f'PRAGMA table_info({table})')
+                if 'sessions' not in {row[1] for row in cursor.fetchall()}:
+                    cursor.execute(f'DROP TABLE {table}')
+                    existing.discard(table)
+            
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {table} (
+                    bucket INTEGER NOT NULL,
+                    page_url TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    events INTEGER NOT NULL DEFAULT 0,
+                    sessions BLOB,
+                    users BLOB,
+                    PRIMARY KEY (bucket, page_url, event_type)
+                ) WITHOUT ROWID
+            ''')
+        
+        missing = [g for g, (table, _) in _ROLLUPS.items() if table not in existing]
+        if missing:
+            self._backfill_rollups(missing)
+        
+        # (event_type, timestamp) serves type-filtered range scans, including
+        # ORDER BY timestamp DESC (SQLite walks the index backwards, so no
+        # separate DESC index is needed), and makes the old single-column
+        # event_type index redundant.
+        
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_events_type_ts
+            ON events(event_type, timestamp)
         ''')
         
+        # Partial covering index: page view reports never touch the table
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_events_page 
-            ON events(page_url)
+            CREATE INDEX IF NOT EXISTS idx_events_pv_cover
+            ON events(event_type, timestamp, page_url_id, session_id)
+            WHERE event_type = 'pageview'
+        ''')
+        
+        cursor.execute('DROP INDEX IF EXISTS idx_events_type')
+        
+        if not {'idx_events_type_ts', 'idx_events_pv_cover'} <= existing:
+            cursor.execute('ANALYZE')
+    
+    def _migrate_dictionary_columns(self):
+        """Move legacy TEXT page_url/user_agent/referrer columns to dictionary ids."""
+        self._writer.execute('BEGIN')
+        # The trigger would re-count sessions and the indexes would keep
+        # their names on the renamed table.
+        self._writer.execute('DROP TRIGGER IF EXISTS trg_events_session')
+        self._writer.execute('ALTER TABLE events RENAME TO events_legacy')
+        self._writer.execute(_CREATE_EVENTS_SQL)
+        
+        for _, column, table in _DICTIONARY_COLUMNS:
+            self._writer.execute(f'''
+                INSERT OR IGNORE INTO {table} (value)
+                SELECT DISTINCT {column} FROM events_legacy WHERE {column} IS NOT NULL
+            ''')
+        
+        self._writer.execute('''
+            INSERT INTO events (
+                id, timestamp, event_type, page_url_id, user_agent_id,
+                referrer_id, session_id, user_id, properties, ip_address
+            )
+            SELECT
+                e.id, e.timestamp, e.event_type, u.id, a.id,
+                r.id, e.session_id, e.user_id, e.properties, e.ip_address
+            FROM events_legacy e
+            LEFT JOIN urls u ON u.value = e.page_url
+            LEFT JOIN user_agents a ON a.value = e.user_agent
+            LEFT JOIN referrers r ON r.value = e.referrer
+        ''')
+        self._writer.execute('DROP TABLE events_legacy')
+        self._writer.execute('COMMIT')
+        
+        logger.info("Migrated event text columns to dictionary tables", db_path=self.db_path)
+    
+    def _migrate_timestamps(self):
+        """Convert legacy local-time TEXT timestamps to epoch milliseconds."""
+        to_ms = "CAST(ROUND((julianday({0}, 'utc') - 2440587.5) * 86400000) AS INTEGER)"
+        
+        self._writer.execute('BEGIN')
+        self._writer.execute(f'''
+            UPDATE events SET timestamp = {to_ms.format('timestamp')}
+            WHERE typeof(timestamp) = 'text'
+        ''')
+        self._writer.execute(f'''
+            UPDATE sessions SET
+                start_time = {to_ms.format('start_time')},
+                last_activity = {to_ms.format('last_activity')}
+            WHERE typeof(start_time) = 'text'
         ''')
+        self._writer.execute('COMMIT')
         
-        self.conn.commit()
+        logger.info("Migrated event timestamps to epoch milliseconds", db_path=self.db_path)
+    
+    def _backfill_rollups(self, granularities: List[str], batch_size: int = 10000):
+        """Build rollup rows for events written before the rollups existed."""
+        source = self._writer.execute(
+            'SELECT timestamp, event_type, page_url, session_id, user_id FROM events_view'
+        )
+        while True:
+            batch = source.fetchmany(batch_size)
+            if not batch:
+                break
+            rows = [
+                (ts, event_type, page_url, None, None, session_id, user_id)
+                for ts, event_type, page_url, session_id, user_id in batch
+            ]
+            for granularity in granularities:
+                self._writer.executemany(
+                    _UPSERT_ROLLUP_SQL[granularity],
+                    _rollup_rows(rows, granularity)
+                )
     
     def track_event(
         self,
@@ -102,6 +863,11 @@ class BabyAnalytics:
         """
         Track an analytics event.
         
+        The event is queued for a background writer, which stores events in
+        batches of up to ``batch_size`` at least every ``flush_interval``
+        seconds. Events are dropped (and counted in ``dropped_events``) when
+        the queue is full.
+        
         Args:
             event_type: Type of event (pageview, click, signup, etc.)
             page_url: Page URL
@@ -116,62 +882,151 @@ class BabyAnalytics:
             True if successful
         """
         try:
-            cursor = self.conn.cursor()
-            
-            # Generate session ID if not provided
-            if not session_id:
-                session_id = str(uuid.uuid4())
-            
-            # Convert properties to JSON string
-            import json
-            properties_json = json.dumps(properties) if properties else None
+            row = self._event_row(
+                _now_ms(), event_type, page_url, user_agent, referrer,
+                session_id, user_id, properties, ip_address
+            )
+            self._queue.put_nowait(row)
             
-            cursor.execute('''
-                INSERT INTO events (
-                    timestamp, event_type, page_url, user_agent,
-                    referrer, session_id, user_id, properties, ip_address
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                datetime.now(),
-                event_type,
-                page_url,
-                user_agent,
-                referrer,
-                session_id,
-                user_id,
-                properties_json,
-                ip_address
-            ))
-            
-            # Update or create session
-            is_pageview = (event_type == 'pageview')
-            self._update_session(session_id, user_id, is_pageview)
-            
-            self.conn.commit()
-            
-            logger.debug("Event tracked", event_type=event_type, session=session_id)
+            logger.debug("Event tracked", event_type=event_type, session=row[5])
             return True
             
+        except queue.Full:
+            self.dropped_events += 1
+            logger.warning("Analytics queue full, event dropped", dropped=self.dropped_events)
+            return False
         except Exception as e:
             logger.error("Track event failed", error=str(e))
             return False
     
-    def _update_session(self, session_id: str, user_id: Optional[str] = None, is_pageview: bool = False):
-        """Update or create session record."""
-        cursor = self.conn.cursor()
+    def track_events(self, events: List[Dict[str, Any]]) -> bool:
+        """
+        Track a batch of events and wait until they are stored.
         
-        # Increment page_views if this is a pageview event
-        pageview_increment = 1 if is_pageview else 0
+        Args:
+            events: List of dicts with the keyword arguments of track_event
+            
+        Returns:
+            True if successful
+        """
+        try:
+            # One timestamp for the whole batch
+            now = _now_ms()
+            for event in events:
+                self._queue.put(self._event_row(now, **event))
+        except Exception as e:
+            logger.error("Track events failed", error=str(e))
+            return False
         
-        cursor.execute('''
-            INSERT INTO sessions (session_id, user_id, start_time, last_activity, page_views, events)
-            VALUES (?, ?, ?, ?, ?, 1)
-            ON CONFLICT(session_id) DO UPDATE SET
-                last_activity = ?,
-                page_views = page_views + ?,
-                events = events + 1
-        ''', (session_id, user_id, datetime.now(), datetime.now(), pageview_increment, datetime.now(), pageview_increment))
+        return self.flush()
+    
+    @staticmethod
+    def _event_row(
+        now: int,
+        event_type: str,
+        page_url: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        referrer: Optional[str] = None,
+        session_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        properties: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None
+    ) -> tuple:
+        """Build an event row in insert column order."""
+        # Generate session ID if not provided
+        if not session_id:
+            session_id = str(uuid.uuid4())
+        
+        properties_blob = _encode_properties(properties) if properties else None
+        
+        return (
+            now,
+            event_type,
+            page_url,
+            user_agent,
+            referrer,
+            session_id,
+            user_id,
+            properties_blob,
+            ip_address
+        )
+    
+    def flush(self) -> bool:
+        """
+        Wait until every queued event has been written.
+        
+        Returns:
+            True if the last write succeeded
+        """
+        if not self._writer_thread.is_alive():
+            return self._events.last_write_ok
+        
+        self._queue.put(_FLUSH)
+        self._queue.join()
+        return self._events.last_write_ok
+    
+    @staticmethod
+    def _split_range(start: int, end: int, granularity: str = 'hour'):
+        """
+        Split an inclusive time range into whole rollup buckets and raw edges.
+        
+        Args:
+            start: Range start in epoch milliseconds
+            end: Range end in epoch milliseconds (inclusive)
+            granularity: Rollup granularity ('hour' or 'day')
+            
+        Returns:
+            Tuple of (half-open bucket range or None, list of half-open
+            ranges that must be read from raw events)
+        """
+        step = _ROLLUPS[granularity][1]
+        end_exclusive = end + 1
+        
+        first = _bucket_start(start, granularity)
+        if first < start:
+            first += step
+        last = _bucket_start(end_exclusive, granularity)
+        
+        if first >= last:
+            return None, [(start, end_exclusive)]
+        
+        edges = [
+            (lo, hi) for lo, hi in ((start, first), (last, end_exclusive))
+            if lo < hi
+        ]
+        return (first, last), edges
+    
+    @classmethod
+    def _plan_range(cls, start: int, end: int, granularity: str):
+        """
+        Cover an inclusive time range with rollup buckets, coarsest first.
+        
+        Daily plans use whole days in the middle, whole hours at the ends,
+        and raw events only for the remaining partial hours.
+        
+        Args:
+            start: Range start in epoch milliseconds
+            end: Range end in epoch milliseconds (inclusive)
+            granularity: Coarsest rollup to use ('hour' or 'day')
+            
+        Returns:
+            Tuple of (list of (table, bucket_start, bucket_end) ranges,
+            list of half-open raw event ranges)
+        """
+        levels = ('day', 'hour') if granularity == 'day' else ('hour',)
+        rollups = []
+        pending = [(start, end + 1)]
+        
+        for level in levels:
+            remaining = []
+            for lo, hi in pending:
+                buckets, edges = cls._split_range(lo, hi - 1, level)
+                if buckets:
+                    rollups.append((_ROLLUPS[level][0],) + buckets)
+                remaining.extend(edges)
+            pending = remaining
+        
+        return rollups, pending
     
     def track_pageview(
         self,
@@ -207,7 +1062,9 @@ class BabyAnalytics:
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        limit: int = 100
+        limit: int = 100,
+        granularity: Optional[str] = None,
+        exact: Optional[bool] = None
     ) -> List[Dict]:
         """
         Get page view statistics.
@@ -216,36 +1073,157 @@ class BabyAnalytics:
             start_date: Start date filter
             end_date: End date filter
             limit: Maximum results
+            granularity: Rollup granularity ('hour' or 'day'); picked from
+                the range length when omitted
+            exact: Count unique views exactly from raw events instead of
+                rollup sketches; defaults to True for ranges under a day
             
         Returns:
             List of page view stats
         """
+        self.flush()
+        
+        if not start_date:
+            start_date = datetime.now() - timedelta(days=30)
+        if not end_date:
+            end_date = datetime.now()
+        start_ms, end_ms = _to_ms(start_date), _to_ms(end_date)
+        granularity = granularity or _pick_granularity(start_date, end_date)
+        if exact is None:
+            exact = end_date - start_date < timedelta(days=1)
+        
         try:
-            cursor = self.conn.cursor()
+            if exact:
+                return self._exact_page_views(start_ms, end_ms, limit)
+            
+            with self._read() as conn:
+                cursor = conn.cursor()
+                
+                rollups, edges = self._plan_range(start_ms, end_ms, granularity)
+                views: Dict[Optional[str], int] = {}
+                sketches: Dict[Optional[str], bytes] = {}
+                edge_sessions: Dict[Optional[str], set] = {}
+                
+                for table, lo, hi in rollups:
+                    cursor.execute(f'''
+                        SELECT NULLIF(page_url, ''), SUM(events), hll_union(sessions)
+                        FROM {table}
+                        WHERE event_type = 'pageview'
+                            AND bucket >= ? AND bucket < ?
+                        GROUP BY page_url
+                    ''', (lo, hi))
+                    for page_url, count, sketch in cursor.fetchall():
+                        views[page_url] = views.get(page_url, 0) + count
+                        sketches[page_url] = _hll_merge(sketches.get(page_url), sketch)
+                
+                for lo, hi in edges:
+                    cursor.execute('''
+                        SELECT u.value, e.session_id, COUNT(*)
+                        FROM events e
+                        LEFT JOIN urls u ON u.id = e.page_url_id
+                        WHERE e.event_type = 'pageview'
+                            AND e.timestamp >= ? AND e.timestamp < ?
+                        GROUP BY e.page_url_id, e.session_id
+                    ''', (lo, hi))
+                    for page_url, session_id, count in cursor.fetchall():
+                        views[page_url] = views.get(page_url, 0) + count
+                        if session_id is not None:
+                            edge_sessions.setdefault(page_url, set()).add(session_id)
             
-            if not start_date:
-                start_date = datetime.now() - timedelta(days=30)
-            if not end_date:
-                end_date = datetime.now()
+            top = heapq.nlargest(limit, views.items(), key=lambda item: item[1])
+            return [
+                {
+                    'page_url': page_url,
+                    'views': count,
+                    'unique_views': _count_distinct(
+                        sketches.get(page_url), edge_sessions.get(page_url, set())
+                    )
+                }
+                for page_url, count in top
+            ]
             
+        except Exception as e:
+            logger.error("Get page views failed", error=str(e))
+            return []
+    
+    def _exact_page_views(self, start_ms: int, end_ms: int, limit: int) -> List[Dict]:
+        """Count page views and distinct sessions exactly from raw events."""
+        ddb = self._duckdb()
+        if ddb is not None:
+            try:
+                ddb.execute('''
+                    SELECT
+                        u.value as page_url,
+                        COUNT(*) as views,
+                        COUNT(DISTINCT e.session_id) as unique_views
+                    FROM s.events e
+                    LEFT JOIN s.urls u ON u.id = e.page_url_id
+                    WHERE e.event_type = 'pageview'
+                        AND e.timestamp BETWEEN ? AND ?
+                    GROUP BY e.page_url_id, u.value
+                    ORDER BY views DESC
+                    LIMIT ?
+                ''', (start_ms, end_ms, limit))
+                return [
+                    {'page_url': page_url, 'views': views, 'unique_views': unique_views}
+                    for page_url, views, unique_views in ddb.fetchall()
+                ]
+            finally:
+                ddb.close()
+        
+        with self._read() as conn:
+            cursor = conn.cursor()
+            # The partial covering index holds every column needed, so the
+            # scan and per-page distinct grouping never touch the table.
             cursor.execute('''
-                SELECT 
-                    page_url,
+                SELECT
+                    u.value as page_url,
                     COUNT(*) as views,
-                    COUNT(DISTINCT session_id) as unique_views
-                FROM events
-                WHERE event_type = 'pageview'
-                    AND timestamp BETWEEN ? AND ?
-                GROUP BY page_url
+                    COUNT(DISTINCT e.session_id) as unique_views
+                FROM events e INDEXED BY idx_events_pv_cover
+                LEFT JOIN urls u ON u.id = e.page_url_id
+                WHERE e.event_type = 'pageview'
+                    AND e.timestamp BETWEEN ? AND ?
+                GROUP BY e.page_url_id
                 ORDER BY views DESC
                 LIMIT ?
-            ''', (start_date, end_date, limit))
+            ''', (start_ms, end_ms, limit))
             
-            return [dict(row) for row in cursor.fetchall()]
+            return [
+                {'page_url': page_url, 'views': views, 'unique_views': unique_views}
+                for page_url, views, unique_views in cursor.fetchall()
+            ]
+    
+    def get_page_views_arrow(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        granularity: Optional[str] = None
+    ) -> Optional["pa.Table"]:
+        """
+        Get page view statistics as a columnar Arrow table.
+        
+        Args:
+            start_date: Start date filter
+            end_date: End date filter
+            limit: Maximum results
+            granularity: Rollup granularity ('hour' or 'day')
             
-        except Exception as e:
-            logger.error("Get page views failed", error=str(e))
-            return []
+        Returns:
+            Table with page_url, views and unique_views columns, or None
+            if pyarrow is not installed
+        """
+        if not PYARROW_AVAILABLE:
+            logger.error("pyarrow not available. Install with: pip install pyarrow")
+            return None
+        
+        rows = self.get_page_views(start_date, end_date, limit, granularity)
+        return pa.table({
+            'page_url': pa.array([row['page_url'] for row in rows], pa.string()),
+            'views': pa.array([row['views'] for row in rows], pa.int64()),
+            'unique_views': pa.array([row['unique_views'] for row in rows], pa.int64()),
+        })
     
     def get_traffic_sources(
         self,
@@ -264,28 +1242,36 @@ class BabyAnalytics:
         Returns:
             List of traffic source stats
         """
+        self.flush()
+        
+        if not start_date:
+            start_date = datetime.now() - timedelta(days=30)
+        if not end_date:
+            end_date = datetime.now()
+        start_ms, end_ms = _to_ms(start_date), _to_ms(end_date)
+        
         try:
-            cursor = self.conn.cursor()
-            
-            if not start_date:
-                start_date = datetime.now() - timedelta(days=30)
-            if not end_date:
-                end_date = datetime.now()
-            
-            cursor.execute('''
-                SELECT 
-                    COALESCE(referrer, 'Direct') as source,
-                    COUNT(*) as visits,
-                    COUNT(DISTINCT session_id) as unique_visitors
-                FROM events
-                WHERE timestamp BETWEEN ? AND ?
-                GROUP BY referrer
-                ORDER BY visits DESC
-                LIMIT ?
-            ''', (start_date, end_date, limit))
-            
-            return [dict(row) for row in cursor.fetchall()]
-            
+            with self._read() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    SELECT 
+                        COALESCE(r.value, 'Direct') as source,
+                        COUNT(*) as visits,
+                        COUNT(DISTINCT e.session_id) as unique_visitors
+                    FROM events e
+                    LEFT JOIN referrers r ON r.id = e.referrer_id
+                    WHERE e.timestamp BETWEEN ? AND ?
+                    GROUP BY e.referrer_id
+                    ORDER BY visits DESC
+                    LIMIT ?
+                ''', (start_ms, end_ms, limit))
+                
+                return [
+                    {'source': source, 'visits': visits, 'unique_visitors': unique_visitors}
+                    for source, visits, unique_visitors in cursor.fetchall()
+                ]
+                
         except Exception as e:
             logger.error("Get traffic sources failed", error=str(e))
             return []
@@ -309,33 +1295,119 @@ class BabyAnalytics:
         Returns:
             List of events
         """
+        self.flush()
+        
+        if not start_date:
+            start_date = datetime.now() - timedelta(days=30)
+        if not end_date:
+            end_date = datetime.now()
+        start_ms, end_ms = _to_ms(start_date), _to_ms(end_date)
+        
         try:
-            cursor = self.conn.cursor()
-            
-            if not start_date:
-                start_date = datetime.now() - timedelta(days=30)
-            if not end_date:
-                end_date = datetime.now()
+            with self._read() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute(f'''
+                    SELECT {', '.join(_EVENT_COLUMNS)}
+                    FROM events_view
+                    WHERE event_type = ?
+                        AND timestamp BETWEEN ? AND ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                ''', (event_type, start_ms, end_ms, limit))
+                
+                events = [dict(zip(_EVENT_COLUMNS, row)) for row in cursor.fetchall()]
             
-            cursor.execute('''
-                SELECT *
-                FROM events
-                WHERE event_type = ?
-                    AND timestamp BETWEEN ? AND ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            ''', (event_type, start_date, end_date, limit))
-            
-            return [dict(row) for row in cursor.fetchall()]
+            for event in events:
+                event['timestamp'] = datetime.fromtimestamp(event['timestamp'] / 1000).isoformat()
+                if event['properties'] is not None:
+                    event['properties'] = _decode_properties(event['properties'])
+            return events
             
         except Exception as e:
             logger.error("Get events by type failed", error=str(e))
             return []
     
+    def get_events_arrow(
+        self,
+        event_type: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        batch_size: int = 10000
+    ) -> Optional["pa.Table"]:
+        """
+        Export all events of a type in a range as a columnar Arrow table.
+        
+        Rows are streamed in batches and converted column-wise, so large
+        exports avoid building one Python dict per event. Timestamps stay
+        epoch milliseconds and properties stay in their stored encoding.
+        
+        Args:
+            event_type: Event type to filter
+            start_date: Start date filter
+            end_date: End date filter
+            batch_size: Rows fetched per batch
+            
+        Returns:
+            Arrow table of events, or None if unavailable or on error
+        """
+        if not PYARROW_AVAILABLE:
+            logger.error("pyarrow not available. Install with: pip install pyarrow")
+            return None
+        
+        self.flush()
+        
+        if not start_date:
+            start_date = datetime.now() - timedelta(days=30)
+        if not end_date:
+            end_date = datetime.now()
+        start_ms, end_ms = _to_ms(start_date), _to_ms(end_date)
+        
+        try:
+            with self._read() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT *
+                    FROM events_view
+                    WHERE event_type = ?
+                        AND timestamp BETWEEN ? AND ?
+                    ORDER BY timestamp DESC
+                ''', (event_type, start_ms, end_ms))
+                return self._fetch_arrow(cursor, batch_size)
+                
+        except Exception as e:
+            logger.error("Get events arrow failed", error=str(e))
+            return None
+    
+    @staticmethod
+    def _fetch_arrow(cursor: sqlite3.Cursor, batch_size: int = 10000) -> "pa.Table":
+        """Drain a cursor into an Arrow table, one record batch per fetchmany."""
+        names = [column[0] for column in cursor.description]
+        batches = []
+        
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            columns = zip(*rows)
+            batches.append(pa.record_batch([pa.array(list(col)) for col in columns], names=names))
+        
+        if not batches:
+            return pa.table({name: pa.array([], pa.null()) for name in names})
+        
+        # Columns that were all-NULL in one batch may type differently from
+        # another; unify before concatenating.
+        return pa.concat_tables(
+            [pa.Table.from_batches([batch]) for batch in batches],
+            promote_options='default'
+        )
+    
     def get_summary(
         self,
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        granularity: Optional[str] = None,
+        exact: Optional[bool] = None
     ) -> Dict[str, Any]:
         """
         Get summary statistics for date range.
@@ -343,66 +1415,124 @@ class BabyAnalytics:
         Args:
             start_date: Start date filter
             end_date: End date filter
+            granularity: Rollup granularity ('hour' or 'day'); picked from
+                the range length when omitted
+            exact: Count distinct sessions and users exactly from raw events
+                instead of rollup sketches; defaults to True for ranges
+                under a day
             
         Returns:
             Summary statistics dict
         """
+        self.flush()
+        
+        if not start_date:
+            start_date = datetime.now() - timedelta(days=30)
+        if not end_date:
+            end_date = datetime.now()
+        start_ms, end_ms = _to_ms(start_date), _to_ms(end_date)
+        granularity = granularity or _pick_granularity(start_date, end_date)
+        if exact is None:
+            exact = end_date - start_date < timedelta(days=1)
+        
         try:
-            cursor = self.conn.cursor()
-            
-            if not start_date:
-                start_date = datetime.now() - timedelta(days=30)
-            if not end_date:
-                end_date = datetime.now()
-            
-            # Total events
-            cursor.execute('''
-                SELECT COUNT(*) as total_events
-                FROM events
-                WHERE timestamp BETWEEN ? AND ?
-            ''', (start_date, end_date))
-            total_events = cursor.fetchone()['total_events']
-            
-            # Total page views
-            cursor.execute('''
-                SELECT COUNT(*) as pageviews
-                FROM events
-                WHERE event_type = 'pageview'
-                    AND timestamp BETWEEN ? AND ?
-            ''', (start_date, end_date))
-            pageviews = cursor.fetchone()['pageviews']
-            
-            # Unique sessions
-            cursor.execute('''
-                SELECT COUNT(DISTINCT session_id) as unique_sessions
-                FROM events
-                WHERE timestamp BETWEEN ? AND ?
-            ''', (start_date, end_date))
-            unique_sessions = cursor.fetchone()['unique_sessions']
-            
-            # Unique users
-            cursor.execute('''
-                SELECT COUNT(DISTINCT user_id) as unique_users
-                FROM events
-                WHERE user_id IS NOT NULL
-                    AND timestamp BETWEEN ? AND ?
-            ''', (start_date, end_date))
-            unique_users = cursor.fetchone()['unique_users']
-            
-            return {
-                'start_date': start_date.isoformat(),
-                'end_date': end_date.isoformat(),
-                'total_events': total_events,
-                'pageviews': pageviews,
-                'unique_sessions': unique_sessions,
-                'unique_users': unique_users,
-                'avg_events_per_session': total_events / unique_sessions if unique_sessions > 0 else 0
-            }
+            if exact:
+                total_events, pageviews, unique_sessions, unique_users = self._exact_summary(
+                    start_ms, end_ms
+                )
+                return {
+                    'start_date': start_date.isoformat(),
+                    'end_date': end_date.isoformat(),
+                    'total_events': total_events,
+                    'pageviews': pageviews,
+                    'unique_sessions': unique_sessions,
+                    'unique_users': unique_users,
+                    'avg_events_per_session': total_events / unique_sessions if unique_sessions > 0 else 0
+                }
             
+            with self._read() as conn:
+                cursor = conn.cursor()
+                
+                rollups, edges = self._plan_range(start_ms, end_ms, granularity)
+                total_events = pageviews = 0
+                session_sketch = user_sketch = None
+                sessions: set = set()
+                users: set = set()
+                
+                for table, lo, hi in rollups:
+                    cursor.execute(f'''
+                        SELECT
+                            COALESCE(SUM(events), 0),
+                            COALESCE(SUM(CASE WHEN event_type = 'pageview' THEN events END), 0),
+                            hll_union(sessions),
+                            hll_union(users)
+                        FROM {table}
+                        WHERE bucket >= ? AND bucket < ?
+                    ''', (lo, hi))
+                    count, pageview_count, session_part, user_part = cursor.fetchone()
+                    total_events += count
+                    pageviews += pageview_count
+                    session_sketch = _hll_merge(session_sketch, session_part)
+                    user_sketch = _hll_merge(user_sketch, user_part)
+                
+                for lo, hi in edges:
+                    cursor.execute('''
+                        SELECT
+                            session_id,
+                            user_id,
+                            COUNT(*),
+                            COUNT(CASE WHEN event_type = 'pageview' THEN 1 END)
+                        FROM events
+                        WHERE timestamp >= ? AND timestamp < ?
+                        GROUP BY session_id, user_id
+                    ''', (lo, hi))
+                    for session_id, user_id, count, pageview_count in cursor.fetchall():
+                        total_events += count
+                        pageviews += pageview_count
+                        if session_id is not None:
+                            sessions.add(session_id)
+                        if user_id is not None:
+                            users.add(user_id)
+                
+                # Distinct counts merge sketches with the raw edge values
+                unique_sessions = _count_distinct(session_sketch, sessions)
+                unique_users = _count_distinct(user_sketch, users)
+                
+                return {
+                    'start_date': start_date.isoformat(),
+                    'end_date': end_date.isoformat(),
+                    'total_events': total_events,
+                    'pageviews': pageviews,
+                    'unique_sessions': unique_sessions,
+                    'unique_users': unique_users,
+                    'avg_events_per_session': total_events / unique_sessions if unique_sessions > 0 else 0
+                }
+                
         except Exception as e:
             logger.error("Get summary failed", error=str(e))
             return {}
     
+    def _exact_summary(self, start_ms: int, end_ms: int) -> tuple:
+        """Compute event, pageview, session and user counts from raw events."""
+        sql = '''
+            SELECT
+                COUNT(*),
+                COUNT(CASE WHEN event_type = 'pageview' THEN 1 END),
+                COUNT(DISTINCT session_id),
+                COUNT(DISTINCT user_id)
+            FROM {events}
+            WHERE timestamp BETWEEN ? AND ?
+        '''
+        ddb = self._duckdb()
+        if ddb is not None:
+            try:
+                return ddb.execute(sql.format(events='s.events'), (start_ms, end_ms)).fetchone()
+            finally:
+                ddb.close()
+        
+        with self._read() as conn:
+            return tuple(conn.execute(sql.format(events='events'), (start_ms, end_ms)).fetchone())
+    
     def get_popular_pages(
         self,
         start_date: Optional[datetime] = None,
@@ -422,7 +1552,118 @@ class BabyAnalytics:
         """
         return self.get_page_views(start_date, end_date, limit)
     
+    def prune(self, days: int = 90, batch_size: int = 10000) -> int:
+        """
+        Delete events older than the retention window.
+        
+        Rows are deleted in small batches, each in its own transaction, so
+        ingest can interleave with a long prune. The cutoff is aligned to a
+        day boundary so the rollups are trimmed by whole buckets.
+        
+        Args:
+            days: Number of days of events to keep
+            batch_size: Maximum rows deleted per transaction
+            
+        Returns:
+            Number of events deleted
+        """
+        self.flush()
+        
+        cutoff = _bucket_start(_now_ms() - days * _ROLLUPS['day'][1], 'day')
+        deleted = 0
+        
+        try:
+            while True:
+                with self._write_lock:
+                    cursor = self._writer.execute('''
+                        DELETE FROM events
+                        WHERE rowid IN (
+                            SELECT rowid FROM events WHERE timestamp < ? LIMIT ?
+                        )
+                    ''', (cutoff, batch_size))
+                if not cursor.rowcount:
+                    break
+                deleted += cursor.rowcount
+            
+            with self._write_lock:
+                self._writer.execute('BEGIN')
+                for table, _ in _ROLLUPS.values():
+                    self._writer.execute(f'DELETE FROM {table} WHERE bucket < ?', (cutoff,))
+                self._writer.execute('DELETE FROM sessions WHERE last_activity < ?', (cutoff,))
+                self._writer.execute('COMMIT')
+                # Large deletes shift index selectivity; refresh stale stats
+                self._writer.execute('PRAGMA optimize')
+            
+            logger.info("Pruned analytics events", deleted=deleted, days=days)
+            
+        except Exception as e:
+            logger.error("Prune events failed", error=str(e), deleted=deleted)
+        
+        return deleted
+    
     def close(self):
-        """Close database connection."""
-        if self.conn:
-            self.conn.close()
+        """
+        Flush pending events and close the database connections.
+        
+        Connections to a file are shared by every open instance using it and
+        are closed when the last of them closes. Instances dropped without
+        close() keep them open until close_connections().
+        """
+        if not self._finalizer.detach():
+            return  # already closed
+        
+        if self._writer_thread.is_alive():
+            self._queue.put(_STOP)
+            self._writer_thread.join()
+        
+        with _CONNECTIONS_LOCK:
+            shared = _CONNECTIONS.get(self._shared_key)
+            if self._shared_key is None:
+                last = True
+            elif shared is None or shared[0] is not self._writer:
+                last = False  # already released by close_connections()
+            else:
+                _CONNECTION_USERS[self._shared_key] -= 1
+                last = _CONNECTION_USERS[self._shared_key] <= 0
+                if last:
+                    del _CONNECTIONS[self._shared_key]
+                    del _CONNECTION_USERS[self._shared_key]
+            
+            if last:
+                with self._write_lock:
+                    # Re-analyzes only tables whose stats drifted since the last
+                    # run, keeping idx_events_type_ts preferred for ordered scans.
+                    self._writer.execute('PRAGMA optimize')
+                    _close_connection_set(self._writer, self._ingest, self._readers)
+        
+        with self._ddb_lock:
+            if self._ddb is not None:
+                self._ddb.close()
+                self._ddb = None
+
+
+def _close_connection_set(writer: sqlite3.Connection, ingest, readers: queue.Queue):
+    """Close the writer and ingest connections and every pooled reader."""
+    if ingest is not writer:
+        ingest.close()
+    writer.close()
+    while not readers.empty():
+        readers.get_nowait().close()
+
+
+def close_connections(db_path: Optional[str] = None):
+    """
+    Close shared analytics connections.
+    
+    Args:
+        db_path: Database file to release; all files when omitted
+    """
+    with _CONNECTIONS_LOCK:
+        keys = [os.path.abspath(db_path)] if db_path else list(_CONNECTIONS)
+        for key in keys:
+            shared = _CONNECTIONS.pop(key, None)
+            _CONNECTION_USERS.pop(key, None)
+            if shared:
+                writer, ingest, write_lock, readers = shared
+                with write_lock:
+                    _close_connection_set(writer, ingest, readers)
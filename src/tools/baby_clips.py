@@ -7,14 +7,40 @@ Automatically extracts engaging clips from long videos using:
 - Content density analysis
 """
 
+import atexit
+import copy
+import hashlib
+import json
+import os
 import subprocess
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 import structlog
 
+from . import _ffmpeg
+
+# Whisper models are loaded and cached by the audio tools, so a process
+# running both holds one copy of each model
+from .audio import (
+    WHISPER_COMPUTE_TYPES,
+    WHISPER_SAMPLE_RATE,
+    _ensure_whisper,
+    _get_whisper_model,
+    _run_whisper as _transcribe,
+    _whisper_workers,
+)
+
 logger = structlog.get_logger(__name__)
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 try:
     from scenedetect import VideoManager, SceneManager
     from scenedetect.detectors import ContentDetector
@@ -23,13 +49,6 @@ except ImportError:
     SCENEDETECT_AVAILABLE = False
     logger.warning("PySceneDetect not available. Install with: pip install scenedetect")
 
-try:
-    import whisper
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
-    logger.warning("Whisper not available. Install with: pip install openai-whisper")
-
 try:
     from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
     VADER_AVAILABLE = True
@@ -37,6 +56,138 @@ except ImportError:
     VADER_AVAILABLE = False
     logger.warning("VADER not available. Install with: pip install vaderSentiment")
 
+try:
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+    ONNX_SENTIMENT_AVAILABLE = True
+except ImportError:
+    ONNX_SENTIMENT_AVAILABLE = False
+
+# Scene detection samples this many frames per second, downscaled to a
+# square grayscale thumbnail of this side length
+_SCENE_SAMPLE_FPS = 2
+_SCENE_FRAME_SIZE = 64
+
+# Long audio is transcribed in shards of about this many seconds, each cut
+# at the quietest point within _SHARD_SEARCH_SECONDS of its target end
+_SHARD_SECONDS = 45
+_SHARD_SEARCH_SECONDS = 10
+
+# Audio frames per second for the ASR-free engagement heuristic, and the
+# FFT size used for spectral flux within each frame
+_ENERGY_FRAME_RATE = 10
+_FLUX_FFT_SIZE = 512
+
+# VADER scoring moves to worker processes from this many texts, below which
+# pickling and dispatch cost more than the scoring itself
+_PARALLEL_SENTIMENT_MIN_TEXTS = 200
+
+# Transcriptions and scored moments kept in memory per instance; older
+# transcriptions are still read back from the on-disk cache
+_TRANSCRIPTION_CACHE_SIZE = 32
+_MOMENTS_CACHE_SIZE = 128
+
+def _energy_features(audio: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Compute per-frame RMS energy and spectral flux of 16 kHz audio.
+    
+    Flux (summed positive magnitude change between frames) is high at
+    onsets: speech, laughter and music rather than steady noise. Frames
+    are transformed in blocks to bound memory on long inputs.
+    
+    Returns:
+        (rms, flux) arrays with one value per 1/_ENERGY_FRAME_RATE seconds
+    """
+    frame = WHISPER_SAMPLE_RATE // _ENERGY_FRAME_RATE
+    frames = audio[:len(audio) // frame * frame].reshape(-1, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    
+    window = np.hanning(_FLUX_FFT_SIZE).astype(np.float32)
+    flux = np.zeros(len(frames))
+    previous = None
+    for block_start in range(0, len(frames), 4096):
+        block = frames[block_start:block_start + 4096, :_FLUX_FFT_SIZE] * window
+        magnitude = np.abs(np.fft.rfft(block, axis=1))
+        if previous is not None:
+            magnitude = np.vstack([previous, magnitude])
+        change = np.maximum(np.diff(magnitude, axis=0), 0).sum(axis=1)
+        offset = block_start if previous is not None else block_start + 1
+        flux[offset:offset + len(change)] = change
+        previous = magnitude[-1:]
+    return rms, flux
+
+
+def _split_on_silence(audio: "np.ndarray") -> List[int]:
+    """
+    Pick shard boundaries for long audio at low-energy points.
+    
+    Energy is the RMS of 100 ms frames; each boundary is the quietest frame
+    within _SHARD_SEARCH_SECONDS of a multiple of _SHARD_SECONDS, so no word
+    is cut in half.
+    
+    Returns:
+        Sample offsets where shards start, beginning with 0
+    """
+    frame = WHISPER_SAMPLE_RATE // 10
+    frames = len(audio) // frame
+    energy = np.sqrt(np.mean(audio[:frames * frame].reshape(frames, frame) ** 2, axis=1))
+    
+    shard, search = _SHARD_SECONDS * 10, _SHARD_SEARCH_SECONDS * 10
+    starts = [0]
+    target = shard
+    while target + search < frames - shard // 2:
+        lo = max(target - search, starts[-1] // frame + 1)
+        quietest = lo + int(np.argmin(energy[lo:target + search]))
+        starts.append(quietest * frame)
+        target = quietest + shard
+    return starts
+
+
+_sentiment_pool: Optional[ProcessPoolExecutor] = None
+_worker_analyzer = None
+
+
+def _get_sentiment_pool() -> ProcessPoolExecutor:
+    """Start the shared VADER worker pool on first use."""
+    global _sentiment_pool
+    if _sentiment_pool is None:
+        _sentiment_pool = ProcessPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+        atexit.register(_sentiment_pool.shutdown)
+    return _sentiment_pool
+
+
+def _vader_score(text: str) -> float:
+    """Return |VADER compound| for text, building one analyzer per worker."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = SentimentIntensityAnalyzer()
+    return abs(_worker_analyzer.polarity_scores(text)['compound'])
+
+
+class _LRUCache(OrderedDict):
+    """Dict that drops its least recently used entry beyond ``maxsize``."""
+    
+    def __init__(self, maxsize: int = 128):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+def _written(path: str) -> bool:
+    """Return True if an FFmpeg output file exists and is non-empty."""
+    output = Path(path)
+    return output.exists() and output.stat().st_size > 0
+
 
 class BabyOpusClip:
     """
@@ -53,27 +204,64 @@ class BabyOpusClip:
         self,
         output_dir: str = "./output/clips",
         whisper_model: str = "base",
-        ffmpeg_path: str = "ffmpeg"
+        ffmpeg_path: str = "ffmpeg",
+        ffprobe_path: str = "ffprobe",
+        sentiment_model_dir: Optional[str] = None,
+        compute_type: str = "auto"
     ):
         """
         Initialize Baby Opus Clip tool.
         
+        compute_type trades accuracy for speed and memory with faster-whisper
+        (the openai-whisper fallback ignores it):
+        
+        - float16: GPU baseline quality
+        - int8_float16: int8 weights, fp16 activations; ~1.5x faster on GPU,
+          half the VRAM, marginal WER change
+        - int8: int8 weights and activations; 2-3x faster on CPU, 4x smaller
+        - other CTranslate2 types (int8_bfloat16, int16, bfloat16, float32)
+          are passed through unchanged
+        - auto: float16 on GPU, int8 on CPU
+        
         Args:
             output_dir: Directory for output files
             whisper_model: Whisper model size
             ffmpeg_path: Path to ffmpeg executable
+            ffprobe_path: Path to ffprobe executable (used for codec probing)
+            sentiment_model_dir: Directory holding an exported (e.g. int8
+                quantized DistilBERT-SST2) sentiment model as model.onnx and
+                tokenizer.json; VADER is used when omitted
+            compute_type: faster-whisper quantization (see above)
+        
+        Raises:
+            ValueError: If compute_type is not a CTranslate2 compute type
         """
+        if compute_type not in WHISPER_COMPUTE_TYPES:
+            raise ValueError(
+                f"Unsupported compute_type: {compute_type} "
+                f"(expected one of {', '.join(sorted(WHISPER_COMPUTE_TYPES))})"
+            )
+        
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.whisper_model_name = whisper_model
+        self.compute_type = compute_type
         self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = ffprobe_path
         
         self._whisper_model = None
         self._sentiment_analyzer = None
+        self.sentiment_model_dir = sentiment_model_dir
+        self._onnx_sentiment = None
+        self._codecs: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._keyframes: Dict[str, "np.ndarray"] = {}
+        self._transcription_cache: Dict[tuple, Dict] = _LRUCache(_TRANSCRIPTION_CACHE_SIZE)
+        self._moments_cache: Dict[tuple, List[Dict]] = _LRUCache(_MOMENTS_CACHE_SIZE)
+        self._cache_dir = self.output_dir / ".whisper_cache"
         
         if not SCENEDETECT_AVAILABLE:
             logger.warning("Scene detection will not be available")
-        if not WHISPER_AVAILABLE:
+        if not self.can_transcribe:
             logger.warning("Transcription will not be available")
         if not VADER_AVAILABLE:
             logger.warning("Sentiment analysis will not be available")
@@ -84,9 +272,9 @@ class BabyOpusClip:
         Check if core highlight/transcription functionality is available.
         
         Core features (e.g., highlight extraction and engaging-moment detection)
-        require Whisper, so this is True only when Whisper is available.
+        require Whisper, so this is True only when a Whisper backend is available.
         """
-        return WHISPER_AVAILABLE
+        return self.can_transcribe
     
     @property
     def can_detect_scenes(self) -> bool:
@@ -96,21 +284,190 @@ class BabyOpusClip:
     @property
     def can_transcribe(self) -> bool:
         """Return True if transcription functionality is available."""
-        return WHISPER_AVAILABLE
+        return NUMPY_AVAILABLE and _ensure_whisper()
     
     def _load_whisper_model(self):
-        """Lazy load Whisper model."""
-        if self._whisper_model is None and WHISPER_AVAILABLE:
-            logger.info("Loading Whisper model", model=self.whisper_model_name)
-            self._whisper_model = whisper.load_model(self.whisper_model_name)
+        """
+        Lazy load the Whisper model shared by all instances.
+        
+        The model is warmed up on a second of silence so CUDA initialization
+        happens here rather than on the first real video; set
+        BABY_CLIPS_WARM_UP=0 to skip that (e.g. in CI).
+        """
+        if self._whisper_model is None and self.can_transcribe:
+            self._whisper_model = _get_whisper_model(
+                self.whisper_model_name,
+                self.compute_type,
+                warm_up=os.environ.get("BABY_CLIPS_WARM_UP", "1") != "0"
+            )
         return self._whisper_model
     
+    def _run_whisper(self, audio) -> Dict:
+        """
+        Transcribe audio with the loaded backend.
+        
+        With faster-whisper, long audio is split at silences and the shards
+        are transcribed concurrently across the model's workers, then
+        stitched back with each shard's offset added to its timestamps.
+        
+        Args:
+            audio: Mono float32 samples at WHISPER_SAMPLE_RATE
+            
+        Returns:
+            Transcription dict with text, segments and language
+        """
+        model = self._load_whisper_model()
+        workers = _whisper_workers()
+        starts = _split_on_silence(audio) if workers > 1 else [0]
+        if len(starts) == 1:
+            return _transcribe(model, audio)
+        
+        bounds = list(zip(starts, starts[1:] + [len(audio)]))
+        
+        def transcribe_shard(bound):
+            start, end = bound
+            offset = start / WHISPER_SAMPLE_RATE
+            result = _transcribe(model, audio[start:end])
+            for segment in result['segments']:
+                segment['start'] += offset
+                segment['end'] += offset
+            return result
+        
+        with ThreadPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+            shards = list(pool.map(transcribe_shard, bounds))
+        
+        segments = [segment for shard in shards for segment in shard['segments']]
+        for index, segment in enumerate(segments):
+            segment['id'] = index
+        return {
+            'text': ''.join(shard['text'] for shard in shards),
+            'segments': segments,
+            'language': shards[0]['language']
+        }
+    
     def _get_sentiment_analyzer(self):
         """Lazy load sentiment analyzer."""
         if self._sentiment_analyzer is None and VADER_AVAILABLE:
             self._sentiment_analyzer = SentimentIntensityAnalyzer()
         return self._sentiment_analyzer
     
+    def _get_onnx_sentiment(self):
+        """
+        Lazy load the ONNX sentiment session and its tokenizer.
+        
+        Returns:
+            (session, tokenizer) or None if no model is configured or loading failed
+        """
+        if self._onnx_sentiment is None and self.sentiment_model_dir and ONNX_SENTIMENT_AVAILABLE:
+            model_dir = Path(self.sentiment_model_dir)
+            try:
+                available = ort.get_available_providers()
+                providers = [
+                    provider for provider in ('CUDAExecutionProvider', 'CPUExecutionProvider')
+                    if provider in available
+                ]
+                session = ort.InferenceSession(str(model_dir / "model.onnx"), providers=providers)
+                tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+                tokenizer.enable_padding()
+                tokenizer.enable_truncation(max_length=512)
+                self._onnx_sentiment = (session, tokenizer)
+                logger.info("Loaded ONNX sentiment model", model=str(model_dir), providers=providers)
+            except Exception as e:
+                logger.warning("ONNX sentiment model unavailable, using VADER", error=str(e))
+                self.sentiment_model_dir = None
+        return self._onnx_sentiment
+    
+    def _video_encoder_args(self) -> List[str]:
+        """Return the -c:v arguments for the H.264 encoder in use."""
+        name, args = _ffmpeg.detect_h264_encoder(self.ffmpeg_path)
+        return ['-c:v', name, *args]
+    
+    def _probe_codecs(self, video_path: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Return the (video, audio) codec names of a file, probing it once.
+        
+        Returns:
+            Codec names of the first video and audio streams; None if unknown
+        """
+        if video_path in self._codecs:
+            return self._codecs[video_path]
+        
+        codecs: Dict[str, str] = {}
+        try:
+            result = subprocess.run([
+                self.ffprobe_path, '-v', 'error',
+                '-show_entries', 'stream=codec_type,codec_name',
+                '-of', 'csv=p=0',
+                video_path
+            ], capture_output=True, text=True, timeout=30)
+            if result.returncode == 0:
+                for line in result.stdout.splitlines():
+                    fields = line.strip().split(',')
+                    if len(fields) == 2:
+                        codec_name, codec_type = fields
+                        codecs.setdefault(codec_type, codec_name)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.debug("Codec probe failed", video=video_path, error=str(e))
+        
+        self._codecs[video_path] = (codecs.get('video'), codecs.get('audio'))
+        return self._codecs[video_path]
+    
+    def _probe_keyframes(self, video_path: str) -> "np.ndarray":
+        """
+        Return the sorted keyframe timestamps of a video, probing it once.
+        
+        Returns:
+            Keyframe times in seconds; empty if they couldn't be read
+        """
+        if video_path in self._keyframes:
+            return self._keyframes[video_path]
+        
+        times = []
+        try:
+            result = subprocess.run([
+                self.ffprobe_path, '-v', 'error',
+                '-select_streams', 'v:0',
+                '-show_entries', 'packet=pts_time,flags',
+                '-of', 'csv=print_section=0',
+                video_path
+            ], capture_output=True, text=True, timeout=300)
+            if result.returncode == 0:
+                for line in result.stdout.splitlines():
+                    pts_time, _, flags = line.partition(',')
+                    if 'K' in flags and pts_time not in ('', 'N/A'):
+                        times.append(float(pts_time))
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            logger.debug("Keyframe probe failed", video=video_path, error=str(e))
+        
+        self._keyframes[video_path] = np.sort(np.array(times, dtype=np.float64))
+        return self._keyframes[video_path]
+    
+    def _decode_audio(self, video_path: str) -> Optional["np.ndarray"]:
+        """
+        Decode a video's audio track to the array Whisper consumes.
+        
+        FFmpeg writes 16 kHz mono PCM to stdout, so there is no lossy
+        temporary encode and no file to write, re-read and clean up.
+        
+        Returns:
+            Float32 samples in [-1, 1] or None if decoding failed
+        """
+        result = subprocess.run([
+            self.ffmpeg_path, '-nostdin',
+            '-i', video_path,
+            '-vn',
+            '-f', 's16le',
+            '-ac', '1',
+            '-ar', str(WHISPER_SAMPLE_RATE),
+            '-'
+        ], capture_output=True, timeout=300)
+        
+        if result.returncode != 0:
+            logger.error("Audio extraction failed", stderr=result.stderr.decode(errors='replace'))
+            return None
+        
+        return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+    
     def detect_scenes(
         self,
         video_path: str,
@@ -119,6 +476,9 @@ class BabyOpusClip:
         """
         Detect scene changes in video.
         
+        FFmpeg decodes low-rate grayscale thumbnails that are compared in
+        NumPy; PySceneDetect's full-resolution detector is the fallback.
+        
         Args:
             video_path: Path to video file
             threshold: Scene detection threshold (lower = more sensitive)
@@ -126,6 +486,12 @@ class BabyOpusClip:
         Returns:
             List of scene dicts with start/end times or None if failed
         """
+        if NUMPY_AVAILABLE:
+            scenes = self._detect_scenes_ffmpeg(video_path, threshold)
+            if scenes is not None:
+                logger.info("Scenes detected", video=video_path, count=len(scenes))
+                return scenes
+        
         if not SCENEDETECT_AVAILABLE:
             logger.error("PySceneDetect not available")
             return None
@@ -163,6 +529,117 @@ class BabyOpusClip:
                 except Exception as e:
                     logger.warning("Failed to release video manager", error=str(e))
     
+    def _detect_scenes_ffmpeg(self, video_path: str, threshold: float) -> Optional[List[Dict]]:
+        """
+        Detect cuts from the mean absolute luma difference of thumbnails.
+        
+        Frames are sampled at _SCENE_SAMPLE_FPS and scaled to
+        _SCENE_FRAME_SIZE pixels square by FFmpeg, so only tiny raw
+        frames cross the pipe. A difference above threshold (0-255 scale)
+        starts a new scene.
+        
+        Returns:
+            List of scene dicts or None if FFmpeg could not decode the video
+        """
+        frame_bytes = _SCENE_FRAME_SIZE * _SCENE_FRAME_SIZE
+        try:
+            process = subprocess.Popen([
+                self.ffmpeg_path, '-nostdin',
+                '-i', video_path,
+                '-an',
+                '-vf', f'fps={_SCENE_SAMPLE_FPS},scale={_SCENE_FRAME_SIZE}:{_SCENE_FRAME_SIZE},format=gray',
+                '-f', 'rawvideo',
+                '-'
+            ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            logger.debug("FFmpeg scene detection unavailable", error=str(e))
+            return None
+        
+        cuts = []
+        frames = 0
+        previous = None
+        try:
+            while True:
+                buffer = process.stdout.read(frame_bytes)
+                if len(buffer) < frame_bytes:
+                    break
+                frame = np.frombuffer(buffer, np.uint8).astype(np.int16)
+                if previous is not None and np.mean(np.abs(frame - previous)) > threshold:
+                    cuts.append(frames / _SCENE_SAMPLE_FPS)
+                previous = frame
+                frames += 1
+            returncode = process.wait(timeout=60)
+        except Exception as e:
+            logger.debug("FFmpeg scene detection failed", video=video_path, error=str(e))
+            process.kill()
+            process.wait()
+            return None
+        finally:
+            process.stdout.close()
+        
+        if returncode != 0 or not frames:
+            logger.debug("FFmpeg scene detection failed", video=video_path, returncode=returncode)
+            return None
+        
+        boundaries = [0.0, *cuts, frames / _SCENE_SAMPLE_FPS]
+        return [
+            {
+                'index': i,
+                'start': start,
+                'end': end,
+                'duration': end - start
+            }
+            for i, (start, end) in enumerate(zip(boundaries, boundaries[1:]))
+        ]
+    
+    def _transcription_key(self, video_path: str) -> Optional[tuple]:
+        """
+        Build the cache key for a video's transcription.
+        
+        The file's size and modification time stand in for its content, so
+        an edited or replaced file is transcribed again.
+        
+        Returns:
+            Key tuple or None if the file can't be stat'ed
+        """
+        try:
+            path = Path(video_path).resolve()
+            stat = path.stat()
+        except OSError:
+            return None
+        return (str(path), stat.st_mtime_ns, stat.st_size, self.whisper_model_name, self.compute_type)
+    
+    def _cache_file(self, key: tuple) -> Path:
+        """Return the on-disk cache file for a transcription key."""
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return self._cache_dir / f"{digest}.json"
+    
+    def _load_cached_transcription(self, key: tuple) -> Optional[Dict]:
+        """Return a cached transcription from memory or disk, if present."""
+        if key in self._transcription_cache:
+            return self._transcription_cache[key]
+        
+        try:
+            with open(self._cache_file(key)) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        self._transcription_cache[key] = result
+        return result
+    
+    def _store_transcription(self, key: tuple, result: Dict):
+        """Cache a transcription in memory and on disk for later processes."""
+        # The cache keeps its own copy, so callers can't edit it
+        self._transcription_cache[key] = copy.deepcopy(result)
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self._cache_file(key), 'w') as f:
+                # NumPy scalars from the backends are written as floats
+                json.dump(result, f, default=float)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Failed to write transcription cache", error=str(e))
+    
     def transcribe_video(
         self,
         video_path: str
@@ -170,43 +647,40 @@ class BabyOpusClip:
         """
         Transcribe video audio with timestamps.
         
+        Results are cached per file version and model, in memory and under
+        the output directory, so repeat calls skip the Whisper pass. Each
+        call returns its own copy, which callers may modify.
+        
         Args:
             video_path: Path to video file
             
         Returns:
             Transcription dict with segments or None if failed
         """
-        if not WHISPER_AVAILABLE:
+        if not self.can_transcribe:
             logger.error("Whisper not available")
             return None
         
+        key = self._transcription_key(video_path)
+        if key is not None:
+            cached = self._load_cached_transcription(key)
+            if cached is not None:
+                logger.debug("Transcription cache hit", video=video_path)
+                return copy.deepcopy(cached)
+        
         try:
-            # Extract audio
-            audio_path = str(self.output_dir / f"temp_audio_{uuid.uuid4().hex[:8]}.mp3")
-            
-            result = subprocess.run([
-                self.ffmpeg_path, '-y',
-                '-i', video_path,
-                '-vn',
-                '-acodec', 'libmp3lame',
-                audio_path
-            ], capture_output=True, text=True, timeout=300)
-            
-            if result.returncode != 0:
-                logger.error("Audio extraction failed", stderr=result.stderr)
+            # Decode audio straight into memory
+            audio = self._decode_audio(video_path)
+            if audio is None:
                 return None
             
-            try:
-                # Transcribe
-                model = self._load_whisper_model()
-                result = model.transcribe(audio_path)
-                
-                logger.info("Video transcribed", video=video_path, segments=len(result.get('segments', [])))
-                return result
-                
-            finally:
-                # Clean up temp audio file
-                Path(audio_path).unlink(missing_ok=True)
+            # Transcribe
+            result = self._run_whisper(audio)
+            if key is not None:
+                self._store_transcription(key, result)
+            
+            logger.info("Video transcribed", video=video_path, segments=len(result.get('segments', [])))
+            return result
             
         except Exception as e:
             logger.error("Transcription failed", error=str(e))
@@ -231,65 +705,30 @@ class BabyOpusClip:
         Returns:
             List of moment dicts with start/end/score or None if failed
         """
-        if not WHISPER_AVAILABLE:
+        if not self.can_transcribe:
             logger.error("Whisper not available")
             return None
         
+        transcription_key = self._transcription_key(video_path)
+        moments_key = (transcription_key, max_clips, min_clip_length, max_clip_length)
+        if transcription_key is not None and moments_key in self._moments_cache:
+            return [dict(moment) for moment in self._moments_cache[moments_key]]
+        
         try:
             # Transcribe video
             transcription = self.transcribe_video(video_path)
             if not transcription:
                 return None
             
-            analyzer = self._get_sentiment_analyzer()
-            if not analyzer:
-                logger.warning("Sentiment analysis not available, using word count only")
-            
-            # Score each segment
-            scored_segments = []
-            for segment in transcription.get('segments', []):
-                text = segment['text']
-                start = segment['start']
-                end = segment['end']
-                duration = end - start
-                
-                # Skip if too short or too long
-                if duration < min_clip_length or duration > max_clip_length:
-                    continue
-                
-                # Calculate engagement score
-                word_count = len(text.split())
-                content_density = word_count / duration if duration > 0 else 0
-                
-                # Sentiment analysis if available
-                if analyzer:
-                    sentiment = analyzer.polarity_scores(text)
-                    # Use absolute compound score (both positive and negative are engaging)
-                    sentiment_score = abs(sentiment['compound'])
-                else:
-                    sentiment_score = 0.5  # Neutral if not available
-                
-                # Combined score
-                engagement_score = (
-                    sentiment_score * 0.6 +  # Emotional intensity
-                    min(content_density / 3.0, 1.0) * 0.4  # Content density (normalized)
-                )
-                
-                scored_segments.append({
-                    'start': start,
-                    'end': end,
-                    'duration': duration,
-                    'text': text,
-                    'score': engagement_score,
-                    'word_count': word_count
-                })
-            
-            # Sort by score and return top moments
-            scored_segments.sort(key=lambda x: x['score'], reverse=True)
-            top_moments = scored_segments[:max_clips]
+            top_moments = self._score_segments(
+                transcription.get('segments', []),
+                max_clips,
+                min_clip_length,
+                max_clip_length
+            )
             
-            # Sort by time for easier processing
-            top_moments.sort(key=lambda x: x['start'])
+            if transcription_key is not None:
+                self._moments_cache[moments_key] = [dict(moment) for moment in top_moments]
             
             logger.info("Engaging moments found", video=video_path, count=len(top_moments))
             return top_moments
@@ -298,6 +737,121 @@ class BabyOpusClip:
             logger.error("Find engaging moments failed", error=str(e))
             return None
     
+    def _sentiment_scores(self, texts: List[str]) -> "np.ndarray":
+        """
+        Score the emotional intensity of each text in [0, 1].
+        
+        Both positive and negative moments are engaging, so this is the gap
+        between the classes: |P(positive) - P(negative)| from the ONNX model
+        in one batched forward pass when configured, otherwise the absolute
+        VADER compound score; 0.5 (neutral) when neither is available.
+        """
+        onnx_sentiment = self._get_onnx_sentiment()
+        if onnx_sentiment is not None:
+            try:
+                session, tokenizer = onnx_sentiment
+                encodings = tokenizer.encode_batch(texts)
+                inputs = {
+                    'input_ids': np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+                    'attention_mask': np.array(
+                        [encoding.attention_mask for encoding in encodings], dtype=np.int64
+                    ),
+                }
+                input_names = {model_input.name for model_input in session.get_inputs()}
+                logits = session.run(None, {name: inputs[name] for name in input_names})[0]
+                exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+                probabilities = exp / exp.sum(axis=1, keepdims=True)
+                return np.abs(probabilities[:, 1] - probabilities[:, 0])
+            except Exception as e:
+                logger.warning("ONNX sentiment scoring failed, using VADER", error=str(e))
+        
+        analyzer = self._get_sentiment_analyzer()
+        if not analyzer:
+            logger.warning("Sentiment analysis not available, using word count only")
+            return np.full(len(texts), 0.5)
+        
+        # VADER is pure Python; long transcripts are spread over processes
+        # to get past the GIL
+        if len(texts) >= _PARALLEL_SENTIMENT_MIN_TEXTS:
+            try:
+                return np.fromiter(
+                    _get_sentiment_pool().map(_vader_score, texts, chunksize=32),
+                    dtype=np.float64,
+                    count=len(texts)
+                )
+            except Exception as e:
+                logger.warning("Parallel sentiment scoring failed, scoring inline", error=str(e))
+        
+        return np.abs(np.fromiter(
+            (analyzer.polarity_scores(text)['compound'] for text in texts),
+            dtype=np.float64,
+            count=len(texts)
+        ))
+    
+    def _score_segments(
+        self,
+        segments: List[Dict],
+        max_clips: int,
+        min_clip_length: float,
+        max_clip_length: float
+    ) -> List[Dict]:
+        """
+        Score transcript segments and pick the most engaging ones.
+        
+        Durations, content density and the combined score are computed as
+        arrays; only segments within the length bounds are sentiment-scored.
+        
+        Args:
+            segments: Whisper transcript segments
+            max_clips: Maximum number of moments to return
+            min_clip_length: Minimum segment length in seconds
+            max_clip_length: Maximum segment length in seconds
+            
+        Returns:
+            Top moment dicts, ordered by start time
+        """
+        starts = np.fromiter((segment['start'] for segment in segments), np.float64, len(segments))
+        ends = np.fromiter((segment['end'] for segment in segments), np.float64, len(segments))
+        durations = ends - starts
+        
+        # Skip if too short or too long
+        valid = np.flatnonzero((durations >= min_clip_length) & (durations <= max_clip_length))
+        if not len(valid) or max_clips <= 0:
+            return []
+        
+        texts = [segments[i]['text'] for i in valid]
+        durations = durations[valid]
+        word_counts = np.array([len(text.split()) for text in texts])
+        content_density = np.divide(
+            word_counts, durations, out=np.zeros(len(valid)), where=durations > 0
+        )
+        
+        # Combined score
+        scores = (
+            self._sentiment_scores(texts) * 0.6 +  # Emotional intensity
+            np.minimum(content_density / 3.0, 1.0) * 0.4  # Content density (normalized)
+        )
+        
+        # Top moments without a full sort, then ordered by time for
+        # easier processing
+        if len(scores) > max_clips:
+            top = np.argpartition(scores, -max_clips)[-max_clips:]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(starts[valid][top], kind='stable')]
+        
+        return [
+            {
+                'start': segments[valid[i]]['start'],
+                'end': segments[valid[i]]['end'],
+                'duration': float(durations[i]),
+                'text': texts[i],
+                'score': float(scores[i]),
+                'word_count': int(word_counts[i])
+            }
+            for i in top
+        ]
+    
     def extract_highlights(
         self,
         video_path: str,
@@ -324,20 +878,35 @@ class BabyOpusClip:
                 output_dir = str(self.output_dir / f"highlights_{uuid.uuid4().hex[:8]}")
             Path(output_dir).mkdir(parents=True, exist_ok=True)
             
-            # Find engaging moments
-            moments = self.find_engaging_moments(
-                video_path,
-                max_clips=max_clips,
-                min_clip_length=clip_length * 0.5,
-                max_clip_length=clip_length * 2
-            )
-            
-            if not moments:
-                logger.warning("No engaging moments found")
-                return None
+            # Probing reads the whole file with ffprobe; run it while
+            # Whisper transcribes instead of after.
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                preparation = pool.submit(self._prepare_extraction, video_path)
+                
+                # Find engaging moments
+                moments = self.find_engaging_moments(
+                    video_path,
+                    max_clips=max_clips,
+                    min_clip_length=clip_length * 0.5,
+                    max_clip_length=clip_length * 2
+                )
+                
+                if not moments:
+                    logger.warning("No engaging moments found")
+                    preparation.cancel()
+                    return None
+                
+                stream_copy, keyframes = preparation.result()
             
-            # Extract each clip
-            clip_paths = []
+            # Extract every clip in one FFmpeg run. Re-encodes demux the input
+            # once and apply each output's -ss/-t to it alone; stream copies
+            # open one input per clip so -ss seeks straight to a keyframe.
+            command = [self.ffmpeg_path, '-y']
+            if not stream_copy:
+                command += ['-i', video_path]
+            outputs = []
+            output_paths = []
+            windows = []
             for i, moment in enumerate(moments):
                 output_path = str(Path(output_dir) / f"clip_{i+1:02d}.mp4")
                 
@@ -346,20 +915,57 @@ class BabyOpusClip:
                 end = moment['end'] + padding
                 duration = min(clip_length, end - start)
                 
-                # Extract clip using FFmpeg
-                result = subprocess.run([
-                    self.ffmpeg_path, '-y',
-                    '-i', video_path,
-                    '-ss', str(start),
-                    '-t', str(duration),
-                    '-c:v', 'libx264',
-                    '-c:a', 'aac',
-                    '-preset', 'fast',
-                    output_path
-                ], capture_output=True, text=True, timeout=600)
+                if keyframes is not None and len(keyframes):
+                    index = np.searchsorted(keyframes, start, side='right') - 1
+                    snapped = float(keyframes[index]) if index >= 0 else start
+                    # The clip grows by the snap so it still covers the moment;
+                    # the offset aligns anything timed against the moment.
+                    moment['clip_offset'] = start - snapped
+                    duration += start - snapped
+                    start = snapped
                 
-                if result.returncode != 0:
-                    logger.warning("Failed to extract clip", index=i, stderr=result.stderr)
+                if stream_copy:
+                    command += ['-ss', str(start), '-t', str(duration), '-i', video_path]
+                    outputs += [
+                        '-map', str(i),
+                        '-c', 'copy',
+                        '-avoid_negative_ts', 'make_zero',
+                        output_path
+                    ]
+                else:
+                    outputs += [
+                        '-ss', str(start),
+                        '-t', str(duration),
+                        *self._video_encoder_args(),
+                        '-c:a', 'aac',
+                        output_path
+                    ]
+                output_paths.append(output_path)
+                windows.append((start, duration))
+                # A stale clip from an earlier run must not pass as output
+                Path(output_path).unlink(missing_ok=True)
+            
+            result = subprocess.run(
+                command + outputs, capture_output=True, text=True, timeout=600 * len(moments)
+            )
+            if result.returncode != 0:
+                logger.warning("FFmpeg clip extraction reported errors", stderr=result.stderr)
+            
+            # FFmpeg names the failing output in stderr; a missing or empty
+            # file identifies which clip it was. Those are retried one
+            # process per clip, run concurrently.
+            failed = [i for i, output_path in enumerate(output_paths) if not _written(output_path)]
+            if failed:
+                with ThreadPoolExecutor(max_workers=min(len(failed), os.cpu_count() or 1)) as pool:
+                    list(pool.map(
+                        lambda i: self._extract_clip(video_path, *windows[i], output_paths[i], stream_copy),
+                        failed
+                    ))
+            
+            clip_paths = []
+            for i, output_path in enumerate(output_paths):
+                if not _written(output_path):
+                    logger.warning("Failed to extract clip", index=i, output=output_path)
                     continue
                 
                 clip_paths.append(output_path)
@@ -372,6 +978,112 @@ class BabyOpusClip:
             logger.error("Extract highlights failed", error=str(e))
             return None
     
+    def _prepare_extraction(self, video_path: str) -> Tuple[bool, Optional["np.ndarray"]]:
+        """
+        Probe everything clip extraction needs before the cut points are known.
+        
+        H.264/AAC sources are already in the output codecs, so clips are
+        stream-copied instead of re-encoded. A copy can only start on a
+        keyframe, so the keyframe times are probed for snapping starts;
+        otherwise the encoder to re-encode with is detected.
+        
+        Returns:
+            (whether to stream copy, keyframe times or None)
+        """
+        if self._probe_codecs(video_path) == ('h264', 'aac'):
+            return True, self._probe_keyframes(video_path)
+        self._video_encoder_args()
+        return False, None
+    
+    def _find_energetic_moment(self, video_path: str, length: float) -> Optional[Dict]:
+        """
+        Find the most engaging window of audio without running ASR.
+        
+        Frames quieter than three times the noise floor (10th percentile
+        RMS) count as non-speech; the rest score 0.5 * normalized RMS +
+        0.5 * normalized spectral flux, and the window of the given length
+        with the highest total wins.
+        
+        Args:
+            video_path: Path to video file
+            length: Window length in seconds
+            
+        Returns:
+            Moment dict with start/end/duration/score or None if the audio
+            couldn't be decoded or is silent
+        """
+        audio = self._decode_audio(video_path)
+        if audio is None:
+            return None
+        
+        rms, flux = _energy_features(audio)
+        if not len(rms) or not rms.max():
+            return None
+        
+        speech = rms > 3 * np.percentile(rms, 10)
+        scores = speech * (0.5 * rms / rms.max() + 0.5 * flux / max(flux.max(), 1e-9))
+        
+        window = min(len(scores), max(1, int(length * _ENERGY_FRAME_RATE)))
+        totals = np.convolve(scores, np.ones(window), mode='valid')
+        best = int(np.argmax(totals))
+        if not totals[best]:
+            return None
+        
+        start = best / _ENERGY_FRAME_RATE
+        duration = window / _ENERGY_FRAME_RATE
+        logger.info("Energetic moment found", video=video_path, start=start)
+        return {
+            'start': start,
+            'end': start + duration,
+            'duration': duration,
+            'score': float(totals[best] / window)
+        }
+    
+    def _extract_clip(
+        self,
+        video_path: str,
+        start: float,
+        duration: float,
+        output_path: str,
+        stream_copy: bool = False
+    ) -> bool:
+        """
+        Cut a single clip in its own FFmpeg process.
+        
+        Args:
+            video_path: Path to video file
+            start: Clip start in seconds
+            duration: Clip duration in seconds
+            output_path: Output clip path
+            stream_copy: Copy streams instead of re-encoding
+            
+        Returns:
+            True if the clip was written
+        """
+        if stream_copy:
+            codec_args = ['-c', 'copy', '-avoid_negative_ts', 'make_zero']
+        else:
+            # Concurrent encoders each get two threads so they don't thrash
+            codec_args = [*self._video_encoder_args(), '-c:a', 'aac', '-threads', '2']
+        
+        try:
+            result = subprocess.run([
+                self.ffmpeg_path, '-y',
+                '-ss', str(start),
+                '-t', str(duration),
+                '-i', video_path,
+                *codec_args,
+                output_path
+            ], capture_output=True, text=True, timeout=600)
+        except subprocess.TimeoutExpired:
+            logger.warning("Clip extraction timed out", output=output_path)
+            return False
+        
+        if result.returncode != 0:
+            logger.warning("Failed to extract clip", output=output_path, stderr=result.stderr)
+            return False
+        return True
+    
     def create_compilation(
         self,
         clip_paths: List[str],
@@ -397,33 +1109,17 @@ class BabyOpusClip:
                     self.output_dir / f"compilation_{uuid.uuid4().hex[:8]}.mp4"
                 )
             
-            # Create concat file for FFmpeg
-            concat_file = str(self.output_dir / f"concat_{uuid.uuid4().hex[:8]}.txt")
+            result = _ffmpeg.concatenate(
+                self.ffmpeg_path, self.ffprobe_path, clip_paths, output_path,
+                self._video_encoder_args(),
+            )
+            
+            if result.returncode != 0:
+                logger.error("FFmpeg compilation failed", stderr=result.stderr)
+                return None
             
-            try:
-                with open(concat_file, 'w') as f:
-                    for clip_path in clip_paths:
-                        f.write(f"file '{Path(clip_path).absolute()}'\n")
-                
-                # Concatenate using FFmpeg
-                result = subprocess.run([
-                    self.ffmpeg_path, '-y',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', concat_file,
-                    '-c', 'copy',
-                    output_path
-                ], capture_output=True, text=True, timeout=600)
-                
-                if result.returncode != 0:
-                    logger.error("FFmpeg compilation failed", stderr=result.stderr)
-                    return None
-                
-                logger.info("Compilation created", output=output_path, clips=len(clip_paths))
-                return output_path
-            finally:
-                # Clean up concat file
-                Path(concat_file).unlink(missing_ok=True)
+            logger.info("Compilation created", output=output_path, clips=len(clip_paths))
+            return output_path
             
         except Exception as e:
             logger.error("Create compilation failed", error=str(e))
@@ -434,7 +1130,8 @@ class BabyOpusClip:
         video_path: str,
         output_path: Optional[str] = None,
         target_length: float = 30.0,
-        platform: str = 'tiktok'
+        platform: str = 'tiktok',
+        quality: str = 'fast'
     ) -> Optional[str]:
         """
         Automatically generate a short-form video from long content.
@@ -444,18 +1141,25 @@ class BabyOpusClip:
             output_path: Output path
             target_length: Target video length in seconds
             platform: Target platform (tiktok, youtube_short, etc.)
+            quality: 'fast' picks the moment from audio energy without
+                transcribing; 'high' scores Whisper transcript segments
             
         Returns:
             Path to output short video or None if failed
         """
         try:
             # Find best moment
-            moments = self.find_engaging_moments(
-                video_path,
-                max_clips=1,
-                min_clip_length=target_length * 0.8,
-                max_clip_length=target_length * 1.2
-            )
+            moments = None
+            if quality != 'high' and NUMPY_AVAILABLE:
+                moment = self._find_energetic_moment(video_path, target_length)
+                moments = [moment] if moment else None
+            if not moments:
+                moments = self.find_engaging_moments(
+                    video_path,
+                    max_clips=1,
+                    min_clip_length=target_length * 0.8,
+                    max_clip_length=target_length * 1.2
+                )
             
             if not moments:
                 logger.warning("No suitable moment found for short")
@@ -480,15 +1184,25 @@ class BabyOpusClip:
             }
             size = platform_sizes.get(platform, '1080:1920')
             
+            # The scale/crop filter forces a video re-encode, but AAC audio
+            # can be copied through untouched.
+            _, audio_codec = self._probe_codecs(video_path)
+            audio_args = ['-c:a', 'copy'] if audio_codec == 'aac' else ['-c:a', 'aac']
+            
+            # With NVENC, decode on the GPU too; frames are downloaded for
+            # the CPU scale/crop filter.
+            video_args = self._video_encoder_args()
+            hwaccel_args = ['-hwaccel', 'cuda'] if 'h264_nvenc' in video_args else []
+            
             result = subprocess.run([
                 self.ffmpeg_path, '-y',
-                '-i', video_path,
+                *hwaccel_args,
                 '-ss', str(start),
                 '-t', str(duration),
+                '-i', video_path,
                 '-vf', f'scale={size}:force_original_aspect_ratio=increase,crop={size}',
-                '-c:v', 'libx264',
-                '-c:a', 'aac',
-                '-preset', 'fast',
+                *video_args,
+                *audio_args,
                 output_path
             ], capture_output=True, text=True, timeout=600)
             
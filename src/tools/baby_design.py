@@ -4,9 +4,22 @@ Baby Design Tools - Open-source alternatives to Canva and Adobe CC
 Provides simple, effective design tools using:
 - Pillow for image manipulation and template creation
 - Pre-built templates for social media
+
+The resize, enhance and colour-conversion paths are bandwidth-bound work in
+libImaging. Installing pillow-simd in place of Pillow speeds them up 2-6x on
+CPUs with AVX2 (check ``grep avx2 /proc/cpuinfo``) without code changes:
+
+    pip uninstall -y Pillow && CC="cc -mavx2" pip install -U --force-reinstall pillow-simd
 """
 
+import functools
+import io
+import itertools
+import os
+import shutil
+import threading
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Tuple, List
 import structlog
@@ -14,12 +27,489 @@ import structlog
 logger = structlog.get_logger(__name__)
 
 try:
-    from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageFilter
+    import PIL
+    # ImageEnhance/ImageFilter are imported where used; text-only designs
+    # never need them
+    from PIL import Image, ImageChops, ImageColor, ImageDraw, ImageFont
     PILLOW_AVAILABLE = True
+    # pillow-simd releases carry a ".postN" suffix on the upstream version
+    PILLOW_SIMD = 'post' in PIL.__version__
 except ImportError:
     PILLOW_AVAILABLE = False
+    PILLOW_SIMD = False
     logger.warning("Pillow not available. Install with: pip install Pillow")
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+_variant_logged = False
+
+
+def _log_pillow_variant() -> None:
+    """Log once which Pillow build backs the design tools."""
+    global _variant_logged
+    if _variant_logged or not PILLOW_AVAILABLE:
+        return
+    _variant_logged = True
+    logger.info(
+        "Pillow build detected",
+        version=PIL.__version__,
+        simd=PILLOW_SIMD,
+    )
+
+
+# Encoder settings per output format:
+# - JPEG: baseline 4:2:0 without the extra Huffman pass; progressive would
+#   double the DCT work and optimize re-scans the coefficients for a few
+#   percent of size
+# - PNG: flat-colour designs compress nearly as well at zlib level 1 as at 6
+# - WEBP: method 4 is the encoder's speed/size midpoint
+_SAVE_OPTIONS = {
+    'JPEG': {'quality': 85, 'optimize': False, 'progressive': False, 'subsampling': 2},
+    'PNG': {'compress_level': 1, 'optimize': False},
+    'WEBP': {'quality': 85, 'method': 4},
+}
+_EXTENSION_FORMATS = {
+    '.jpg': 'JPEG',
+    '.jpeg': 'JPEG',
+    '.png': 'PNG',
+    '.webp': 'WEBP',
+}
+
+# Box-reduce to within 3x of the target before the Lanczos pass on downscales
+_REDUCING_GAP = 3.0
+
+# Color, Brightness and Contrast enhancers are all blends towards the
+# luminance image, black, or the mean luminance, so a chain of them collapses
+# to out = a*img + b*gray + c*mean. Weights are (a, b, c) per filter.
+_FUSED_FILTERS = {
+    # Color(1.2) -> Brightness(1.1)
+    'warm': (1.2 * 1.1, -0.2 * 1.1, 0.0),
+    # Color(0.9) -> Contrast(1.1); Color leaves the mean luminance unchanged
+    'cool': (0.9 * 1.1, 0.1 * 1.1, -0.1),
+    # Contrast(0.8) -> Color(0.7)
+    'vintage': (0.8 * 0.7, 0.8 * 0.3, 0.2),
+}
+
+# Read-ahead for batch inputs so libjpeg's small source-manager reads are
+# served from one large buffer
+_READ_BUFFER_SIZE = 1 << 20
+
+# Output-name suffixes: one random nonce per process plus a counter, instead of
+# a getrandom() syscall per generated file
+_NAME_NONCE = uuid.uuid4().hex[:8]
+_NAME_COUNTER = itertools.count()
+
+# Sources whose aspect ratio is this close to the target are scaled straight
+# to size instead of being letterboxed
+_ASPECT_TOLERANCE = 0.01
+
+# Bare names are looked up by Pillow in the platform font directories
+# (Windows, macOS and XDG); absolute paths are checked directly
+_FONT_CANDIDATES = (
+    'Arial.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_font_path() -> Optional[str]:
+    """Return the first loadable font from the fallback ladder, probed once."""
+    for candidate in _FONT_CANDIDATES:
+        if Path(candidate).is_absolute() and not Path(candidate).exists():
+            continue
+        try:
+            ImageFont.truetype(candidate, 1)
+            return candidate
+        except OSError:
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=32)
+def _load_font(size: int):
+    """
+    Load the preferred font at a given size, parsing the face once per size.
+    
+    Args:
+        size: Font size in pixels
+        
+    Returns:
+        FreeType font, or Pillow's default bitmap font when none is installed
+    """
+    font_path = _resolve_font_path()
+    if font_path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(font_path, size)
+
+
+def _save_optimized(img, target, image_format: Optional[str] = None) -> None:
+    """
+    Save an image with fast encoder settings for its format.
+    
+    Args:
+        img: Image to save
+        target: Output path or writable binary file object
+        image_format: Pillow format name; inferred from the path extension
+            when omitted. Unknown formats use Pillow's defaults.
+    """
+    if image_format is None:
+        image_format = _EXTENSION_FORMATS.get(Path(target).suffix.lower())
+    if image_format in _SAVE_OPTIONS:
+        img.save(target, image_format, **_SAVE_OPTIONS[image_format])
+    else:
+        img.save(target, image_format)
+
+
+def _unique_suffix() -> str:
+    """Return a filename suffix unique within this process and across processes."""
+    return f"{_NAME_NONCE}{next(_NAME_COUNTER):04x}"
+
+
+def _reseed_name_nonce() -> None:
+    """Give a forked child its own nonce so it cannot reuse the parent's names."""
+    global _NAME_NONCE
+    _NAME_NONCE = uuid.uuid4().hex[:8]
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_name_nonce)
+
+# One letterbox canvas per batch_resize worker, reused across images
+_canvas_local = threading.local()
+
+
+def _worker_canvas(dimensions: Tuple[int, int]):
+    """Return this thread's reusable RGB canvas, reallocating on size change."""
+    canvas = getattr(_canvas_local, 'canvas', None)
+    if canvas is None or canvas.size != dimensions:
+        canvas = Image.new('RGB', dimensions, None)
+        _canvas_local.canvas = canvas
+    return canvas
+
+
+def _draw_shadowed_text(
+    img,
+    xy: Tuple[int, int],
+    text: str,
+    font,
+    fill,
+    shadow_offset: int,
+) -> None:
+    """
+    Draw text with a black drop shadow, rasterizing the glyphs only once.
+    
+    The text is rendered into an L mask that is pasted twice: in black at
+    the shadow offset, then in the fill colour at xy. Black text gets no
+    shadow, since it would only smear the glyphs. Images that can't take a
+    colour paste (palette, CMYK, ...) are drawn on with ImageDraw directly.
+    
+    Args:
+        img: Image to draw on (modified in place)
+        xy: Text origin, as passed to ImageDraw.text
+        text: Text to draw
+        font: Font to render with
+        fill: Text colour
+        shadow_offset: Shadow offset in pixels (both axes)
+    """
+    shadowed = _to_rgb(fill) != (0, 0, 0)
+    if img.mode not in ('RGB', 'RGBA', 'L'):
+        draw = ImageDraw.Draw(img)
+        if shadowed:
+            draw.text((xy[0] + shadow_offset, xy[1] + shadow_offset), text, font=font, fill='black')
+        draw.text(xy, text, font=font, fill=fill)
+        return
+    
+    rendered = _text_mask(text, font)
+    if rendered is None:
+        return
+    
+    mask, left, top = rendered
+    x, y = xy[0] + left, xy[1] + top
+    if shadowed:
+        img.paste('black', (x + shadow_offset, y + shadow_offset), mask)
+    img.paste(fill, (x, y), mask)
+
+
+def _to_rgb(color) -> Tuple[int, int, int]:
+    """Resolve a colour name, hex string or tuple to an RGB tuple."""
+    if isinstance(color, str):
+        return ImageColor.getrgb(color)[:3]
+    return tuple(color)[:3]
+
+
+def _render_indexed_text(
+    dimensions: Tuple[int, int],
+    background_color: Tuple[int, int, int],
+    xy: Tuple[int, int],
+    text: str,
+    font,
+    fill,
+    shadow_offset: int,
+):
+    """
+    Render shadowed text on a solid background as a 256-colour palette image.
+    
+    Every pixel is a mix of three colours decided by its shadow and text
+    coverage. Quantizing each coverage to 16 levels gives one palette entry
+    per (shadow, text) pair, so anti-aliasing survives while the image stays
+    one byte per pixel and encodes far faster as PNG than RGB.
+    
+    Args:
+        dimensions: Canvas (width, height)
+        background_color: RGB tuple for background
+        xy: Text origin, as passed to ImageDraw.text
+        text: Text to draw
+        font: Font to render with
+        fill: Text colour
+        shadow_offset: Shadow offset in pixels (both axes)
+        
+    Returns:
+        P-mode image matching _draw_shadowed_text to within one coverage
+        step at glyph edges
+    """
+    fill_rgb = _to_rgb(fill)
+    background = _to_rgb(background_color)
+    
+    index = Image.new('L', dimensions, 0)
+    rendered = _text_mask(text, font)
+    if rendered is not None:
+        mask, left, top = rendered
+        x, y = xy[0] + left, xy[1] + top
+        # Coverage rounded to 16 levels; high nibble shadow, low nibble text
+        levels = mask.point(lambda v: (v * 15 + 127) // 255)
+        index.paste(levels, (x, y))
+        if fill_rgb != (0, 0, 0):
+            shadow = Image.new('L', dimensions, 0)
+            shadow.paste(levels.point(lambda v: v << 4), (x + shadow_offset, y + shadow_offset))
+            index = ImageChops.add(shadow, index)
+    
+    palette = []
+    for shadow_level in range(16):
+        for text_level in range(16):
+            s, t = shadow_level / 15, text_level / 15
+            palette.extend(
+                round(bg * (1 - s) * (1 - t) + fg * t)
+                for bg, fg in zip(background, fill_rgb)
+            )
+    index.putpalette(palette)
+    return index
+
+
+def _expand_palette(img):
+    """
+    Return a palette image as RGB, or RGBA if it has transparency.
+    
+    create_social_post writes palette PNGs; enhancers and colour pastes
+    need true-colour pixels, so edits start from the expanded image.
+    """
+    if img.mode not in ('P', 'PA'):
+        return img
+    has_alpha = img.mode == 'PA' or 'transparency' in img.info
+    return img.convert('RGBA' if has_alpha else 'RGB')
+
+
+def _text_bbox(text: str, font) -> Tuple[int, int, int, int]:
+    """
+    Return the ink bounding box of text drawn at the origin.
+    
+    font.getbbox() only measures a single line, so text with line breaks
+    is measured the way ImageDraw lays it out.
+    """
+    if '\n' not in text:
+        return font.getbbox(text)
+    return ImageDraw.Draw(Image.new('L', (1, 1))).multiline_textbbox((0, 0), text, font=font)
+
+
+def _text_mask(text: str, font):
+    """
+    Rasterize text once into a tight L mask, spanning every line.
+    
+    Args:
+        text: Text to render
+        font: Font to render with
+        
+    Returns:
+        Tuple of (mask, left, top) offsets relative to the text origin, or
+        None when the text has no ink
+    """
+    left, top, right, bottom = _text_bbox(text, font)
+    if right <= left or bottom <= top:
+        return None
+    
+    mask = Image.new('L', (right - left, bottom - top), 0)
+    ImageDraw.Draw(mask).multiline_text((-left, -top), text, font=font, fill=255)
+    return mask, left, top
+
+
+def _wrap_words(words: List[str], font, max_width: float) -> List[str]:
+    """
+    Greedily pack words into lines narrower than max_width.
+    
+    Each word is measured once and line widths are kept as running sums, so
+    wrapping costs O(words) font measurements rather than one per prefix.
+    
+    Args:
+        words: Words to pack, in order
+        font: Font used for measuring
+        max_width: Maximum line width in pixels (exclusive)
+        
+    Returns:
+        List of wrapped lines
+    """
+    space_width = font.getlength(' ')
+    lines = []
+    current_line = []
+    current_width = 0.0
+    
+    for word in words:
+        word_width = font.getlength(word)
+        test_width = current_width + space_width + word_width if current_line else word_width
+        if test_width < max_width:
+            current_line.append(word)
+            current_width = test_width
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+            current_line = [word]
+            current_width = word_width
+    
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+
+def _fused_adjust(img, img_weight: float, gray_weight: float, mean_weight: float):
+    """
+    Apply a composed Color/Brightness/Contrast adjustment in one pass.
+    
+    Args:
+        img: Source image, RGB or RGBA
+        img_weight: Weight of the original pixel values
+        gray_weight: Weight of the per-pixel luminance
+        mean_weight: Weight of the image's mean luminance
+        
+    Returns:
+        Adjusted RGB image (alpha is carried over for RGBA input)
+    """
+    alpha = None
+    if img.mode == 'RGBA':
+        alpha = img.getchannel('A')
+        img = img.convert('RGB')
+    
+    gray = np.asarray(img.convert('L'), dtype=np.float32)
+    offset = gray_weight * gray + mean_weight * int(gray.mean() + 0.5)
+    out = np.asarray(img, dtype=np.float32) * img_weight
+    out += offset[..., None]
+    np.clip(np.rint(out, out=out), 0, 255, out=out)
+    
+    result = Image.fromarray(out.astype(np.uint8), 'RGB')
+    if alpha is not None:
+        result.putalpha(alpha)
+    return result
+
+
+def _letterbox(img, dimensions: Tuple[int, int], canvas=None):
+    """
+    Centre an image on a black RGB canvas of the given dimensions.
+    
+    Only the bars around the image are filled; the pasted region is never
+    cleared first, so a canvas can be reused without wiping it. Images that
+    already fill the canvas are returned as-is.
+    
+    Args:
+        img: Image no larger than dimensions
+        dimensions: Canvas (width, height)
+        canvas: Optional RGB canvas of the same dimensions to draw into
+        
+    Returns:
+        RGB image of exactly the given dimensions
+    """
+    if img.size == dimensions:
+        return img if img.mode == 'RGB' else img.convert('RGB')
+    
+    width, height = dimensions
+    x0 = (width - img.width) // 2
+    y0 = (height - img.height) // 2
+    x1, y1 = x0 + img.width, y0 + img.height
+    
+    # Uninitialised or stale canvas; every pixel is written by a bar or the paste
+    if canvas is None:
+        canvas = Image.new('RGB', dimensions, None)
+    for box in ((0, 0, width, y0), (0, y1, width, height), (0, y0, x0, y1), (x1, y0, width, y1)):
+        if box[2] > box[0] and box[3] > box[1]:
+            canvas.paste((0, 0, 0), box)
+    canvas.paste(img, (x0, y0))
+    return canvas
+
+
+def _resize_one(
+    img_path: str,
+    dimensions: Tuple[int, int],
+    output_dir: str,
+    platform: str,
+) -> Optional[str]:
+    """
+    Letterbox one image to the platform dimensions and save it as JPEG.
+    
+    Runs inside batch_resize's worker pool, so failures are logged and
+    reported as None instead of raised.
+    
+    Args:
+        img_path: Input image path
+        dimensions: Target (width, height)
+        output_dir: Output directory
+        platform: Platform name used in the output filename
+        
+    Returns:
+        Output path or None if failed
+    """
+    try:
+        with open(img_path, 'rb', buffering=_READ_BUFFER_SIZE) as source, \
+                Image.open(source) as img:
+            filename = Path(img_path).stem
+            output_path = str(Path(output_dir) / f"{filename}_{platform}.jpg")
+            
+            # Only the header has been read so far
+            if img.size == dimensions and img.format == 'JPEG' and img.mode == 'RGB':
+                # Already conformant: copy the bytes, no decode or encode
+                shutil.copyfile(img_path, output_path)
+                return output_path
+            
+            aspect_delta = abs(img.width / img.height - dimensions[0] / dimensions[1])
+            if aspect_delta < _ASPECT_TOLERANCE and img.width >= dimensions[0]:
+                # Matching aspect: scale straight to size, nothing to pad
+                img.draft('RGB', (
+                    int(dimensions[0] * _REDUCING_GAP),
+                    int(dimensions[1] * _REDUCING_GAP),
+                ))
+                final_img = _letterbox(
+                    img.resize(dimensions, Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP),
+                    dimensions,
+                )
+            else:
+                # Resize maintaining aspect ratio (in place, no copy). thumbnail()
+                # drafts JPEGs to reducing_gap x target before decoding, so
+                # libjpeg's scaled IDCT does the coarse reduction
+                img.thumbnail(dimensions, Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP)
+                
+                # Pad to the exact dimensions with black bars, reusing this
+                # worker's canvas (it is encoded before the next image)
+                final_img = _letterbox(img, dimensions, _worker_canvas(dimensions))
+            
+            # Encode in memory and hand the file a single write
+            encoded = io.BytesIO()
+            _save_optimized(final_img, encoded, 'JPEG')
+            Path(output_path).write_bytes(encoded.getbuffer())
+            return output_path
+        
+    except Exception as e:
+        logger.error("Batch resize failed for image", image=img_path, error=str(e))
+        return None
+
 
 class BabyCanva:
     """
@@ -59,6 +549,7 @@ class BabyCanva:
     @property
     def available(self) -> bool:
         """Check if tool is available."""
+        _log_pillow_variant()
         return PILLOW_AVAILABLE
     
     def create_social_post(
@@ -88,21 +579,13 @@ class BabyCanva:
         
         try:
             dimensions = self.DIMENSIONS.get(platform, (1080, 1080))
-            img = Image.new('RGB', dimensions, color=background_color)
-            draw = ImageDraw.Draw(img)
             
-            # Try to load a nice font, fallback to default
+            # Load a nice font (cached per size), fallback to default
             font_size = dimensions[0] // 15
-            try:
-                font = ImageFont.truetype('Arial.ttf', font_size)
-            except OSError:
-                try:
-                    font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', font_size)
-                except OSError:
-                    font = ImageFont.load_default()
+            font = _load_font(font_size)
             
             # Calculate text position (centered)
-            bbox = draw.textbbox((0, 0), text, font=font)
+            bbox = _text_bbox(text, font)
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
@@ -111,22 +594,23 @@ class BabyCanva:
                 (dimensions[1] - text_height) // 2
             )
             
-            # Draw text with shadow for better readability
-            shadow_offset = 3
-            draw.text(
-                (position[0] + shadow_offset, position[1] + shadow_offset),
-                text,
-                font=font,
-                fill='black'
-            )
-            draw.text(position, text, font=font, fill=text_color)
-            
             if output_path is None:
                 output_path = str(
-                    self.output_dir / f"{platform}_{uuid.uuid4().hex[:8]}.png"
+                    self.output_dir / f"{platform}_{_unique_suffix()}.png"
+                )
+            
+            # Draw text with shadow for better readability. Solid-colour posts
+            # saved as PNG are written as palette images
+            if _EXTENSION_FORMATS.get(Path(output_path).suffix.lower()) == 'PNG':
+                img = _render_indexed_text(
+                    dimensions, background_color, position, text, font, text_color,
+                    shadow_offset=3,
                 )
+            else:
+                img = Image.new('RGB', dimensions, color=background_color)
+                _draw_shadowed_text(img, position, text, font, text_color, shadow_offset=3)
             
-            img.save(output_path)
+            _save_optimized(img, output_path)
             logger.info("Social post created", platform=platform, output=output_path)
             return output_path
             
@@ -161,59 +645,51 @@ class BabyCanva:
             logger.error("Pillow not available")
             return None
         
+        img = None
         try:
-            with Image.open(image_path) as img:
-                # Create a copy to work with
-                img_copy = img.copy()
-            
-            draw = ImageDraw.Draw(img_copy)
+            # load() decodes and releases the file, so we can draw in place
+            img = Image.open(image_path)
+            img.load()
+            if img.mode in ('P', 'PA'):
+                with img:
+                    img = _expand_palette(img)
             
             # Load font
-            try:
-                font = ImageFont.truetype('Arial.ttf', font_size)
-            except OSError:
-                try:
-                    font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', font_size)
-                except OSError:
-                    font = ImageFont.load_default()
+            font = _load_font(font_size)
             
             # Calculate position
-            bbox = draw.textbbox((0, 0), text, font=font)
+            bbox = _text_bbox(text, font)
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
-            x = (img_copy.width - text_width) // 2
+            x = (img.width - text_width) // 2
             
             if position == 'top':
-                y = img_copy.height // 10
+                y = img.height // 10
             elif position == 'bottom':
-                y = img_copy.height - text_height - img_copy.height // 10
+                y = img.height - text_height - img.height // 10
             else:  # center
-                y = (img_copy.height - text_height) // 2
+                y = (img.height - text_height) // 2
             
             # Draw text with shadow
-            shadow_offset = 2
-            draw.text(
-                (x + shadow_offset, y + shadow_offset),
-                text,
-                font=font,
-                fill='black'
-            )
-            draw.text((x, y), text, font=font, fill=text_color)
+            _draw_shadowed_text(img, (x, y), text, font, text_color, shadow_offset=2)
             
             if output_path is None:
                 ext = Path(image_path).suffix
                 output_path = str(
-                    self.output_dir / f"text_overlay_{uuid.uuid4().hex[:8]}{ext}"
+                    self.output_dir / f"text_overlay_{_unique_suffix()}{ext}"
                 )
             
-            img_copy.save(output_path)
+            _save_optimized(img, output_path)
             logger.info("Text added to image", input=image_path, output=output_path)
             return output_path
             
         except Exception as e:
             logger.error("Add text to image failed", error=str(e))
             return None
+        finally:
+            if img is not None:
+                img.close()
     
     def create_thumbnail(
         self,
@@ -243,63 +719,48 @@ class BabyCanva:
             
             if background_image:
                 with Image.open(background_image) as bg_img:
-                    img = bg_img.resize(dimensions, Image.Resampling.LANCZOS)
+                    # Same draft thumbnail() uses; a no-op for non-JPEG sources
+                    bg_img.draft('RGB', (
+                        int(dimensions[0] * _REDUCING_GAP),
+                        int(dimensions[1] * _REDUCING_GAP),
+                    ))
+                    img = bg_img.resize(
+                        dimensions, Image.Resampling.LANCZOS, reducing_gap=_REDUCING_GAP
+                    )
                     # Darken for better text readability
+                    from PIL import ImageEnhance
                     enhancer = ImageEnhance.Brightness(img)
                     img = enhancer.enhance(0.6)
             else:
                 img = Image.new('RGB', dimensions, color=background_color)
             
-            draw = ImageDraw.Draw(img)
-            
             # Large, bold text for thumbnail
             font_size = 80
-            try:
-                font = ImageFont.truetype('Arial.ttf', font_size)
-            except OSError:
-                try:
-                    font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', font_size)
-                except OSError:
-                    font = ImageFont.load_default()
+            font = _load_font(font_size)
             
             # Word wrap text
-            words = title.split()
-            lines = []
-            current_line = []
-            
-            for word in words:
-                test_line = ' '.join(current_line + [word])
-                bbox = draw.textbbox((0, 0), test_line, font=font)
-                if bbox[2] - bbox[0] < dimensions[0] - 100:
-                    current_line.append(word)
-                else:
-                    if current_line:
-                        lines.append(' '.join(current_line))
-                    current_line = [word]
-            
-            if current_line:
-                lines.append(' '.join(current_line))
+            lines = _wrap_words(title.split(), font, dimensions[0] - 100)
             
             # Draw text lines
             y_offset = (dimensions[1] - len(lines) * (font_size + 10)) // 2
             
             for i, line in enumerate(lines):
-                bbox = draw.textbbox((0, 0), line, font=font)
+                # Wrapping measured advances only; one ink bbox per finished
+                # line keeps the centring pixel-exact
+                bbox = font.getbbox(line)
                 text_width = bbox[2] - bbox[0]
                 x = (dimensions[0] - text_width) // 2
                 y = y_offset + i * (font_size + 10)
                 
-                # Shadow
-                draw.text((x + 4, y + 4), line, font=font, fill='black')
-                # Text
-                draw.text((x, y), line, font=font, fill='yellow')
+                # Text with shadow
+                _draw_shadowed_text(img, (x, y), line, font, 'yellow', shadow_offset=4)
             
             if output_path is None:
                 output_path = str(
-                    self.output_dir / f"thumbnail_{uuid.uuid4().hex[:8]}.png"
+                    self.output_dir / f"thumbnail_{_unique_suffix()}.png"
                 )
             
-            img.save(output_path)
+            _save_optimized(img, output_path)
             logger.info("Thumbnail created", output=output_path)
             return output_path
             
@@ -328,11 +789,23 @@ class BabyCanva:
             logger.error("Pillow not available")
             return None
         
+        from PIL import ImageEnhance, ImageFilter
+        
+        source_img = None
         try:
-            with Image.open(image_path) as source_img:
-                img = source_img.copy()
-            
-            if filter_type == 'enhance':
+            # Enhancers return new images, so the decoded source is never mutated
+            source_img = Image.open(image_path)
+            source_img.load()
+            img = _expand_palette(source_img)
+            
+            if NUMPY_AVAILABLE and filter_type in _FUSED_FILTERS and img.mode in ('RGB', 'RGBA'):
+                # Same look as the enhancer chains below, in a single pass;
+                # other modes keep their mode through the enhancers
+                if filter_type == 'vintage':
+                    img = img.filter(ImageFilter.SMOOTH)
+                img = _fused_adjust(img, *_FUSED_FILTERS[filter_type])
+                
+            elif filter_type == 'enhance':
                 # Enhance colors and sharpness
                 enhancer = ImageEnhance.Color(img)
                 img = enhancer.enhance(1.3)
@@ -362,36 +835,46 @@ class BabyCanva:
                 img = enhancer.enhance(0.7)
                 
             elif filter_type == 'bw':
-                # Black and white
+                # Black and white. Both converts are fixed-point C loops; this
+                # beats a one-pass convert('RGB', matrix) on the float path
                 img = img.convert('L').convert('RGB')
             
             if output_path is None:
                 ext = Path(image_path).suffix
                 output_path = str(
-                    self.output_dir / f"filtered_{filter_type}_{uuid.uuid4().hex[:8]}{ext}"
+                    self.output_dir / f"filtered_{filter_type}_{_unique_suffix()}{ext}"
                 )
             
-            img.save(output_path)
+            _save_optimized(img, output_path)
             logger.info("Filter applied", filter=filter_type, output=output_path)
             return output_path
             
         except Exception as e:
             logger.error("Apply filter failed", error=str(e))
             return None
+        finally:
+            if source_img is not None:
+                source_img.close()
     
     def batch_resize(
         self,
         image_paths: List[str],
         platform: str,
         output_dir: Optional[str] = None,
+        use_processes: bool = False,
     ) -> List[str]:
         """
         Batch resize images for a specific platform.
         
+        Images are processed concurrently. Threads are the default because
+        Pillow releases the GIL while decoding, resampling and encoding.
+        
         Args:
             image_paths: List of image paths
             platform: Target platform
             output_dir: Output directory
+            use_processes: Use a process pool instead of threads (for many
+                small files where Python overhead dominates)
             
         Returns:
             List of output paths
@@ -408,29 +891,18 @@ class BabyCanva:
         dimensions = self.DIMENSIONS.get(platform, (1080, 1080))
         results = []
         
-        for img_path in image_paths:
-            try:
-                with Image.open(img_path) as source_img:
-                    img = source_img.copy()
-                    
-                    # Resize maintaining aspect ratio
-                    img.thumbnail(dimensions, Image.Resampling.LANCZOS)
-                    
-                    # Create new image with exact dimensions and paste resized
-                    final_img = Image.new('RGB', dimensions, (0, 0, 0))
-                    offset = (
-                        (dimensions[0] - img.width) // 2,
-                        (dimensions[1] - img.height) // 2
-                    )
-                    final_img.paste(img, offset)
-                    
-                    filename = Path(img_path).stem
-                    output_path = str(Path(output_dir) / f"{filename}_{platform}.jpg")
-                    final_img.save(output_path)
-                    results.append(output_path)
-                
-            except Exception as e:
-                logger.error("Batch resize failed for image", image=img_path, error=str(e))
+        if image_paths:
+            executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            workers = min(len(image_paths), os.cpu_count() or 1)
+            with executor(max_workers=workers) as pool:
+                outputs = pool.map(
+                    _resize_one,
+                    image_paths,
+                    [dimensions] * len(image_paths),
+                    [output_dir] * len(image_paths),
+                    [platform] * len(image_paths),
+                )
+                results = [path for path in outputs if path is not None]
         
         logger.info("Batch resize completed", count=len(results), platform=platform)
         return results
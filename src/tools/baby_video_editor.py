@@ -1,7 +1,7 @@
 """
 Baby Video Editor - Simple CapCut alternative
 
-Provides video editing capabilities using FFmpeg and MoviePy:
+Provides video editing capabilities using FFmpeg:
 - Quick video editing and trimming
 - Caption/subtitle overlay
 - Clip concatenation with transitions
@@ -9,26 +9,36 @@ Provides video editing capabilities using FFmpeg and MoviePy:
 - Music/audio overlay
 """
 
+import os
+import shutil
 import subprocess
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict, Tuple
 import structlog
 
+from . import _ffmpeg
+
 logger = structlog.get_logger(__name__)
 
-try:
-    from moviepy.editor import (
-        VideoFileClip,
-        TextClip,
-        CompositeVideoClip,
-        concatenate_videoclips,
-        AudioFileClip,
-    )
-    MOVIEPY_AVAILABLE = True
-except ImportError:
-    MOVIEPY_AVAILABLE = False
-    logger.warning("MoviePy not available. Install with: pip install moviepy")
+
+def _escape_filter_value(value: str) -> str:
+    """
+    Quote a string for use as a filter option value inside -vf/-filter_complex.
+    
+    FFmpeg unescapes twice: once for the option value (backslash, quote and
+    colon are special) and once for the filtergraph (quotes protect commas,
+    semicolons and brackets).
+    """
+    value = value.replace('\\', '\\\\').replace("'", "\\'").replace(':', '\\:')
+    return "'" + value.replace("'", "'\\''") + "'"
+
+
+# Consumer GPUs allow only a handful of concurrent NVENC sessions
+_NVENC_MAX_SESSIONS = 3
+# libx264 already threads across cores; two jobs keep them busy between frames
+_X264_MAX_JOBS = 2
 
 
 class BabyCapCut:
@@ -54,7 +64,12 @@ class BabyCapCut:
     def __init__(
         self,
         output_dir: str = "./output/videos",
-        ffmpeg_path: str = "ffmpeg"
+        ffmpeg_path: str = "ffmpeg",
+        ffprobe_path: str = "ffprobe",
+        use_nvenc: Optional[bool] = None,
+        nvenc_preset: str = "p4",
+        nvenc_cq: int = 23,
+        max_concurrent_transcodes: Optional[int] = None,
     ):
         """
         Initialize Baby CapCut tool.
@@ -62,18 +77,139 @@ class BabyCapCut:
         Args:
             output_dir: Directory for output files
             ffmpeg_path: Path to ffmpeg executable
+            ffprobe_path: Path to ffprobe executable
+            use_nvenc: Encode H.264 with NVENC; None detects it on first use
+            nvenc_preset: NVENC preset (p1 fastest .. p7 best quality)
+            nvenc_cq: NVENC constant-quality level (lower is better)
+            max_concurrent_transcodes: FFmpeg jobs run_batch keeps in flight;
+                defaults to the NVENC session limit or two for libx264
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = ffprobe_path
+        self._use_nvenc = use_nvenc
+        self.nvenc_preset = nvenc_preset
+        self.nvenc_cq = nvenc_cq
+        self._max_concurrent_transcodes = max_concurrent_transcodes
         
-        if not MOVIEPY_AVAILABLE:
-            logger.warning("MoviePy not available - some features will be disabled")
+        if not self.available:
+            logger.warning("FFmpeg not found - tool will be disabled", ffmpeg_path=ffmpeg_path)
     
     @property
     def available(self) -> bool:
-        """Check if tool is available."""
-        return MOVIEPY_AVAILABLE
+        """Check if tool is available (every edit runs through FFmpeg)."""
+        return shutil.which(self.ffmpeg_path) is not None
+    
+    @property
+    def use_nvenc(self) -> bool:
+        """Whether H.264 output is encoded on the GPU with NVENC."""
+        if self._use_nvenc is None:
+            self._use_nvenc = _ffmpeg.encoder_works(self.ffmpeg_path, 'h264_nvenc')
+        return self._use_nvenc
+    
+    @property
+    def max_concurrent_transcodes(self) -> int:
+        """How many FFmpeg jobs run_batch runs at once."""
+        if self._max_concurrent_transcodes is None:
+            cpus = os.cpu_count() or 1
+            limit = _NVENC_MAX_SESSIONS if self.use_nvenc else _X264_MAX_JOBS
+            self._max_concurrent_transcodes = max(1, min(cpus, limit))
+        return self._max_concurrent_transcodes
+    
+    def run_batch(self, jobs: List[Callable[[], Optional[str]]]) -> List[Optional[str]]:
+        """
+        Run editing jobs concurrently with bounded FFmpeg parallelism.
+        
+        Each job is a zero-argument callable, typically a bound method with
+        its arguments (e.g. functools.partial(editor.trim_video, path, 0, 10)).
+        Jobs block in FFmpeg subprocesses, so threads are enough to overlap
+        them.
+        
+        Args:
+            jobs: Callables returning an output path or None
+            
+        Returns:
+            Job results in input order; None for jobs that failed or raised
+        """
+        if not jobs:
+            return []
+        
+        def run(job: Callable[[], Optional[str]]) -> Optional[str]:
+            try:
+                return job()
+            except Exception as e:
+                logger.error("Batch job failed", error=str(e))
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(len(jobs), self.max_concurrent_transcodes)) as pool:
+            results = list(pool.map(run, jobs))
+        
+        logger.info(
+            "Batch completed",
+            jobs=len(jobs),
+            succeeded=sum(result is not None for result in results),
+        )
+        return results
+    
+    def _h264_encoder(self, low_latency: bool = False) -> Tuple[str, List[str]]:
+        """
+        Return the H.264 codec and its extra FFmpeg parameters.
+        
+        Args:
+            low_latency: Trade quality for NVENC throughput with the fastest
+                preset and low-latency tuning
+        
+        Returns:
+            (codec name, ffmpeg params) - h264_nvenc in VBR constant-quality
+            mode when available, otherwise libx264 as the shared encoder
+            table configures it
+        """
+        if self.use_nvenc and low_latency:
+            return 'h264_nvenc', _ffmpeg.nvenc_args('p1', 28, tune='ll')
+        if self.use_nvenc:
+            return 'h264_nvenc', _ffmpeg.nvenc_args(self.nvenc_preset, self.nvenc_cq)
+        name, args = _ffmpeg.H264_ENCODERS[-1]
+        return name, list(args)
+    
+    def _common_encode_args(self, codec: Optional[str] = None, filter_complex: bool = False) -> List[str]:
+        """
+        Return output options shared by every FFmpeg write.
+        
+        Thread counts are pinned instead of left to FFmpeg's auto-detection,
+        and the MP4 index is moved to the front for streaming and seeking.
+        
+        Args:
+            codec: Video encoder in use, None for stream copies
+            filter_complex: The command filters with -filter_complex, whose
+                thread count is set by -filter_complex_threads instead
+            
+        Returns:
+            Options to place just before the output path
+        """
+        cpus = os.cpu_count() or 1
+        args = [
+            '-threads', str(cpus),
+            '-filter_complex_threads' if filter_complex else '-filter_threads', str(min(8, cpus)),
+            '-movflags', '+faststart',
+        ]
+        if codec == 'h264_nvenc':
+            # Bound the encoder queue and emit frames as soon as they're done
+            args += ['-surfaces', '32', '-delay', '0']
+        return args
+    
+    def _decode_args(self) -> List[str]:
+        """
+        Return FFmpeg input options for hardware decoding.
+        
+        With NVENC in use, inputs are decoded on NVDEC and frames are copied
+        back to system memory for the CPU filters; FFmpeg falls back to
+        software decoding for codecs NVDEC can't handle.
+        
+        Returns:
+            Options to place before each '-i', empty for software decoding
+        """
+        return ['-hwaccel', 'cuda'] if self.use_nvenc else []
     
     def trim_video(
         self,
@@ -81,15 +217,21 @@ class BabyCapCut:
         start_time: float,
         end_time: float,
         output_path: Optional[str] = None,
+        precise: bool = False,
     ) -> Optional[str]:
         """
         Trim video to specified time range using FFmpeg for speed.
         
+        The default stream-copies from the keyframe at or before start_time.
+        precise=True re-encodes to cut on the exact frame, seeking coarsely
+        to two seconds before the cut and decoding only the remainder.
+        
         Args:
             video_path: Input video path
             start_time: Start time in seconds
             end_time: End time in seconds
             output_path: Output path
+            precise: Cut on the exact frame (re-encodes the clip)
             
         Returns:
             Path to trimmed video or None if failed
@@ -102,14 +244,35 @@ class BabyCapCut:
             
             duration = end_time - start_time
             
-            cmd = [
-                self.ffmpeg_path, '-y',
-                '-i', video_path,
-                '-ss', str(start_time),
-                '-t', str(duration),
-                '-c', 'copy',  # Copy codec for fast processing
-                output_path
-            ]
+            if precise:
+                # Input-side seek jumps to a keyframe just before the cut, then
+                # the output-side seek decodes the last stretch frame-accurately
+                coarse = max(0.0, start_time - 2.0)
+                codec, params = self._h264_encoder()
+                cmd = [
+                    self.ffmpeg_path, '-y',
+                    '-ss', str(coarse),
+                    '-i', video_path,
+                    '-ss', str(start_time - coarse),
+                    '-t', str(duration),
+                    '-c:v', codec, *params,
+                    '-c:a', 'aac',
+                    *self._common_encode_args(codec),
+                    output_path
+                ]
+            else:
+                # Input-side seek uses the container index instead of decoding
+                # everything before start_time
+                cmd = [
+                    self.ffmpeg_path, '-y',
+                    '-ss', str(start_time),
+                    '-i', video_path,
+                    '-t', str(duration),
+                    '-c', 'copy',  # Copy codec for fast processing
+                    '-avoid_negative_ts', 'make_zero',
+                    *self._common_encode_args(),
+                    output_path
+                ]
             
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
             if result.returncode != 0:
@@ -134,6 +297,9 @@ class BabyCapCut:
         """
         Add captions/subtitles to video.
         
+        Captions are burned in by FFmpeg's drawtext filter in a single pass,
+        one filter per caption gated on its time range; audio is copied.
+        
         Args:
             video_path: Input video path
             captions: List of caption dicts with 'text', 'start', 'end'
@@ -144,54 +310,38 @@ class BabyCapCut:
         Returns:
             Path to captioned video or None if failed
         """
-        if not MOVIEPY_AVAILABLE:
-            logger.error("MoviePy not available")
-            return None
-        
-        video = None
-        txt_clips = []
-        final = None
-        
         try:
-            video = VideoFileClip(video_path)
-            clips = [video]
-            
-            for caption in captions:
-                txt_clip = TextClip(
-                    caption['text'],
-                    fontsize=font_size,
-                    color=font_color,
-                    stroke_color='black',
-                    stroke_width=2,
-                    method='caption',
-                    size=(int(video.w * 0.9), None)
-                )
-                txt_clip = txt_clip.set_position(('center', 0.8), relative=True)
-                txt_clip = txt_clip.set_start(caption['start'])
-                
-                duration = caption['end'] - caption['start']
-                txt_clip = txt_clip.set_duration(duration)
-                
-                txt_clips.append(txt_clip)
-                clips.append(txt_clip)
-            
-            final = CompositeVideoClip(clips)
-            
             if output_path is None:
                 output_path = str(
                     self.output_dir / f"captioned_{uuid.uuid4().hex[:8]}.mp4"
                 )
             
-            # Use unique temp audio file to avoid collisions
-            temp_audio = str(self.output_dir / f"temp-audio-{uuid.uuid4().hex[:8]}.m4a")
+            filters = [
+                "drawtext="
+                f"text={_escape_filter_value(str(caption['text']))}:expansion=none:"
+                f"fontsize={font_size}:fontcolor={font_color}:"
+                "bordercolor=black:borderw=2:"
+                "x=(w-text_w)/2:y=h*0.8:"
+                f"enable='between(t,{float(caption['start'])},{float(caption['end'])})'"
+                for caption in captions
+            ]
             
-            final.write_videofile(
-                output_path,
-                codec='libx264',
-                audio_codec='aac',
-                temp_audiofile=temp_audio,
-                remove_temp=True
-            )
+            codec, params = self._h264_encoder()
+            cmd = [
+                self.ffmpeg_path, '-y',
+                *self._decode_args(),
+                '-i', video_path,
+                '-vf', ','.join(filters) or 'null',
+                '-c:v', codec, *params,
+                '-c:a', 'copy',
+                *self._common_encode_args(codec),
+                output_path
+            ]
+            
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+            if result.returncode != 0:
+                logger.error("FFmpeg captions failed", stderr=result.stderr)
+                return None
             
             logger.info("Captions added", input=video_path, output=output_path)
             return output_path
@@ -199,23 +349,6 @@ class BabyCapCut:
         except Exception as e:
             logger.error("Add captions failed", error=str(e))
             return None
-        finally:
-            # Clean up
-            for clip in txt_clips:
-                try:
-                    clip.close()
-                except Exception as e:
-                    logger.warning("Failed to close text clip during cleanup", error=str(e))
-            if final:
-                try:
-                    final.close()
-                except Exception as e:
-                    logger.warning("Failed to close final composite clip during cleanup", error=str(e))
-            if video:
-                try:
-                    video.close()
-                except Exception as e:
-                    logger.warning("Failed to close video clip during cleanup", error=str(e))
     
     def resize_for_platform(
         self,
@@ -227,6 +360,11 @@ class BabyCapCut:
         """
         Resize video for specific social media platform.
         
+        With NVENC available, frames are decoded and scaled on the GPU and
+        only the scaled frames are downloaded for the crop/pad step. If that
+        pipeline fails (codec unsupported by NVDEC, FFmpeg built without
+        CUDA filters), the CPU filter graph is used instead.
+        
         Args:
             video_path: Input video path
             platform: Platform name (tiktok, instagram_reel, etc.)
@@ -247,20 +385,49 @@ class BabyCapCut:
             
             if crop:
                 # Crop to exact size (may cut edges)
-                filter_str = f"scale={width}:{height}:force_original_aspect_ratio=increase,crop={width}:{height}"
+                fit = 'increase'
+                finish = f"crop={width}:{height}"
             else:
                 # Letterbox (add black bars if needed)
-                filter_str = f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
+                fit = 'decrease'
+                finish = f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2"
             
-            cmd = [
-                self.ffmpeg_path, '-y',
-                '-i', video_path,
-                '-vf', filter_str,
-                '-c:a', 'copy',
-                output_path
-            ]
+            codec, params = self._h264_encoder()
+            result = None
+            
+            if self.use_nvenc:
+                # crop/pad have no CUDA implementation; run them on the
+                # already-scaled frames after a single download
+                cmd = [
+                    self.ffmpeg_path, '-y',
+                    '-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda',
+                    '-i', video_path,
+                    '-vf', (
+                        f"scale_cuda={width}:{height}:force_original_aspect_ratio={fit},"
+                        f"hwdownload,format=nv12,{finish}"
+                    ),
+                    '-c:v', codec, *params,
+                    '-c:a', 'copy',
+                    *self._common_encode_args(codec),
+                    output_path
+                ]
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+                if result.returncode != 0:
+                    logger.info("GPU resize pipeline failed, using CPU filters", stderr=result.stderr[-500:])
+            
+            if result is None or result.returncode != 0:
+                filter_str = f"scale={width}:{height}:force_original_aspect_ratio={fit},{finish}"
+                cmd = [
+                    self.ffmpeg_path, '-y',
+                    '-i', video_path,
+                    '-vf', filter_str,
+                    '-c:v', codec, *params,
+                    '-c:a', 'copy',
+                    *self._common_encode_args(codec),
+                    output_path
+                ]
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
             if result.returncode != 0:
                 logger.error("FFmpeg resize failed", stderr=result.stderr)
                 return None
@@ -281,48 +448,44 @@ class BabyCapCut:
         """
         Concatenate multiple videos with crossfade transitions.
         
+        Without transitions, clips whose streams match are joined by the
+        concat demuxer with no re-encode; mismatched clips go through the
+        concat filter. Crossfades are rendered with xfade/acrossfade in a
+        single FFmpeg pass.
+        
         Args:
             video_paths: List of video paths
             output_path: Output path
-            transition_duration: Duration of crossfade in seconds
+            transition_duration: Duration of crossfade in seconds (0 for hard cuts)
             
         Returns:
             Path to concatenated video or None if failed
         """
-        if not MOVIEPY_AVAILABLE:
-            logger.error("MoviePy not available")
-            return None
-        
-        clips = []
-        final = None
-        
         try:
-            # Load all clips
-            clips = [VideoFileClip(path) for path in video_paths]
-            
-            # Apply crossfade to all clips except first
-            final_clips = [clips[0]]
-            for clip in clips[1:]:
-                final_clips.append(clip.crossfadein(transition_duration))
-            
-            # Concatenate
-            final = concatenate_videoclips(final_clips, method='compose')
+            if not video_paths:
+                logger.error("No videos provided")
+                return None
             
             if output_path is None:
                 output_path = str(
                     self.output_dir / f"concatenated_{uuid.uuid4().hex[:8]}.mp4"
                 )
             
-            # Use unique temp audio file to avoid collisions
-            temp_audio = str(self.output_dir / f"temp-audio-{uuid.uuid4().hex[:8]}.m4a")
-            
-            final.write_videofile(
-                output_path,
-                codec='libx264',
-                audio_codec='aac',
-                temp_audiofile=temp_audio,
-                remove_temp=True
+            codec, params = self._h264_encoder()
+            result = _ffmpeg.concatenate(
+                self.ffmpeg_path, self.ffprobe_path, video_paths, output_path,
+                ['-c:v', codec, *params],
+                transition_duration=transition_duration,
+                decode_args=self._decode_args(),
+                output_args=self._common_encode_args(codec, filter_complex=True),
+                copy_args=self._common_encode_args(),
             )
+            if result is None:
+                return None
+            
+            if result.returncode != 0:
+                logger.error("FFmpeg concatenation failed", stderr=result.stderr)
+                return None
             
             logger.info("Videos concatenated", count=len(video_paths), output=output_path)
             return output_path
@@ -330,18 +493,6 @@ class BabyCapCut:
         except Exception as e:
             logger.error("Concatenate videos failed", error=str(e))
             return None
-        finally:
-            # Clean up
-            if final:
-                try:
-                    final.close()
-                except Exception as e:
-                    logger.debug("Failed to close final concatenated clip", error=str(e), exc_info=True)
-            for clip in clips:
-                try:
-                    clip.close()
-                except Exception as e:
-                    logger.debug("Failed to close video clip during cleanup", error=str(e), exc_info=True)
     
     def add_background_music(
         self,
@@ -353,6 +504,9 @@ class BabyCapCut:
         """
         Add background music to video, mixing with existing audio.
         
+        The music is looped, attenuated and mixed in one FFmpeg pass; the
+        video stream is copied, not re-encoded.
+        
         Args:
             video_path: Input video path
             audio_path: Background music path
@@ -362,51 +516,42 @@ class BabyCapCut:
         Returns:
             Path to output video or None if failed
         """
-        if not MOVIEPY_AVAILABLE:
-            logger.error("MoviePy not available")
-            return None
-        
-        video = None
-        background_music = None
-        final = None
-        
         try:
-            video = VideoFileClip(video_path)
-            background_music = AudioFileClip(audio_path)
-            
-            # Loop music if shorter than video
-            if background_music.duration < video.duration:
-                n_loops = int(video.duration / background_music.duration) + 1
-                background_music = background_music.loop(n=n_loops)
-            
-            # Trim music to video length
-            background_music = background_music.subclip(0, video.duration)
-            
-            # Adjust volume
-            background_music = background_music.volumex(audio_volume)
-            
-            # Mix with original audio if exists
-            if video.audio:
-                from moviepy.audio.AudioClip import CompositeAudioClip
-                final_audio = CompositeAudioClip([video.audio, background_music])
-            else:
-                final_audio = background_music
-            
-            # Set audio to video
-            final = video.set_audio(final_audio)
-            
             if output_path is None:
                 output_path = str(
                     self.output_dir / f"with_music_{uuid.uuid4().hex[:8]}.mp4"
                 )
             
-            final.write_videofile(
-                output_path,
-                codec='libx264',
-                audio_codec='aac',
-                temp_audiofile=f"temp-audio-{uuid.uuid4().hex}.m4a",
-                remove_temp=True
-            )
+            probe = _ffmpeg.probe_streams(self.ffprobe_path, video_path)
+            has_audio = probe is None or probe['has_audio']
+            
+            if has_audio:
+                # normalize=0 sums the inputs like a plain overlay instead of
+                # halving the original soundtrack
+                audio_graph = (
+                    f"[1:a]volume={audio_volume}[bg];"
+                    "[0:a][bg]amix=inputs=2:duration=first:dropout_transition=0:normalize=0[aout]"
+                )
+            else:
+                audio_graph = f"[1:a]volume={audio_volume}[aout]"
+            
+            cmd = [
+                self.ffmpeg_path, '-y',
+                '-i', video_path,
+                '-stream_loop', '-1', '-i', audio_path,
+                '-filter_complex', audio_graph,
+                '-map', '0:v', '-map', '[aout]',
+                '-c:v', 'copy',
+                '-c:a', 'aac',
+                '-shortest',
+                *self._common_encode_args(filter_complex=True),
+                output_path
+            ]
+            
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+            if result.returncode != 0:
+                logger.error("FFmpeg music mix failed", stderr=result.stderr)
+                return None
             
             logger.info("Background music added", output=output_path)
             return output_path
@@ -414,23 +559,6 @@ class BabyCapCut:
         except Exception as e:
             logger.error("Add background music failed", error=str(e))
             return None
-        finally:
-            # Clean up
-            if final:
-                try:
-                    final.close()
-                except Exception as e:
-                    logger.debug("Failed to close final video clip", error=str(e))
-            if video:
-                try:
-                    video.close()
-                except Exception as e:
-                    logger.debug("Failed to close video clip", error=str(e))
-            if background_music:
-                try:
-                    background_music.close()
-                except Exception as e:
-                    logger.debug("Failed to close background music clip", error=str(e))
     
     def speed_up_video(
         self,
@@ -470,14 +598,21 @@ class BabyCapCut:
             # Audio tempo can only be 0.5-2.0, so chain if needed
             audio_filter = self._get_audio_tempo_filter(speed_factor)
             
+            # setpts works on decoded frames, so a re-encode is unavoidable;
+            # sped-up footage hides artifacts well, so favour encode speed
+            codec, params = self._h264_encoder(low_latency=True)
+            
             # Try with audio first; if it fails (no audio stream), try video only
             cmd = [
                 self.ffmpeg_path, '-y',
+                *self._decode_args(),
                 '-i', video_path,
                 '-filter_complex',
                 f"[0:v]setpts={pts_value}*PTS[v];[0:a]{audio_filter}[a]",
                 '-map', '[v]',
                 '-map', '[a]',
+                '-c:v', codec, *params,
+                *self._common_encode_args(codec, filter_complex=True),
                 output_path
             ]
             
@@ -489,9 +624,12 @@ class BabyCapCut:
                 logger.info("No audio stream detected, processing video only")
                 cmd = [
                     self.ffmpeg_path, '-y',
+                    *self._decode_args(),
                     '-i', video_path,
                     '-filter:v', f"setpts={pts_value}*PTS",
                     '-an',  # No audio
+                    '-c:v', codec, *params,
+                    *self._common_encode_args(codec),
                     output_path
                 ]
                 result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
@@ -5,9 +5,13 @@ Provides wrappers for:
 - DeepFace: Face recognition and analysis
 """
 
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -21,6 +25,70 @@ except ImportError:
     DEEPFACE_AVAILABLE = False
     logger.warning("DeepFace not available. Install with: pip install deepface")
 
+# FAISS import (optional, numpy search is used without it)
+try:
+    import faiss
+
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Attribute models used by DeepFace.analyze, as opposed to recognition models
+_ATTRIBUTE_MODELS = {"Age", "Gender", "Emotion", "Race"}
+
+_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".bmp"}
+
+# DeepFace's cosine-distance verification thresholds per model
+_COSINE_THRESHOLDS = {
+    "VGG-Face": 0.68,
+    "Facenet": 0.40,
+    "Facenet512": 0.30,
+    "ArcFace": 0.68,
+    "Dlib": 0.07,
+    "SFace": 0.593,
+    "OpenFace": 0.10,
+    "DeepFace": 0.23,
+    "DeepID": 0.015,
+    "GhostFaceNet": 0.65,
+}
+
+
+def _database_manifest(database: Path) -> dict:
+    """
+    Describe the images in a face database by path, mtime and size.
+
+    Stored next to the index, so an index whose manifest no longer matches
+    the directory is known to be stale.
+
+    Returns:
+        Mapping of image paths relative to the database to [mtime_ns, size]
+    """
+    manifest = {}
+    for path in sorted(database.rglob("*")):
+        if path.suffix.lower() in _IMAGE_EXTENSIONS:
+            stat = path.stat()
+            manifest[path.relative_to(database).as_posix()] = [stat.st_mtime_ns, stat.st_size]
+    return manifest
+
+
+def _build_model(model_name: str):
+    """
+    Build a DeepFace model, which DeepFace keeps cached for the process.
+
+    Args:
+        model_name: Recognition model (e.g. VGG-Face) or attribute model
+                    (Age, Gender, Emotion, Race)
+
+    Returns:
+        The built model
+    """
+    task = "facial_attribute" if model_name in _ATTRIBUTE_MODELS else "facial_recognition"
+    try:
+        return DeepFace.build_model(model_name=model_name, task=task)
+    except TypeError:
+        # deepface < 0.0.90 infers the task from the model name
+        return DeepFace.build_model(model_name)
+
 
 class DeepFaceTool:
     """
@@ -32,9 +100,53 @@ class DeepFaceTool:
     - Face quality assessment
     """
 
-    def __init__(self):
-        """Initialize DeepFace tool."""
-        pass
+    def __init__(
+        self,
+        preload_models: Optional[list[str]] = None,
+        database_path: Optional[str] = None,
+    ):
+        """
+        Initialize DeepFace tool.
+
+        Building a model takes seconds, so it is done here rather than on
+        the first live call.
+
+        Args:
+            preload_models: Models to build up front. Default: ["VGG-Face"]
+            database_path: Face database to load or build the index of up front
+        """
+        self.preload_models = ["VGG-Face"] if preload_models is None else preload_models
+        self._models: dict = {}
+        self._indexes: dict = {}
+
+        if not DEEPFACE_AVAILABLE:
+            return
+
+        for model_name in self.preload_models:
+            self._get_model(model_name)
+
+        if database_path:
+            recognition = [m for m in self.preload_models if m not in _ATTRIBUTE_MODELS]
+            self._get_index(database_path, recognition[0] if recognition else "VGG-Face")
+
+    def _get_model(self, model_name: str):
+        """
+        Return a built model, building and pinning it on first use.
+
+        Args:
+            model_name: DeepFace model name
+
+        Returns:
+            The built model or None if it failed to build
+        """
+        if model_name not in self._models:
+            try:
+                self._models[model_name] = _build_model(model_name)
+                logger.info("DeepFace model loaded", model=model_name)
+            except Exception as e:
+                logger.error("DeepFace model load failed", model=model_name, error=str(e))
+                return None
+        return self._models[model_name]
 
     @property
     def available(self) -> bool:
@@ -86,6 +198,68 @@ class DeepFaceTool:
             logger.error("Face analysis failed", error=str(e))
             return None
 
+    def analyze_faces_batch(
+        self,
+        image_paths: list[str],
+        actions: Optional[list[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> list[Optional[list[dict]]]:
+        """
+        Analyze faces in several images concurrently against the same warm models.
+
+        The attribute models for the requested actions are built once
+        before the first image, so no image pays the model build. Images
+        are then analyzed on a thread pool: decoding, face detection and
+        model inference release the GIL, so one image's preprocessing
+        overlaps another's inference.
+
+        Args:
+            image_paths: Paths to images containing faces
+            actions: List of analysis actions (age, gender, emotion, race)
+                    Default: all actions
+            max_workers: Images analyzed at once. Default: CPU count
+
+        Returns:
+            Per-image analysis results in input order; None for images
+            that failed
+        """
+        if not DEEPFACE_AVAILABLE:
+            logger.error("DeepFace not available")
+            return [None] * len(image_paths)
+
+        if not image_paths:
+            return []
+
+        if actions is None:
+            actions = ["age", "gender", "emotion", "race"]
+
+        for action in actions:
+            self._get_model(action.capitalize())
+
+        def analyze(image_path: str) -> Optional[list[dict]]:
+            try:
+                results = DeepFace.analyze(
+                    img_path=image_path,
+                    actions=actions,
+                    enforce_detection=False,
+                )
+                return results if isinstance(results, list) else [results]
+            except Exception as e:
+                logger.error("Face analysis failed", image=image_path, error=str(e))
+                return None
+
+        workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=min(workers, len(image_paths))) as pool:
+            batch_results = list(pool.map(analyze, image_paths))
+
+        logger.info(
+            "Face batch analyzed",
+            images=len(image_paths),
+            succeeded=sum(results is not None for results in batch_results),
+            actions=actions,
+        )
+        return batch_results
+
     def detect_emotion(self, image_path: str) -> Optional[dict]:
         """
         Detect dominant emotion in face.
@@ -151,6 +325,7 @@ class DeepFaceTool:
             return None
 
         try:
+            self._get_model(model_name)
             result = DeepFace.verify(
                 img1_path=image1_path,
                 img2_path=image2_path,
@@ -238,32 +413,198 @@ class DeepFaceTool:
                 "reason": f"Analysis failed: {str(e)}",
             }
 
+    def _embed(self, image_path: str, model_name: str) -> np.ndarray:
+        """
+        Return the L2-normalized embeddings of the faces in an image.
+
+        Args:
+            image_path: Path to image containing faces
+            model_name: Face recognition model to use
+
+        Returns:
+            float32 array of shape (faces, dimensions)
+        """
+        self._get_model(model_name)
+        faces = DeepFace.represent(
+            img_path=image_path,
+            model_name=model_name,
+            enforce_detection=False,
+        )
+        embeddings = np.asarray([face["embedding"] for face in faces], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    @staticmethod
+    def _index_path(database_path: str, model_name: str) -> Path:
+        """Return the index file path for a database and model."""
+        suffix = ".faiss" if FAISS_AVAILABLE else ".npy"
+        return Path(database_path) / f"faces_{model_name.lower().replace('-', '_')}{suffix}"
+
+    def build_index(
+        self,
+        database_path: str,
+        model_name: str = "VGG-Face",
+    ) -> Optional[int]:
+        """
+        Embed every face in a database directory and persist a search index.
+
+        The index is written next to the images with a manifest of their
+        paths, mtimes and sizes; find_face_in_database reuses it until the
+        manifest no longer matches the directory. If the directory is not
+        writable, the index is kept in memory for this process only.
+
+        Args:
+            database_path: Path to directory containing face images
+            model_name: Face recognition model to use
+
+        Returns:
+            Number of faces indexed or None if failed
+        """
+        if not DEEPFACE_AVAILABLE:
+            logger.error("DeepFace not available")
+            return None
+
+        try:
+            database = Path(database_path)
+            if not database.is_dir():
+                logger.error("Database path is not a directory")
+                return None
+
+            manifest = _database_manifest(database)
+            identities = []
+            blocks = []
+            for relative in manifest:
+                path = database / relative
+                try:
+                    embeddings = self._embed(str(path), model_name)
+                except Exception as e:
+                    logger.warning("Skipping face image", image=str(path), error=str(e))
+                    continue
+                blocks.append(embeddings)
+                identities.extend([str(path)] * len(embeddings))
+
+            if not blocks:
+                logger.error("No faces found in database", path=database_path)
+                return None
+
+            matrix = np.ascontiguousarray(np.vstack(blocks))
+            index_path = self._index_path(database_path, model_name)
+            if FAISS_AVAILABLE:
+                index = faiss.IndexFlatIP(matrix.shape[1])
+                index.add(matrix)
+            else:
+                index = matrix
+            try:
+                if FAISS_AVAILABLE:
+                    faiss.write_index(index, str(index_path))
+                else:
+                    np.save(index_path, matrix)
+                index_path.with_suffix(".json").write_text(
+                    json.dumps({"identities": identities, "manifest": manifest})
+                )
+            except (OSError, RuntimeError) as e:
+                logger.warning(
+                    "Face index not saved, keeping it in memory",
+                    path=str(index_path),
+                    error=str(e),
+                )
+
+            self._indexes[(str(database), model_name)] = (index, identities, manifest)
+            logger.info(
+                "Face index built",
+                path=database_path,
+                model=model_name,
+                faces=len(identities),
+            )
+            return len(identities)
+        except Exception as e:
+            logger.error("Face index build failed", error=str(e))
+            return None
+
+    def _get_index(self, database_path: str, model_name: str):
+        """
+        Return (index, identities) from memory, disk or a fresh build.
+
+        The index is rebuilt when images were added, removed or modified
+        since it was built.
+
+        Args:
+            database_path: Path to directory containing face images
+            model_name: Face recognition model to use
+
+        Returns:
+            Tuple of the index and its row identities, or None if failed
+        """
+        key = (str(Path(database_path)), model_name)
+        manifest = _database_manifest(Path(database_path))
+        if key not in self._indexes:
+            index_path = self._index_path(database_path, model_name)
+            metadata_path = index_path.with_suffix(".json")
+            if index_path.exists() and metadata_path.exists():
+                try:
+                    metadata = json.loads(metadata_path.read_text())
+                    # Indexes saved without a manifest are treated as stale
+                    if isinstance(metadata, dict) and metadata.get("manifest") == manifest:
+                        if FAISS_AVAILABLE:
+                            index = faiss.read_index(str(index_path))
+                        else:
+                            index = np.load(index_path)
+                        self._indexes[key] = (index, metadata["identities"], manifest)
+                except Exception as e:
+                    logger.warning("Face index load failed", path=str(index_path), error=str(e))
+
+        cached = self._indexes.get(key)
+        if cached is None or cached[2] != manifest:
+            if cached is not None:
+                logger.info("Face database changed, rebuilding index", path=database_path)
+            if self.build_index(database_path, model_name) is None:
+                return None
+            cached = self._indexes[key]
+        return cached[0], cached[1]
+
     def find_face_in_database(
         self,
         image_path: str,
         database_path: str,
         model_name: str = "VGG-Face",
+        top_k: int = 10,
+        use_index: bool = True,
     ) -> Optional[list[dict]]:
         """
         Find matching faces in a database directory.
 
+        By default the query embedding is searched against a persistent
+        inner-product index of the database (see build_index) instead of
+        having DeepFace.find rescan the directory. DeepFace.find is still
+        used if the index can't be built or searched.
+
         Args:
             image_path: Path to query image
             database_path: Path to directory containing face images
             model_name: Face recognition model to use
+            top_k: Maximum number of matches to return from the index
+            use_index: Search the index; False falls back to DeepFace.find
 
         Returns:
-            List of matching faces or None if failed
+            List of matching faces ("identity" and cosine "distance",
+            closest first) or None if failed
         """
         if not DEEPFACE_AVAILABLE:
             logger.error("DeepFace not available")
             return None
 
+        if use_index:
+            matches = self._search_index(image_path, database_path, model_name, top_k)
+            if matches is not None:
+                return matches
+            logger.warning("Face index search failed, using DeepFace.find", path=database_path)
+
         try:
             if not Path(database_path).is_dir():
                 logger.error("Database path is not a directory")
                 return None
 
+            self._get_model(model_name)
             results = DeepFace.find(
                 img_path=image_path,
                 db_path=database_path,
@@ -271,11 +612,70 @@ class DeepFaceTool:
                 enforce_detection=False,
             )
 
-            # Convert DataFrame results to list of dicts
+            # Convert DataFrame results to list of dicts; zipping rows of the
+            # underlying array skips pandas' per-cell record conversion
             matches = []
             for df in results:
                 if not df.empty:
-                    matches.extend(df.to_dict(orient="records"))
+                    columns = df.columns.tolist()
+                    matches.extend(dict(zip(columns, row)) for row in df.to_numpy())
+
+            logger.info(
+                "Face search completed",
+                image=image_path,
+                matches_found=len(matches),
+            )
+            return matches
+        except Exception as e:
+            logger.error("Face search failed", error=str(e))
+            return None
+
+    def _search_index(
+        self,
+        image_path: str,
+        database_path: str,
+        model_name: str,
+        top_k: int,
+    ) -> Optional[list[dict]]:
+        """
+        Search the database index for faces matching the query image.
+
+        Args:
+            image_path: Path to query image
+            database_path: Path to directory containing face images
+            model_name: Face recognition model to use
+            top_k: Maximum number of matches to return
+
+        Returns:
+            List of matching faces or None if failed
+        """
+        try:
+            if not Path(database_path).is_dir():
+                logger.error("Database path is not a directory")
+                return None
+
+            loaded = self._get_index(database_path, model_name)
+            if loaded is None:
+                return None
+            index, identities = loaded
+
+            query = self._embed(image_path, model_name)[:1]
+            k = min(top_k, len(identities))
+            if FAISS_AVAILABLE:
+                similarities, rows = index.search(query, k)
+                similarities, rows = similarities[0], rows[0]
+            else:
+                scores = index @ query[0]
+                rows = np.argpartition(-scores, k - 1)[:k]
+                rows = rows[np.argsort(-scores[rows])]
+                similarities = scores[rows]
+
+            threshold = _COSINE_THRESHOLDS.get(model_name, 0.4)
+            matches = [
+                {"identity": identities[row], "distance": float(1.0 - similarity)}
+                for similarity, row in zip(similarities, rows)
+                if row >= 0 and 1.0 - similarity <= threshold
+            ]
 
             logger.info(
                 "Face search completed",
@@ -6,6 +6,7 @@ These tests verify that baby tools can be imported and instantiated.
 
 import tempfile
 import os
+from pathlib import Path
 
 
 class TestBabyToolsImport:
@@ -49,6 +50,329 @@ class TestBabyCanva:
         assert 'instagram_post' in canva.DIMENSIONS
         assert 'tiktok' in canva.DIMENSIONS
         assert 'youtube_thumbnail' in canva.DIMENSIONS
+    
+    def test_edits_source_without_copy(self, tmp_path):
+        """Test text, filter and resize paths on a decoded source image."""
+        from PIL import Image
+        from src.tools.baby_design import BabyCanva
+        canva = BabyCanva(output_dir=str(tmp_path / "designs"))
+        source = tmp_path / "source.png"
+        Image.new('RGB', (400, 300), (200, 120, 40)).save(source)
+        
+        overlay = canva.add_text_to_image(str(source), "Hello", font_size=20)
+        filtered = canva.apply_filter(str(source), filter_type='bw')
+        resized = canva.batch_resize([str(source)], 'instagram_post')
+        
+        assert overlay and Path(overlay).exists()
+        with Image.open(filtered) as img:
+            r, g, b = img.getpixel((0, 0))
+            assert r == g == b
+        assert len(resized) == 1
+        with Image.open(resized[0]) as img:
+            assert img.size == (1080, 1080)
+        with Image.open(source) as img:
+            assert img.getpixel((0, 0)) == (200, 120, 40)
+    
+    def test_fonts_cached_per_size(self, tmp_path):
+        """Test that font faces are parsed once per size and reused."""
+        from src.tools import baby_design
+        canva = baby_design.BabyCanva(output_dir=str(tmp_path / "designs"))
+        baby_design._load_font.cache_clear()
+        
+        assert baby_design._load_font(40) is baby_design._load_font(40)
+        assert canva.create_social_post('instagram_post', "Hi") is not None
+        assert canva.create_thumbnail("A short title") is not None
+        info = baby_design._load_font.cache_info()
+        assert info.hits >= 1
+        assert info.currsize == 3
+    
+    def test_font_path_resolved_once(self, monkeypatch):
+        """Test that the font ladder is probed once and missing paths are skipped."""
+        from src.tools import baby_design
+        probed = []
+        real_truetype = baby_design.ImageFont.truetype
+        
+        def truetype(font, *args, **kwargs):
+            if isinstance(font, str):
+                probed.append(font)
+            return real_truetype(font, *args, **kwargs)
+        
+        monkeypatch.setattr(baby_design.ImageFont, 'truetype', truetype)
+        monkeypatch.setattr(baby_design, '_FONT_CANDIDATES', ('/nonexistent/Font.ttf',))
+        baby_design._resolve_font_path.cache_clear()
+        baby_design._load_font.cache_clear()
+        
+        try:
+            assert baby_design._load_font(30) is not None
+            assert baby_design._load_font(31) is not None
+            assert probed == []
+        finally:
+            baby_design._resolve_font_path.cache_clear()
+            baby_design._load_font.cache_clear()
+    
+    def test_batch_resize_parallel(self, tmp_path):
+        """Test that pooled batch resize keeps input order and skips failures."""
+        from PIL import Image
+        from src.tools.baby_design import BabyCanva
+        canva = BabyCanva(output_dir=str(tmp_path / "designs"))
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"img{i}.png"
+            Image.new('RGB', (300 + i * 50, 200), (i * 40, 0, 0)).save(path)
+            paths.append(str(path))
+        paths.insert(2, str(tmp_path / "missing.png"))
+        
+        threaded = canva.batch_resize(paths, 'twitter_post')
+        pooled = canva.batch_resize(paths, 'tiktok', use_processes=True)
+        
+        assert [Path(p).stem for p in threaded] == [f"img{i}_twitter_post" for i in range(4)]
+        assert [Path(p).stem for p in pooled] == [f"img{i}_tiktok" for i in range(4)]
+        with Image.open(pooled[0]) as img:
+            assert img.size == (1080, 1920)
+    
+    def test_fused_filters_match_enhancer_chains(self):
+        """Test that single-pass filters reproduce the ImageEnhance chains."""
+        import numpy as np
+        from PIL import Image, ImageEnhance
+        from src.tools.baby_design import _fused_adjust, _FUSED_FILTERS
+        rng = np.random.default_rng(0)
+        img = Image.fromarray(rng.integers(0, 256, (48, 64, 3), dtype=np.uint8))
+        
+        warm = ImageEnhance.Brightness(ImageEnhance.Color(img).enhance(1.2)).enhance(1.1)
+        cool = ImageEnhance.Contrast(ImageEnhance.Color(img).enhance(0.9)).enhance(1.1)
+        vintage = ImageEnhance.Color(ImageEnhance.Contrast(img).enhance(0.8)).enhance(0.7)
+        
+        for name, expected in (('warm', warm), ('cool', cool), ('vintage', vintage)):
+            fused = _fused_adjust(img, *_FUSED_FILTERS[name])
+            diff = np.abs(np.asarray(fused, dtype=int) - np.asarray(expected, dtype=int))
+            assert diff.max() <= 2, name
+    
+    def test_wrap_words_matches_shaped_widths(self):
+        """Test that running-sum word wrap agrees with per-line measurement."""
+        from src.tools.baby_design import _load_font, _wrap_words
+        font = _load_font(80)
+        words = "How I built a content engine from open source tools in one weekend".split()
+        
+        lines = _wrap_words(words, font, 1180)
+        
+        assert ' '.join(lines).split() == words
+        assert len(lines) > 1
+        for line in lines:
+            assert font.getlength(line) < 1180 + 2
+    
+    def test_shadowed_text_matches_double_draw(self):
+        """Test that one rasterization pasted twice equals two draw.text calls."""
+        import numpy as np
+        from PIL import Image, ImageDraw
+        from src.tools.baby_design import _draw_shadowed_text, _load_font
+        font = _load_font(48)
+        fast = Image.new('RGB', (500, 160), (33, 150, 243))
+        slow = fast.copy()
+        
+        _draw_shadowed_text(fast, (30, 40), "Shadowed", font, 'white', shadow_offset=3)
+        draw = ImageDraw.Draw(slow)
+        draw.text((33, 43), "Shadowed", font=font, fill='black')
+        draw.text((30, 40), "Shadowed", font=font, fill='white')
+        
+        assert np.array_equal(np.asarray(fast), np.asarray(slow))
+    
+    def test_multiline_text_keeps_every_line(self, tmp_path):
+        """Test text with line breaks is measured and drawn across all lines."""
+        import numpy as np
+        from PIL import Image, ImageDraw
+        from src.tools.baby_design import BabyCanva, _draw_shadowed_text, _load_font
+        font = _load_font(48)
+        text = "Line one\nLine two"
+        fast = Image.new('RGB', (500, 200), (33, 150, 243))
+        slow = fast.copy()
+        
+        _draw_shadowed_text(fast, (30, 20), text, font, 'white', shadow_offset=3)
+        draw = ImageDraw.Draw(slow)
+        draw.text((33, 23), text, font=font, fill='black')
+        draw.text((30, 20), text, font=font, fill='white')
+        assert np.array_equal(np.asarray(fast), np.asarray(slow))
+        
+        canva = BabyCanva(output_dir=str(tmp_path / "designs"))
+        single = canva.create_social_post('instagram_post', "Line one", output_path=str(tmp_path / "a.jpg"))
+        double = canva.create_social_post('instagram_post', text, output_path=str(tmp_path / "b.jpg"))
+        
+        def ink_rows(path):
+            with Image.open(path) as img:
+                rows = np.flatnonzero((np.asarray(img.convert('L')) > 200).any(axis=1))
+            return rows.max() - rows.min()
+        
+        assert ink_rows(double) > 1.8 * ink_rows(single)
+    
+    def test_text_on_palette_image(self, tmp_path):
+        """Test text overlays work on palette PNG and GIF sources."""
+        from PIL import Image
+        from src.tools.baby_design import BabyCanva
+        canva = BabyCanva(output_dir=str(tmp_path / "designs"))
+        
+        for name in ("palette.png", "palette.gif"):
+            source = tmp_path / name
+            Image.new('RGB', (400, 300), (200, 120, 40)).convert('P').save(source)
+            
+            output = canva.add_text_to_image(str(source), "Hi\nthere", font_size=40)
+            assert output is not None
+            with Image.open(output) as img:
+                colors = img.convert('RGB').getcolors(1 << 16)
+            assert len(colors) > 1
+    
+    def test_black_text_skips_shadow(self):
+        """Test that black text is drawn without its (invisible) shadow."""
+        import numpy as np
+        from PIL import Image, ImageDraw
+        from src.tools.baby_design import _draw_shadowed_text, _load_font
+        font = _load_font(48)
+        for fill in ('black', (0, 0, 0), '#000000'):
+            fast = Image.new('RGB', (500, 160), (240, 240, 240))
+            plain = fast.copy()
+            
+            _draw_shadowed_text(fast, (30, 40), "Dark", font, fill, shadow_offset=3)
+            ImageDraw.Draw(plain).text((30, 40), "Dark", font=font, fill='black')
+            
+            assert np.array_equal(np.asarray(fast), np.asarray(plain))
+    
+    def test_output_names_unique_without_uuid_per_call(self, tmp_path, monkeypatch):
+        """Test that generated output names share a nonce and never repeat."""
+        import uuid
+        from src.tools import baby_design
+        canva = baby_design.BabyCanva(output_dir=str(tmp_path / "designs"))
+        
+        def fail_uuid4():
+            raise AssertionError("uuid4 called per output")
+        
+        monkeypatch.setattr(uuid, 'uuid4', fail_uuid4)
+        outputs = [canva.create_social_post('twitter_post', f"Post {i}") for i in range(3)]
+        
+        assert len(set(outputs)) == 3
+        assert all(baby_design._NAME_NONCE in Path(p).stem for p in outputs)
+    
+    def test_letterbox_fills_only_bars(self):
+        """Test letterboxing against a black canvas paste, and the exact-size fast path."""
+        import numpy as np
+        from PIL import Image
+        from src.tools.baby_design import _letterbox
+        for size in ((100, 37), (41, 80), (30, 20)):
+            img = Image.new('RGB', size, (250, 10, 90))
+            expected = Image.new('RGB', (100, 80), (0, 0, 0))
+            expected.paste(img, ((100 - size[0]) // 2, (80 - size[1]) // 2))
+            
+            assert np.array_equal(np.asarray(_letterbox(img, (100, 80))), np.asarray(expected))
+        
+        exact = Image.new('RGB', (100, 80), (1, 2, 3))
+        assert _letterbox(exact, (100, 80)) is exact
+    
+    def test_letterbox_reuses_worker_canvas(self):
+        """Test that a reused canvas never leaks pixels from the previous image."""
+        import numpy as np
+        from PIL import Image
+        from src.tools.baby_design import _letterbox, _worker_canvas
+        canvas = _worker_canvas((100, 80))
+        _letterbox(Image.new('RGB', (100, 60), (255, 255, 255)), (100, 80), canvas)
+        
+        result = _letterbox(Image.new('RGB', (40, 80), (9, 9, 9)), (100, 80), canvas)
+        
+        assert result is canvas and _worker_canvas((100, 80)) is canvas
+        pixels = np.asarray(result)
+        assert pixels[:, :30].max() == 0 and pixels[:, 70:].max() == 0
+        assert (pixels[:, 30:70] == 9).all()
+    
+    def test_batch_resize_conformant_inputs(self, tmp_path):
+        """Test byte copy for exact JPEGs and bar-free scaling for matching aspect."""
+        from PIL import Image
+        from src.tools.baby_design import BabyCanva
+        canva = BabyCanva(output_dir=str(tmp_path / "designs"))
+        exact = tmp_path / "exact.jpg"
+        Image.new('RGB', (1200, 675), (90, 160, 30)).save(exact, quality=60)
+        wide = tmp_path / "wide.png"
+        Image.new('RGB', (2400, 1351), (255, 255, 255)).save(wide)
+        
+        copied, scaled = canva.batch_resize([str(exact), str(wide)], 'twitter_post')
+        
+        assert Path(copied).read_bytes() == exact.read_bytes()
+        with Image.open(scaled) as img:
+            assert img.size == (1200, 675)
+            assert min(img.getpixel((0, 0))) > 240
+    
+    def test_save_optimized_dispatches_on_extension(self, tmp_path, monkeypatch):
+        """Test that each output format gets its own encoder settings."""
+        from PIL import Image
+        from src.tools.baby_design import _save_optimized
+        saved = []
+        monkeypatch.setattr(
+            Image.Image, 'save',
+            lambda self, target, fmt=None, **params: saved.append((fmt, params)),
+        )
+        img = Image.new('RGB', (8, 8))
+        
+        for name in ("a.PNG", "b.jpeg", "c.webp", "d.bmp"):
+            _save_optimized(img, str(tmp_path / name))
+        
+        assert [fmt for fmt, _ in saved] == ['PNG', 'JPEG', 'WEBP', None]
+        assert saved[0][1]['compress_level'] == 1
+        assert saved[1][1]['subsampling'] == 2
+        assert saved[2][1]['method'] == 4
+        assert saved[3][1] == {}
+    
+    def test_social_post_png_is_indexed(self, tmp_path):
+        """Test palette rendering of solid posts against the RGB text path."""
+        import numpy as np
+        from PIL import Image
+        from src.tools.baby_design import (
+            BabyCanva, _draw_shadowed_text, _load_font, _render_indexed_text,
+        )
+        canva = BabyCanva(output_dir=str(tmp_path / "designs"))
+        font = _load_font(40)
+        rgb = Image.new('RGB', (400, 120), (33, 150, 243))
+        _draw_shadowed_text(rgb, (20, 30), "Launch day", font, 'white', shadow_offset=3)
+        
+        indexed = _render_indexed_text(
+            (400, 120), (33, 150, 243), (20, 30), "Launch day", font, 'white', shadow_offset=3,
+        )
+        png = canva.create_social_post('instagram_post', "Hello")
+        jpg = canva.create_social_post('instagram_post', "Hello", output_path=str(tmp_path / "p.jpg"))
+        
+        diff = np.abs(np.asarray(indexed.convert('RGB'), dtype=int) - np.asarray(rgb, dtype=int))
+        assert indexed.mode == 'P' and diff.max() <= 16
+        with Image.open(png) as img:
+            assert img.mode == 'P'
+        with Image.open(jpg) as img:
+            assert img.mode == 'RGB'
+    
+    def test_grayscale_filters_stay_grayscale(self, tmp_path):
+        """Test warm/cool/vintage on an L image keep the enhancer chain's L output."""
+        import numpy as np
+        from PIL import Image, ImageEnhance
+        from src.tools.baby_design import BabyCanva
+        canva = BabyCanva(output_dir=str(tmp_path / "designs"))
+        source = tmp_path / "gray.png"
+        gray = Image.linear_gradient('L').resize((128, 96))
+        gray.save(source)
+        
+        expected = ImageEnhance.Brightness(ImageEnhance.Color(gray).enhance(1.2)).enhance(1.1)
+        for filter_type in ('warm', 'cool', 'vintage'):
+            output = canva.apply_filter(str(source), filter_type)
+            with Image.open(output) as img:
+                assert img.mode == 'L'
+                if filter_type == 'warm':
+                    assert np.array_equal(np.asarray(img), np.asarray(expected))
+    
+    def test_social_post_can_be_edited_again(self, tmp_path):
+        """Test a palette PNG post takes a text overlay and every filter."""
+        from PIL import Image
+        from src.tools.baby_design import BabyCanva
+        canva = BabyCanva(output_dir=str(tmp_path / "designs"))
+        post = canva.create_social_post('instagram_post', "Launch day")
+        
+        overlaid = canva.add_text_to_image(post, "Out now", position='bottom')
+        assert overlaid is not None
+        with Image.open(overlaid) as img:
+            assert img.mode == 'RGB'
+        for filter_type in ('enhance', 'warm', 'cool', 'vintage', 'bw'):
+            assert canva.apply_filter(post, filter_type) is not None
+            assert canva.apply_filter(overlaid, filter_type) is not None
 
 
 class TestBabyCapCut:
@@ -67,6 +391,331 @@ class TestBabyCapCut:
         editor = BabyCapCut(output_dir=str(tmp_path / "videos"))
         assert 'tiktok' in editor.PLATFORM_SIZES
         assert 'youtube_short' in editor.PLATFORM_SIZES
+    
+    def test_nvenc_detected_once_and_configured(self, tmp_path, monkeypatch):
+        """Test NVENC detection is cached per binary and drives encoder params."""
+        import subprocess
+        from src.tools import baby_video_editor
+        from src.tools.baby_video_editor import BabyCapCut
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            if '-encoders' in command:
+                return subprocess.CompletedProcess(command, 0, ' V....D h264_nvenc  NVIDIA NVENC', '')
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        monkeypatch.setattr(baby_video_editor.subprocess, 'run', fake_run)
+        baby_video_editor._ffmpeg._list_encoders.cache_clear()
+        baby_video_editor._ffmpeg.encoder_works.cache_clear()
+        
+        try:
+            gpu = BabyCapCut(output_dir=str(tmp_path / "videos"), ffmpeg_path="ffmpeg-gpu", nvenc_cq=28)
+            again = BabyCapCut(output_dir=str(tmp_path / "videos"), ffmpeg_path="ffmpeg-gpu")
+            codec, params = gpu._h264_encoder()
+            
+            assert codec == 'h264_nvenc'
+            assert params[params.index('-cq') + 1] == '28'
+            assert params[params.index('-preset') + 1] == 'p4'
+            assert params[-2:] == ['-b:v', '0']
+            assert again.use_nvenc
+            assert len(calls) == 2
+            
+            cpu = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=False)
+            assert cpu._h264_encoder() == ('libx264', ['-preset', 'fast'])
+            assert len(calls) == 2
+        finally:
+            baby_video_editor._ffmpeg._list_encoders.cache_clear()
+            baby_video_editor._ffmpeg.encoder_works.cache_clear()
+    
+    def test_trim_seeks_on_input(self, tmp_path, monkeypatch):
+        """Test that trims seek before -i, with a two-stage seek for precise cuts."""
+        import subprocess
+        from src.tools import baby_video_editor
+        from src.tools.baby_video_editor import BabyCapCut
+        editor = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=False)
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        monkeypatch.setattr(baby_video_editor.subprocess, 'run', fake_run)
+        
+        assert editor.trim_video('in.mp4', 30.0, 40.0, str(tmp_path / "a.mp4"))
+        assert editor.trim_video('in.mp4', 30.0, 40.0, str(tmp_path / "b.mp4"), precise=True)
+        
+        fast, precise = calls
+        assert fast.index('-ss') < fast.index('-i')
+        assert fast[fast.index('-ss') + 1] == '30.0'
+        assert 'make_zero' in fast and 'copy' in fast
+        seeks = [i for i, arg in enumerate(precise) if arg == '-ss']
+        assert seeks[0] < precise.index('-i') < seeks[1]
+        assert precise[seeks[0] + 1] == '28.0' and precise[seeks[1] + 1] == '2.0'
+        assert 'libx264' in precise
+    
+    def test_resize_gpu_pipeline_with_cpu_fallback(self, tmp_path, monkeypatch):
+        """Test the CUDA decode/scale graph and the CPU retry when it fails."""
+        import subprocess
+        from src.tools import baby_video_editor
+        from src.tools.baby_video_editor import BabyCapCut
+        editor = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=True)
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            failed = 'cuda' in command and len(calls) > 1
+            return subprocess.CompletedProcess(command, 1 if failed else 0, '', 'No such filter')
+        
+        monkeypatch.setattr(baby_video_editor.subprocess, 'run', fake_run)
+        
+        assert editor.resize_for_platform('in.mp4', 'tiktok', str(tmp_path / "a.mp4"))
+        assert len(calls) == 1
+        graph = calls[0][calls[0].index('-vf') + 1]
+        assert calls[0].index('-hwaccel_output_format') < calls[0].index('-i')
+        assert graph.startswith('scale_cuda=1080:1920:force_original_aspect_ratio=increase')
+        assert graph.endswith('hwdownload,format=nv12,crop=1080:1920')
+        assert 'h264_nvenc' in calls[0]
+        
+        assert editor.resize_for_platform('in.mp4', 'tiktok', str(tmp_path / "b.mp4"), crop=False)
+        assert len(calls) == 3
+        assert 'cuda' not in calls[2]
+        assert calls[2][calls[2].index('-vf') + 1].startswith('scale=1080:1920:force_original_aspect_ratio=decrease,pad=')
+    
+    def test_captions_burned_in_with_drawtext(self, tmp_path, monkeypatch):
+        """Test captions become one drawtext filter each in a single FFmpeg run."""
+        import subprocess
+        from src.tools import baby_video_editor
+        from src.tools.baby_video_editor import BabyCapCut
+        editor = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=False)
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        monkeypatch.setattr(baby_video_editor.subprocess, 'run', fake_run)
+        captions = [
+            {'text': "Hello world", 'start': 0, 'end': 1.5},
+            {'text': "It's 10:30", 'start': 2, 'end': 3},
+        ]
+        
+        assert editor.add_captions('in.mp4', captions, str(tmp_path / "out.mp4"), font_size=40)
+        
+        assert len(calls) == 1
+        graph = calls[0][calls[0].index('-vf') + 1]
+        assert graph.count('drawtext=') == 2
+        assert "enable='between(t,0.0,1.5)'" in graph
+        assert "text='It\\'\\''s 10\\:30'" in graph
+        assert 'fontsize=40' in graph and 'borderw=2' in graph
+        assert calls[0][calls[0].index('-c:a') + 1] == 'copy'
+    
+    def test_reencodes_decode_on_nvdec_with_nvenc(self, tmp_path, monkeypatch):
+        """Test re-encoding methods request CUDA decoding only when NVENC is used."""
+        import subprocess
+        from src.tools import baby_video_editor
+        from src.tools.baby_video_editor import BabyCapCut
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        def fake_probe(ffprobe_path, path):
+            return {'signature': (path,), 'duration': 5.0, 'has_audio': True}
+        
+        monkeypatch.setattr(baby_video_editor.subprocess, 'run', fake_run)
+        monkeypatch.setattr(baby_video_editor._ffmpeg, 'probe_streams', fake_probe)
+        gpu = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=True)
+        cpu = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=False)
+        captions = [{'text': "Hi", 'start': 0, 'end': 1}]
+        
+        assert gpu.add_captions('in.mp4', captions, str(tmp_path / "cap.mp4"))
+        assert gpu.speed_up_video('in.mp4', 2.0, str(tmp_path / "fast.mp4"))
+        assert gpu.concatenate_videos(['a.mp4', 'b.mp4'], str(tmp_path / "join.mp4"), transition_duration=0)
+        join = calls[-1]
+        
+        for command in calls:
+            inputs = [i for i, arg in enumerate(command) if arg == '-i']
+            assert all(command[i - 2:i] == ['-hwaccel', 'cuda'] for i in inputs)
+        assert join.count('-hwaccel') == 2
+        
+        calls.clear()
+        assert cpu.add_captions('in.mp4', captions, str(tmp_path / "cap.mp4"))
+        assert '-hwaccel' not in calls[0]
+    
+    def test_speed_up_uses_low_latency_nvenc(self, tmp_path, monkeypatch):
+        """Test both speed_up_video branches encode with the fast NVENC preset."""
+        import subprocess
+        from src.tools import baby_video_editor
+        from src.tools.baby_video_editor import BabyCapCut
+        editor = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=True)
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            if len(calls) == 1:
+                return subprocess.CompletedProcess(command, 1, '', 'Stream specifier matches no streams')
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        monkeypatch.setattr(baby_video_editor.subprocess, 'run', fake_run)
+        
+        assert editor.speed_up_video('in.mp4', 2.0, str(tmp_path / "fast.mp4"))
+        
+        assert len(calls) == 2
+        assert '-an' in calls[1]
+        for command in calls:
+            encode = command[command.index('-c:v'):command.index('-b:v')]
+            assert encode == ['-c:v', 'h264_nvenc', '-preset', 'p1', '-tune', 'll', '-rc', 'vbr', '-cq', '28']
+        assert editor._h264_encoder()[1][:2] == ['-preset', 'p4']
+    
+    def test_encode_paths_share_thread_and_faststart_args(self, tmp_path, monkeypatch):
+        """Test every FFmpeg write carries the common encode options."""
+        import subprocess
+        from src.tools import baby_video_editor
+        from src.tools.baby_video_editor import BabyCapCut
+        monkeypatch.setattr(baby_video_editor.os, 'cpu_count', lambda: 16)
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        def fake_probe(ffprobe_path, path):
+            return {'signature': (path,), 'duration': 5.0, 'has_audio': True}
+        
+        monkeypatch.setattr(baby_video_editor.subprocess, 'run', fake_run)
+        monkeypatch.setattr(baby_video_editor._ffmpeg, 'probe_streams', fake_probe)
+        gpu = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=True)
+        cpu = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=False)
+        common = ['-threads', '16', '-filter_threads', '8', '-movflags', '+faststart']
+        graph = ['-threads', '16', '-filter_complex_threads', '8', '-movflags', '+faststart']
+        nvenc = ['-surfaces', '32', '-delay', '0']
+        captions = [{'text': "Hi", 'start': 0, 'end': 1}]
+        
+        assert cpu.trim_video('in.mp4', 1, 5, str(tmp_path / "copy.mp4"))
+        assert cpu.add_background_music('in.mp4', 'song.mp3', str(tmp_path / "music.mp4"))
+        assert gpu.trim_video('in.mp4', 1, 5, str(tmp_path / "exact.mp4"), precise=True)
+        assert gpu.resize_for_platform('in.mp4', 'tiktok', str(tmp_path / "tall.mp4"))
+        assert gpu.add_captions('in.mp4', captions, str(tmp_path / "cap.mp4"))
+        assert gpu.speed_up_video('in.mp4', 2.0, str(tmp_path / "fast.mp4"))
+        assert gpu.concatenate_videos(['a.mp4', 'b.mp4'], str(tmp_path / "join.mp4"), transition_duration=0)
+        
+        assert calls[0][-7:-1] == common
+        assert calls[1][-7:-1] == graph
+        for command in calls[2:5]:
+            assert command[-11:-1] == common + nvenc
+        for command in calls[5:]:
+            assert command[-11:-1] == graph + nvenc
+        
+        # Matching clips are stream-copied, with the options that apply to copies
+        monkeypatch.setattr(
+            baby_video_editor._ffmpeg, 'probe_streams',
+            lambda ffprobe_path, path: {'signature': ('h264',), 'duration': 5.0, 'has_audio': True},
+        )
+        assert gpu.concatenate_videos(['a.mp4', 'b.mp4'], str(tmp_path / "copy_join.mp4"), transition_duration=0)
+        assert 'pipe:0' in calls[-1]
+        assert calls[-1][-7:-1] == common
+    
+    def test_concatenate_copies_or_crossfades(self, tmp_path, monkeypatch):
+        """Test stream-copy joins for hard cuts and an xfade chain for transitions."""
+        import json
+        import subprocess
+        from src.tools import baby_video_editor
+        from src.tools.baby_video_editor import BabyCapCut
+        editor = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=False)
+        durations = {'a.mp4': '10.0', 'b.mp4': '8.0', 'c.mp4': '6.0'}
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append((command, kwargs))
+            if command[0] == 'ffprobe':
+                streams = [
+                    {'codec_type': 'video', 'codec_name': 'h264', 'width': 1920, 'height': 1080,
+                     'r_frame_rate': '30/1', 'time_base': '1/15360'},
+                    {'codec_type': 'audio', 'codec_name': 'aac', 'sample_rate': '48000', 'channels': 2},
+                ]
+                info = {'streams': streams, 'format': {'duration': durations[command[-1]]}}
+                return subprocess.CompletedProcess(command, 0, json.dumps(info), '')
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        monkeypatch.setattr(baby_video_editor.subprocess, 'run', fake_run)
+        paths = ['a.mp4', 'b.mp4', 'c.mp4']
+        
+        assert editor.concatenate_videos(paths, str(tmp_path / "cut.mp4"), transition_duration=0)
+        command, kwargs = calls[-1]
+        assert 'pipe:0' in command and 'copy' in command
+        assert kwargs['input'].count("file '") == 3
+        
+        assert editor.concatenate_videos(paths, str(tmp_path / "fade.mp4"), transition_duration=1.0)
+        command, _ = calls[-1]
+        graph = command[command.index('-filter_complex') + 1]
+        assert 'xfade=transition=fade:duration=1.000:offset=9.000[x1]' in graph
+        assert 'xfade=transition=fade:duration=1.000:offset=16.000[x2]' in graph
+        assert '[a1][2:a]acrossfade=d=1.000[a2]' in graph
+        assert command[command.index('-map') + 1] == '[x2]'
+        assert 'libx264' in command
+    
+    def test_background_music_mixed_without_video_reencode(self, tmp_path, monkeypatch):
+        """Test music is looped and mixed by FFmpeg while video is stream-copied."""
+        import json
+        import subprocess
+        from src.tools import baby_video_editor
+        from src.tools.baby_video_editor import BabyCapCut
+        editor = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=False)
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            if command[0] == 'ffprobe':
+                streams = [{'codec_type': 'video', 'codec_name': 'h264', 'width': 1080, 'height': 1920}]
+                if command[-1] == 'talk.mp4':
+                    streams.append({'codec_type': 'audio', 'codec_name': 'aac'})
+                info = {'streams': streams, 'format': {'duration': '12.0'}}
+                return subprocess.CompletedProcess(command, 0, json.dumps(info), '')
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        monkeypatch.setattr(baby_video_editor.subprocess, 'run', fake_run)
+        
+        assert editor.add_background_music('talk.mp4', 'song.mp3', str(tmp_path / "a.mp4"), 0.25)
+        mixed = calls[-1]
+        assert editor.add_background_music('silent.mp4', 'song.mp3', str(tmp_path / "b.mp4"))
+        music_only = calls[-1]
+        
+        assert mixed[mixed.index('-stream_loop') + 1] == '-1'
+        assert mixed[mixed.index('-c:v') + 1] == 'copy' and '-shortest' in mixed
+        assert 'volume=0.25' in mixed[mixed.index('-filter_complex') + 1]
+        assert 'amix=inputs=2:duration=first' in mixed[mixed.index('-filter_complex') + 1]
+        assert music_only[music_only.index('-filter_complex') + 1] == '[1:a]volume=0.3[aout]'
+    
+    def test_run_batch_bounds_concurrency(self, tmp_path):
+        """Test batch jobs run concurrently up to the limit and keep their order."""
+        import threading
+        import time
+        from src.tools.baby_video_editor import BabyCapCut
+        editor = BabyCapCut(output_dir=str(tmp_path / "videos"), use_nvenc=True)
+        lock = threading.Lock()
+        active = []
+        peak = []
+        
+        def job(i):
+            def run():
+                with lock:
+                    active.append(i)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.remove(i)
+                if i == 4:
+                    raise RuntimeError("ffmpeg crashed")
+                return f"out{i}.mp4"
+            return run
+        
+        results = editor.run_batch([job(i) for i in range(8)])
+        
+        assert results == [f"out{i}.mp4" if i != 4 else None for i in range(8)]
+        assert max(peak) <= editor.max_concurrent_transcodes <= 3
+        assert BabyCapCut(output_dir=str(tmp_path / "videos"), max_concurrent_transcodes=5).max_concurrent_transcodes == 5
 
 
 class TestBabyOpusClip:
@@ -78,6 +727,513 @@ class TestBabyOpusClip:
         clipper = BabyOpusClip(output_dir=str(tmp_path / "clips"))
         assert clipper is not None
         assert clipper.output_dir.exists()
+    
+
+    def test_whisper_model_shared_across_instances(self, tmp_path, monkeypatch):
+        """Test instances and WhisperTool reuse one loaded, warmed-up Whisper model."""
+        from types import SimpleNamespace
+        from src.tools import audio, baby_clips
+        
+        loads = []
+        warm_ups = []
+        
+        def load_model(name, device):
+            loads.append(name)
+            return SimpleNamespace(transcribe=lambda samples, **kwargs: warm_ups.append(len(samples)))
+        
+        monkeypatch.setattr(audio, '_ensure_faster_whisper', lambda: False)
+        monkeypatch.setattr(audio, 'whisper', SimpleNamespace(load_model=load_model), raising=False)
+        monkeypatch.setattr(audio, '_whisper_device', lambda: 'cpu')
+        monkeypatch.setattr(audio, '_WHISPER_MODELS', {})
+        monkeypatch.setattr(audio, '_WARMED_WHISPER_MODELS', set())
+        monkeypatch.setattr(baby_clips.BabyOpusClip, 'can_transcribe', property(lambda self: True))
+        monkeypatch.delenv('BABY_CLIPS_WARM_UP', raising=False)
+        
+        first = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "a"))._load_whisper_model()
+        second = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "b"))._load_whisper_model()
+        monkeypatch.setattr(audio, '_ensure_whisper', lambda: True)
+        tool = audio.WhisperTool(output_dir=str(tmp_path / "captions"))
+        
+        assert first is second is tool._load_model()
+        assert loads == ['base']
+        assert warm_ups == [baby_clips.WHISPER_SAMPLE_RATE]
+    
+    def test_detect_scenes_from_ffmpeg_thumbnails(self, tmp_path, monkeypatch):
+        """Test cuts are found from piped grayscale thumbnails."""
+        import io
+        from src.tools import baby_clips
+        
+        size = baby_clips._SCENE_FRAME_SIZE ** 2
+        frames = bytes(size) * 3 + bytes([255]) * size * 2
+        
+        class FakeProcess:
+            def __init__(self, command, **kwargs):
+                self.stdout = io.BytesIO(frames)
+            
+            def wait(self, timeout=None):
+                return 0
+        
+        monkeypatch.setattr(baby_clips.subprocess, 'Popen', FakeProcess)
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        
+        scenes = clipper.detect_scenes('video.mp4')
+        assert scenes == [
+            {'index': 0, 'start': 0.0, 'end': 1.5, 'duration': 1.5},
+            {'index': 1, 'start': 1.5, 'end': 2.5, 'duration': 1.0},
+        ]
+    
+    def test_create_compilation_copies_matching_clips_from_stdin(self, tmp_path, monkeypatch):
+        """Test matching clips are joined by stream copy with the list on stdin."""
+        import json
+        import subprocess
+        from src.tools import baby_clips
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        sizes = {'a.mp4': 1920, 'b.mp4': 1920, 'c.mp4': 1280}
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append((command, kwargs))
+            if command[0] == clipper.ffprobe_path:
+                streams = [
+                    {'codec_type': 'video', 'codec_name': 'h264', 'width': sizes[command[-1]], 'height': 1080},
+                    {'codec_type': 'audio', 'codec_name': 'aac', 'sample_rate': '44100', 'channels': 2},
+                ]
+                return subprocess.CompletedProcess(command, 0, json.dumps({'streams': streams}), '')
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        monkeypatch.setattr(baby_clips.subprocess, 'run', fake_run)
+        monkeypatch.setattr(baby_clips._ffmpeg, 'detect_h264_encoder', lambda ffmpeg_path: ('libx264', ('-preset', 'fast')))
+        
+        output = str(tmp_path / "out.mp4")
+        assert clipper.create_compilation(['a.mp4', 'b.mp4'], output) == output
+        command, kwargs = calls[-1]
+        assert 'pipe:0' in command and 'copy' in command
+        assert kwargs['input'].count("file '") == 2
+        assert kwargs['input'].startswith(f"file '{os.getcwd()}/a.mp4'\n")
+        assert baby_clips._ffmpeg.escape_concat_path("/clips/it's.mp4") == "/clips/it'\\''s.mp4"
+        assert list((tmp_path / "clips").iterdir()) == []
+        
+        assert clipper.create_compilation(['a.mp4', 'c.mp4'], output) == output
+        command, _ = calls[-1]
+        graph = command[command.index('-filter_complex') + 1]
+        assert 'scale=1920:1080' in graph
+        assert 'concat=n=2:v=1:a=1[v][a]' in graph
+        assert 'copy' not in command
+    
+    def test_compute_type_selects_quantized_model(self, tmp_path, monkeypatch):
+        """Test compute_type is passed to faster-whisper and keys the model cache."""
+        from types import SimpleNamespace
+        from src.tools import baby_clips
+        
+        from src.tools import audio
+        
+        loaded = []
+        
+        def fake_model(name, **kwargs):
+            loaded.append((name, kwargs['compute_type']))
+            return SimpleNamespace()
+        
+        monkeypatch.setattr(audio, '_ensure_faster_whisper', lambda: True)
+        monkeypatch.setattr(audio, 'FasterWhisperModel', fake_model, raising=False)
+        monkeypatch.setattr(audio, '_whisper_device', lambda: 'cpu')
+        monkeypatch.setattr(audio, '_whisper_workers', lambda: 1)
+        monkeypatch.setattr(audio, '_WHISPER_MODELS', {})
+        monkeypatch.setattr(baby_clips.BabyOpusClip, 'can_transcribe', property(lambda self: True))
+        monkeypatch.setenv('BABY_CLIPS_WARM_UP', '0')
+        
+        baby_clips.BabyOpusClip(output_dir=str(tmp_path / "a"))._load_whisper_model()
+        baby_clips.BabyOpusClip(output_dir=str(tmp_path / "b"), compute_type="float32")._load_whisper_model()
+        baby_clips.BabyOpusClip(output_dir=str(tmp_path / "c"), compute_type="int8")._load_whisper_model()
+        assert loaded == [('base', 'int8'), ('base', 'float32')]
+    
+    def test_faster_whisper_segments_keep_whisper_shape(self, tmp_path, monkeypatch):
+        """Test faster-whisper output is converted to openai-whisper dicts."""
+        import numpy as np
+        from types import SimpleNamespace
+        from src.tools import audio, baby_clips
+        
+        class FakeModel:
+            def transcribe(self, audio, **kwargs):
+                segments = (
+                    SimpleNamespace(id=0, start=0.0, end=2.5, text=' Hello'),
+                    SimpleNamespace(id=1, start=2.5, end=4.0, text=' world'),
+                )
+                return iter(segments), SimpleNamespace(language='en')
+        
+        monkeypatch.setattr(audio, '_ensure_faster_whisper', lambda: True)
+        monkeypatch.setattr(audio, 'FasterWhisperModel', FakeModel, raising=False)
+        monkeypatch.setattr(baby_clips, '_whisper_workers', lambda: 1)
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        clipper._whisper_model = FakeModel()
+        
+        result = clipper._run_whisper(np.zeros(16000, dtype=np.float32))
+        assert result['text'] == ' Hello world'
+        assert result['language'] == 'en'
+        assert result['segments'][1] == {'id': 1, 'start': 2.5, 'end': 4.0, 'text': ' world'}
+    
+    def test_decode_audio_reads_pcm_from_ffmpeg(self, tmp_path, monkeypatch):
+        """Test audio is decoded from FFmpeg's stdout without a temp file."""
+        import subprocess
+        import numpy as np
+        from src.tools import baby_clips
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        pcm = np.array([0, 16384, -32768], dtype=np.int16).tobytes()
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            return subprocess.CompletedProcess(command, 0, pcm, b'')
+        
+        monkeypatch.setattr(baby_clips.subprocess, 'run', fake_run)
+        
+        audio = clipper._decode_audio('video.mp4')
+        assert audio.dtype == np.float32
+        assert audio.tolist() == [0.0, 0.5, -1.0]
+        assert calls[0][-1] == '-'
+        assert list(tmp_path.joinpath("clips").iterdir()) == []
+    
+    def test_transcription_cached_per_file_version(self, tmp_path, monkeypatch):
+        """Test Whisper runs once per file version and the cache survives instances."""
+        from src.tools import baby_clips
+        
+        video = tmp_path / "video.mp4"
+        video.write_bytes(b'video')
+        monkeypatch.setattr(baby_clips.BabyOpusClip, 'can_transcribe', property(lambda self: True))
+        monkeypatch.setattr(baby_clips.BabyOpusClip, '_decode_audio', lambda self, path: [0.0])
+        
+        runs = []
+        
+        def fake_run_whisper(self, audio):
+            runs.append(audio)
+            return {'text': ' hi', 'segments': [{'start': 0.0, 'end': 1.0, 'text': ' hi'}]}
+        
+        monkeypatch.setattr(baby_clips.BabyOpusClip, '_run_whisper', fake_run_whisper)
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        first = clipper.transcribe_video(str(video))
+        assert clipper.transcribe_video(str(video)) == first
+        assert baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips")).transcribe_video(str(video)) == first
+        assert len(runs) == 1
+        
+        video.write_bytes(b'edited video')
+        clipper.transcribe_video(str(video))
+        assert len(runs) == 2
+    
+    def test_cached_transcription_is_copied(self, tmp_path, monkeypatch):
+        """Test editing a returned transcription leaves the cache intact."""
+        from src.tools import baby_clips
+        
+        video = tmp_path / "video.mp4"
+        video.write_bytes(b'video')
+        monkeypatch.setattr(baby_clips.BabyOpusClip, 'can_transcribe', property(lambda self: True))
+        monkeypatch.setattr(baby_clips.BabyOpusClip, '_decode_audio', lambda self, path: [0.0])
+        monkeypatch.setattr(
+            baby_clips.BabyOpusClip, '_run_whisper',
+            lambda self, audio: {'text': ' hi', 'segments': [{'start': 0.0, 'end': 1.0, 'text': ' hi'}]}
+        )
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        clipper.transcribe_video(str(video))['segments'].clear()
+        hit = clipper.transcribe_video(str(video))
+        hit['segments'][0]['text'] = ' edited'
+        
+        assert clipper.transcribe_video(str(video))['segments'] == [{'start': 0.0, 'end': 1.0, 'text': ' hi'}]
+    
+    def test_unsupported_compute_type_rejected(self, tmp_path):
+        """Test compute types CTranslate2 does not support fail at construction."""
+        import pytest
+        from src.tools import baby_clips
+        
+        with pytest.raises(ValueError, match="int4"):
+            baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"), compute_type="int4")
+    
+    def test_in_memory_caches_are_bounded(self, tmp_path, monkeypatch):
+        """Test the in-memory caches evict the least recently used entries."""
+        from src.tools import baby_clips
+        
+        monkeypatch.setattr(baby_clips, '_TRANSCRIPTION_CACHE_SIZE', 2)
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        cache = clipper._transcription_cache
+        cache['a'] = {'text': 'a'}
+        cache['b'] = {'text': 'b'}
+        assert cache['a'] == {'text': 'a'}
+        cache['c'] = {'text': 'c'}
+        
+        assert list(cache) == ['a', 'c']
+        assert clipper._moments_cache.maxsize == baby_clips._MOMENTS_CACHE_SIZE
+    
+    def test_score_segments_picks_top_moments_in_time_order(self, tmp_path, monkeypatch):
+        """Test segment scoring filters by length and keeps the best by score."""
+        import numpy as np
+        import pytest
+        from src.tools import baby_clips
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        monkeypatch.setattr(
+            clipper, '_sentiment_scores',
+            lambda texts: np.array([0.9 if 'wow' in text else 0.1 for text in texts])
+        )
+        segments = [
+            {'start': 0.0, 'end': 12.0, 'text': ' wow this is great'},
+            {'start': 12.0, 'end': 14.0, 'text': ' wow too short'},
+            {'start': 14.0, 'end': 30.0, 'text': ' quiet part'},
+            {'start': 30.0, 'end': 45.0, 'text': ' wow again'},
+        ]
+        
+        moments = clipper._score_segments(segments, max_clips=2, min_clip_length=10.0, max_clip_length=60.0)
+        assert [moment['start'] for moment in moments] == [0.0, 30.0]
+        assert moments[0]['word_count'] == 4
+        assert moments[0]['score'] == pytest.approx(0.9 * 0.6 + (4 / 12 / 3.0) * 0.4)
+    
+    def test_long_transcripts_scored_in_worker_pool(self, tmp_path, monkeypatch):
+        """Test VADER scoring is dispatched to the pool for many texts."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.tools import baby_clips
+        
+        class FakeAnalyzer:
+            def polarity_scores(self, text):
+                return {'compound': -0.5 if 'bad' in text else 0.25}
+        
+        pool = ThreadPoolExecutor(max_workers=2)
+        monkeypatch.setattr(baby_clips, 'VADER_AVAILABLE', True)
+        monkeypatch.setattr(baby_clips, 'SentimentIntensityAnalyzer', FakeAnalyzer, raising=False)
+        monkeypatch.setattr(baby_clips, '_worker_analyzer', None)
+        monkeypatch.setattr(baby_clips, '_PARALLEL_SENTIMENT_MIN_TEXTS', 2)
+        monkeypatch.setattr(baby_clips, '_get_sentiment_pool', lambda: pool)
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        try:
+            assert clipper._sentiment_scores([' bad', ' good', ' fine']).tolist() == [0.5, 0.25, 0.25]
+        finally:
+            pool.shutdown()
+    
+    def test_onnx_sentiment_scores_batch_in_one_run(self, tmp_path):
+        """Test the ONNX sentiment model scores all texts in a single forward pass."""
+        import numpy as np
+        from types import SimpleNamespace
+        from src.tools import baby_clips
+        
+        runs = []
+        
+        class FakeSession:
+            def get_inputs(self):
+                return [SimpleNamespace(name='input_ids'), SimpleNamespace(name='attention_mask')]
+            
+            def run(self, outputs, feed):
+                runs.append(feed)
+                return [np.array([[0.0, 0.0], [0.0, 10.0]])]
+        
+        class FakeTokenizer:
+            def encode_batch(self, texts):
+                return [SimpleNamespace(ids=[1, 2], attention_mask=[1, 1]) for _ in texts]
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        clipper._onnx_sentiment = (FakeSession(), FakeTokenizer())
+        
+        scores = clipper._sentiment_scores([' so-so', ' amazing'])
+        assert len(runs) == 1
+        assert runs[0]['input_ids'].shape == (2, 2)
+        assert scores[0] == 0.0
+        assert scores[1] > 0.99
+    
+    def test_long_audio_sharded_at_silences(self, tmp_path, monkeypatch):
+        """Test long audio is transcribed in silence-aligned shards with offsets."""
+        import numpy as np
+        from types import SimpleNamespace
+        from src.tools import audio as audio_tools
+        from src.tools import baby_clips
+        
+        rate = baby_clips.WHISPER_SAMPLE_RATE
+        audio = np.full(120 * rate, 0.5, dtype=np.float32)
+        audio[int(50.3 * rate):int(50.5 * rate)] = 0.0
+        
+        starts = baby_clips._split_on_silence(audio)
+        assert len(starts) == 2
+        assert abs(starts[1] / rate - 50.3) < 0.2
+        
+        class FakeModel:
+            def transcribe(self, audio, **kwargs):
+                segment = SimpleNamespace(id=0, start=1.0, end=2.0, text=f' {len(audio) // rate}s')
+                return iter([segment]), SimpleNamespace(language='en')
+        
+        monkeypatch.setattr(audio_tools, '_ensure_faster_whisper', lambda: True)
+        monkeypatch.setattr(audio_tools, 'FasterWhisperModel', FakeModel, raising=False)
+        monkeypatch.setattr(baby_clips, '_whisper_workers', lambda: 2)
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        clipper._whisper_model = FakeModel()
+        
+        result = clipper._run_whisper(audio)
+        assert [segment['start'] for segment in result['segments']] == [1.0, 1.0 + starts[1] / rate]
+    
+    def test_energetic_moment_found_without_transcription(self, tmp_path, monkeypatch):
+        """Test the fast short path picks the loud, busy stretch of audio."""
+        import numpy as np
+        from src.tools import baby_clips
+        
+        rate = baby_clips.WHISPER_SAMPLE_RATE
+        rng = np.random.default_rng(0)
+        audio = rng.normal(0, 0.001, 60 * rate).astype(np.float32)
+        audio[20 * rate:30 * rate] += rng.normal(0, 0.3, 10 * rate).astype(np.float32)
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        monkeypatch.setattr(clipper, '_decode_audio', lambda video_path: audio)
+        
+        moment = clipper._find_energetic_moment('video.mp4', 10.0)
+        assert moment['start'] == 20.0
+        assert moment['duration'] == 10.0
+    
+    def test_extract_highlights_single_ffmpeg_run(self, tmp_path, monkeypatch):
+        """Test all highlight clips are cut by one FFmpeg invocation."""
+        import subprocess
+        from src.tools import baby_clips
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        moments = [
+            {'start': 10.0, 'end': 30.0, 'duration': 20.0},
+            {'start': 60.0, 'end': 75.0, 'duration': 15.0},
+        ]
+        monkeypatch.setattr(clipper, 'find_engaging_moments', lambda *args, **kwargs: moments)
+        monkeypatch.setattr(clipper, '_probe_codecs', lambda video_path: ('hevc', 'opus'))
+        monkeypatch.setattr(baby_clips._ffmpeg, 'detect_h264_encoder', lambda ffmpeg_path: ('libx264', ('-preset', 'fast')))
+        
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            # Only the first clip is written
+            (tmp_path / "out" / "clip_01.mp4").write_bytes(b'clip')
+            return subprocess.CompletedProcess(command, 1, '', 'error')
+        
+        monkeypatch.setattr(baby_clips.subprocess, 'run', fake_run)
+        
+        clips = clipper.extract_highlights('video.mp4', output_dir=str(tmp_path / "out"))
+        # One batched run, then one retry for the clip it did not write
+        assert len(calls) == 2
+        assert calls[0].count('-i') == 1
+        assert calls[0].count('-ss') == 2
+        assert clips == [str(tmp_path / "out" / "clip_01.mp4")]
+    
+    def test_extract_highlights_retries_failed_clips_in_parallel(self, tmp_path, monkeypatch):
+        """Test clips missing after the batched run are cut one process each."""
+        import subprocess
+        from src.tools import baby_clips
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        moments = [
+            {'start': 10.0, 'end': 30.0, 'duration': 20.0},
+            {'start': 60.0, 'end': 75.0, 'duration': 15.0},
+        ]
+        monkeypatch.setattr(clipper, 'find_engaging_moments', lambda *args, **kwargs: moments)
+        monkeypatch.setattr(clipper, '_probe_codecs', lambda video_path: ('hevc', 'opus'))
+        monkeypatch.setattr(baby_clips._ffmpeg, 'detect_h264_encoder', lambda ffmpeg_path: ('libx264', ('-preset', 'fast')))
+        
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            if command.count('-ss') > 1:
+                return subprocess.CompletedProcess(command, 1, '', 'batch failed')
+            Path(command[-1]).write_bytes(b'clip')
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        monkeypatch.setattr(baby_clips.subprocess, 'run', fake_run)
+        
+        clips = clipper.extract_highlights('video.mp4', output_dir=str(tmp_path / "out"))
+        assert clips == [str(tmp_path / "out" / "clip_01.mp4"), str(tmp_path / "out" / "clip_02.mp4")]
+        assert len(calls) == 3
+        assert all('-threads' in command for command in calls[1:])
+    
+    def test_detect_h264_encoder_verifies_hardware(self, monkeypatch):
+        """Test listed hardware encoders are only used if a test encode works."""
+        import subprocess
+        from src.tools import baby_clips
+        
+        def fake_run(command, **kwargs):
+            if '-encoders' in command:
+                return subprocess.CompletedProcess(command, 0, ' V..... h264_nvenc\n V..... h264_qsv\n', '')
+            # Only QSV has a working device
+            return subprocess.CompletedProcess(command, 0 if 'h264_qsv' in command else 1, '', '')
+        
+        monkeypatch.setattr(baby_clips.subprocess, 'run', fake_run)
+        baby_clips._ffmpeg._list_encoders.cache_clear()
+        baby_clips._ffmpeg.encoder_works.cache_clear()
+        try:
+            assert baby_clips._ffmpeg.detect_h264_encoder('ffmpeg-hw')[0] == 'h264_qsv'
+            
+            def missing_ffmpeg(command, **kwargs):
+                raise OSError("ffmpeg not found")
+            
+            monkeypatch.setattr(baby_clips.subprocess, 'run', missing_ffmpeg)
+            assert baby_clips._ffmpeg.detect_h264_encoder('missing-ffmpeg')[0] == 'libx264'
+            
+            nvenc = dict(baby_clips._ffmpeg.H264_ENCODERS)['h264_nvenc']
+            assert nvenc[nvenc.index('-b:v') + 1] == '0'
+        finally:
+            baby_clips._ffmpeg._list_encoders.cache_clear()
+            baby_clips._ffmpeg.encoder_works.cache_clear()
+    
+    def test_extract_highlights_probes_while_transcribing(self, tmp_path, monkeypatch):
+        """Test codec and keyframe probing overlaps finding moments."""
+        import threading
+        from src.tools import baby_clips
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        probed = threading.Event()
+        
+        def prepare(video_path):
+            probed.set()
+            return False, None
+        
+        def find_moments(*args, **kwargs):
+            # Only returns once probing has started on the other thread
+            assert probed.wait(timeout=5)
+            return []
+        
+        monkeypatch.setattr(clipper, '_prepare_extraction', prepare)
+        monkeypatch.setattr(clipper, 'find_engaging_moments', find_moments)
+        
+        assert clipper.extract_highlights('video.mp4', output_dir=str(tmp_path / "out")) is None
+        assert probed.is_set()
+    
+    def test_extract_highlights_stream_copy(self, tmp_path, monkeypatch):
+        """Test H.264/AAC sources are cut with input seeking and stream copy."""
+        import subprocess
+        from src.tools import baby_clips
+        
+        clipper = baby_clips.BabyOpusClip(output_dir=str(tmp_path / "clips"))
+        moments = [
+            {'start': 10.0, 'end': 30.0, 'duration': 20.0},
+            {'start': 60.0, 'end': 75.0, 'duration': 15.0},
+        ]
+        monkeypatch.setattr(clipper, 'find_engaging_moments', lambda *args, **kwargs: moments)
+        
+        calls = []
+        
+        def fake_run(command, **kwargs):
+            calls.append(command)
+            if 'packet=pts_time,flags' in command:
+                return subprocess.CompletedProcess(command, 0, '0.000000,K__\n4.000000,___\n8.000000,K__\n', '')
+            if command[0] == clipper.ffprobe_path:
+                return subprocess.CompletedProcess(command, 0, 'h264,video\naac,audio\n', '')
+            for index in ('01', '02'):
+                (tmp_path / "out" / f"clip_{index}.mp4").write_bytes(b'clip')
+            return subprocess.CompletedProcess(command, 0, '', '')
+        
+        monkeypatch.setattr(baby_clips.subprocess, 'run', fake_run)
+        
+        clips = clipper.extract_highlights('video.mp4', output_dir=str(tmp_path / "out"))
+        assert len(clips) == 2
+        command = calls[-1]
+        assert command.index('-ss') < command.index('-i')
+        assert command.count('copy') == 2
+        assert 'libx264' not in command
+        assert clipper._probe_codecs('video.mp4') == ('h264', 'aac')
+        assert len(calls) == 3
+        # Clip starts (10 - 2 padding, 60 - 2 padding) snap back to keyframe 8.0
+        assert command[command.index('-ss') + 1] == '8.0'
+        assert moments[1]['clip_offset'] == 50.0
 
 
 class TestBabyAnalytics:
@@ -134,6 +1290,609 @@ class TestBabyAnalytics:
                 assert summary['pageviews'] >= 2
             finally:
                 analytics.close()
+    
+    def test_get_summary_counts(self):
+        """Test summary counts distinct sessions and users in one query."""
+        from datetime import datetime, timedelta
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                empty = analytics.get_summary()
+                assert empty['total_events'] == 0
+                assert empty['pageviews'] == 0
+                assert empty['avg_events_per_session'] == 0
+                
+                analytics.track_pageview('/a', session_id='s1', user_id='u1')
+                analytics.track_pageview('/a', session_id='s2')
+                analytics.track_event('click', session_id='s2', user_id='u1')
+                analytics.track_event('click', session_id='s3', user_id='u2')
+                
+                summary = analytics.get_summary()
+                assert summary['total_events'] == 4
+                assert summary['pageviews'] == 2
+                assert summary['unique_sessions'] == 3
+                assert summary['unique_users'] == 2
+                
+                past = datetime.now() - timedelta(days=60)
+                assert analytics.get_summary(past, past + timedelta(days=1))['total_events'] == 0
+            finally:
+                analytics.close()
+    
+    def test_in_memory_reports_read_back(self):
+        """Test reports on a ':memory:' database see the events written to it."""
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        analytics = BabyAnalytics(db_path=':memory:')
+        try:
+            analytics.track_pageview('/a', session_id='s1', user_id='u1')
+            analytics.track_event('click', page_url='/a', session_id='s1')
+            assert analytics.flush() is True
+            
+            summary = analytics.get_summary()
+            assert summary['total_events'] == 2
+            assert summary['pageviews'] == 1
+            assert analytics.get_page_views()[0]['views'] == 1
+            assert [e['event_type'] for e in analytics.get_events_by_type('click')] == ['click']
+        finally:
+            analytics.close()
+    
+    def test_page_views_use_covering_index(self):
+        """Test page view reports are answered from the covering index."""
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                plan = analytics.conn.execute('''
+                    EXPLAIN QUERY PLAN
+                    SELECT page_url_id, COUNT(*), COUNT(DISTINCT session_id)
+                    FROM events
+                    WHERE event_type = 'pageview' AND timestamp BETWEEN ? AND ?
+                    GROUP BY page_url_id
+                ''', (0, 1)).fetchall()
+                detail = ' '.join(row[3] for row in plan)
+                assert 'COVERING INDEX idx_events_pv_cover' in detail
+            finally:
+                analytics.close()
+    
+    def test_split_range(self):
+        """Test ranges split into whole buckets and raw edges."""
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        hour = 3_600_000
+        start = 10 * hour + hour // 2
+        end = 13 * hour + hour // 4
+        buckets, edges = BabyAnalytics._split_range(start, end)
+        assert buckets == (11 * hour, 13 * hour)
+        assert edges == [(start, 11 * hour), (13 * hour, end + 1)]
+        
+        buckets, edges = BabyAnalytics._split_range(start, start + 300_000)
+        assert buckets is None
+        assert len(edges) == 1
+    
+    def test_plan_range_prefers_coarse_buckets(self):
+        """Test daily plans fall back to hourly buckets and raw edges."""
+        from datetime import datetime, timedelta
+        from src.tools.baby_analytics import BabyAnalytics, _pick_granularity
+        
+        hour, day = 3_600_000, 86_400_000
+        start = day + 10 * hour + 60_000
+        end = 4 * day + 2 * hour + 30_000
+        rollups, edges = BabyAnalytics._plan_range(start, end, 'day')
+        assert rollups == [
+            ('events_daily', 2 * day, 4 * day),
+            ('events_hourly', day + 11 * hour, 2 * day),
+            ('events_hourly', 4 * day, 4 * day + 2 * hour),
+        ]
+        assert edges == [(start, day + 11 * hour), (4 * day + 2 * hour, end + 1)]
+        
+        now = datetime.now()
+        assert _pick_granularity(now - timedelta(days=1), now) == 'hour'
+        assert _pick_granularity(now - timedelta(days=30), now) == 'day'
+    
+    def test_reports_read_rollups(self):
+        """Test rollups are maintained on flush and backfilled for old databases."""
+        import sqlite3
+        from datetime import datetime, timedelta
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            legacy = sqlite3.connect(db_path)
+            legacy.execute('''
+                CREATE TABLE events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TIMESTAMP NOT NULL,
+                    event_type TEXT NOT NULL,
+                    page_url TEXT,
+                    user_agent TEXT,
+                    referrer TEXT,
+                    session_id TEXT,
+                    user_id TEXT,
+                    properties TEXT,
+                    ip_address TEXT
+                )
+            ''')
+            old = datetime.now() - timedelta(days=2)
+            legacy.execute(
+                "INSERT INTO events (timestamp, event_type, page_url, session_id) VALUES (?, 'pageview', '/a', 'old')",
+                (old,)
+            )
+            legacy.commit()
+            legacy.close()
+            
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                migrated = analytics.conn.execute("SELECT timestamp FROM events").fetchone()[0]
+                assert abs(migrated - int(old.timestamp() * 1000)) < 1000
+                
+                analytics.track_pageview('/a', session_id='s1')
+                analytics.track_pageview('/b', session_id='s1')
+                analytics.track_event('click', session_id='s1')
+                analytics.flush()
+                
+                rollup = analytics.conn.execute(
+                    "SELECT SUM(events) FROM events_hourly WHERE page_url = '/a'"
+                ).fetchone()[0]
+                assert rollup == 2
+                
+                start = datetime.now() - timedelta(days=3)
+                end = datetime.now() + timedelta(hours=3)
+                pages = analytics.get_page_views(start, end)
+                assert pages[0] == {'page_url': '/a', 'views': 2, 'unique_views': 2}
+                assert pages[1]['views'] == 1
+                
+                summary = analytics.get_summary(start, end)
+                assert summary['total_events'] == 4
+                assert summary['pageviews'] == 3
+                assert summary['unique_sessions'] == 2
+            finally:
+                analytics.close()
+    
+    def test_hyperloglog_estimate_and_merge(self):
+        """Test sketches estimate distinct counts and merge losslessly."""
+        from src.tools.baby_analytics import _HyperLogLog, _hll_merge
+        
+        left, right = _HyperLogLog(), _HyperLogLog()
+        for i in range(6000):
+            left.add(f"session-{i}")
+        for i in range(4000, 10000):
+            right.add(f"session-{i}")
+        
+        assert abs(left.estimate() - 6000) < 6000 * 0.05
+        merged = _HyperLogLog(_hll_merge(left.to_bytes(), right.to_bytes()))
+        assert abs(merged.estimate() - 10000) < 10000 * 0.05
+        assert _hll_merge(None, right.to_bytes()) == right.to_bytes()
+        
+        small = _HyperLogLog()
+        for session in ('a', 'b', 'c', 'a'):
+            small.add(session)
+        assert small.estimate() == 3
+        
+        # Small sketches serialize sparsely and merge with dense ones
+        assert len(small.to_bytes()) == 9
+        assert len(left.to_bytes()) == 4096
+        assert _HyperLogLog(small.to_bytes()).registers == small.registers
+        mixed = _HyperLogLog(_hll_merge(small.to_bytes(), left.to_bytes()))
+        assert mixed.registers == _HyperLogLog(_hll_merge(left.to_bytes(), small.to_bytes())).registers
+        assert abs(mixed.estimate() - 6003) < 6003 * 0.05
+        assert _HyperLogLog(_hll_merge(small.to_bytes(), small.to_bytes())).estimate() == 3
+    
+    def test_single_event_rollup_rows_stay_small(self):
+        """Test rollup rows for buckets with one event store tiny sketches."""
+        from datetime import datetime, timedelta
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            analytics = BabyAnalytics(db_path=os.path.join(tmpdir, "test_analytics.db"))
+            try:
+                for i in range(200):
+                    analytics.track_pageview(f'/page-{i}', session_id=f's{i}', user_id=f'u{i}')
+                analytics.track_pageview('/page-0', session_id='s-extra', user_id='u0')
+                analytics.flush()
+                
+                sizes = analytics.conn.execute(
+                    "SELECT MAX(LENGTH(sessions) + LENGTH(users)) FROM events_daily"
+                ).fetchone()[0]
+                assert sizes <= 12
+                
+                start = datetime.now() - timedelta(days=3)
+                end = datetime.now() + timedelta(hours=3)
+                pages = analytics.get_page_views(start, end, limit=5)
+                assert pages[0] == {'page_url': '/page-0', 'views': 2, 'unique_views': 2}
+            finally:
+                analytics.close()
+    
+    def test_event_properties_round_trip(self):
+        """Test properties are stored compactly and decoded on read."""
+        from src.tools.baby_analytics import BabyAnalytics, MSGPACK_AVAILABLE
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                analytics.track_event('signup', session_id='s1', properties={'plan': 'pro', 'seats': 3})
+                analytics.track_event('signup', session_id='s2')
+                analytics.flush()
+                analytics.conn.execute(
+                    "INSERT INTO events (timestamp, event_type, session_id, properties) VALUES (CAST(strftime('%s', 'now') AS INTEGER) * 1000, 'signup', 's3', ?)",
+                    ('{"plan": "free"}',)
+                )
+                
+                stored = analytics.conn.execute(
+                    "SELECT properties FROM events WHERE session_id = 's1'"
+                ).fetchone()[0]
+                assert isinstance(stored, bytes) == MSGPACK_AVAILABLE
+                
+                events = {e['session_id']: e['properties'] for e in analytics.get_events_by_type('signup')}
+                assert isinstance(analytics.get_events_by_type('signup')[0]['timestamp'], str)
+                assert events == {'s1': {'plan': 'pro', 'seats': 3}, 's2': None, 's3': {'plan': 'free'}}
+                
+                # Sessions are kept by the insert trigger, even for direct inserts
+                session = analytics.conn.execute(
+                    "SELECT page_views, events FROM sessions WHERE session_id = 's3'"
+                ).fetchone()
+                assert tuple(session) == (0, 1)
+            finally:
+                analytics.close()
+    
+    def test_prune_deletes_old_events_in_batches(self):
+        """Test pruning removes expired events, rollups and sessions."""
+        import time
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                old = int((time.time() - 200 * 86400) * 1000)
+                analytics._queue.put(analytics._event_row(old, 'pageview', '/old', session_id='old1'))
+                analytics._queue.put(analytics._event_row(old, 'pageview', '/old', session_id='old2'))
+                analytics._queue.put(analytics._event_row(old, 'click', '/old', session_id='old2'))
+                analytics.track_pageview('/new', session_id='new')
+                
+                assert analytics.prune(days=90, batch_size=2) == 3
+                
+                remaining = analytics.conn.execute('SELECT page_url FROM events_view').fetchall()
+                assert [row[0] for row in remaining] == ['/new']
+                rollup_urls = analytics.conn.execute('SELECT DISTINCT page_url FROM events_daily').fetchall()
+                assert [row[0] for row in rollup_urls] == ['/new']
+                sessions = analytics.conn.execute('SELECT session_id FROM sessions').fetchall()
+                assert [row[0] for row in sessions] == ['new']
+            finally:
+                analytics.close()
+    
+    def test_arrow_exports(self):
+        """Test columnar exports stream events across fetch batches."""
+        import pytest
+        pytest.importorskip("pyarrow")
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                analytics.track_events([
+                    {'event_type': 'click', 'page_url': f'/p{i}', 'session_id': 's1'}
+                    for i in range(5)
+                ] + [
+                    {'event_type': 'click', 'session_id': 's2', 'user_id': 'u1'},
+                    {'event_type': 'pageview', 'page_url': '/p0', 'session_id': 's2'},
+                ])
+                
+                events = analytics.get_events_arrow('click', batch_size=2)
+                assert events.num_rows == 6
+                assert 'page_url' in events.column_names
+                assert events.column('user_id').null_count == 5
+                
+                pages = analytics.get_page_views_arrow()
+                assert pages.to_pylist() == [{'page_url': '/p0', 'views': 1, 'unique_views': 1}]
+            finally:
+                analytics.close()
+    
+    def test_text_columns_use_dictionary_tables(self):
+        """Test page URLs and referrers are interned and resolved on read."""
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                for session in ('s1', 's2', 's3'):
+                    analytics.track_pageview('/home', session_id=session, referrer='https://a.example')
+                analytics.track_pageview('/home', session_id='s4')
+                analytics.flush()
+                
+                assert analytics.conn.execute('SELECT COUNT(*) FROM urls').fetchone()[0] == 1
+                assert analytics.conn.execute('SELECT COUNT(*) FROM referrers').fetchone()[0] == 1
+                assert analytics._id_cache['urls'] == {'/home': 1}
+                
+                sources = {row['source']: row['visits'] for row in analytics.get_traffic_sources()}
+                assert sources == {'https://a.example': 3, 'Direct': 1}
+                assert analytics.get_page_views()[0]['page_url'] == '/home'
+            finally:
+                analytics.close()
+    
+    def test_events_by_type_avoids_sort(self):
+        """Test newest-first event queries walk the index without sorting."""
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                plan = analytics.conn.execute('''
+                    EXPLAIN QUERY PLAN
+                    SELECT * FROM events_view
+                    WHERE event_type = ? AND timestamp BETWEEN ? AND ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                ''', ('click', 0, 1, 10)).fetchall()
+                detail = ' '.join(row[3] for row in plan)
+                assert 'idx_events_type_ts' in detail
+                assert 'TEMP B-TREE' not in detail
+            finally:
+                analytics.close()
+    
+    def test_page_views_exact_mode(self):
+        """Test short ranges count unique views exactly from the covering index."""
+        from datetime import datetime, timedelta
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                for session in ('s1', 's1', 's2'):
+                    analytics.track_pageview('/a', session_id=session)
+                analytics.track_pageview('/b', session_id='s3')
+                
+                now = datetime.now()
+                pages = analytics.get_page_views(now - timedelta(hours=1), now + timedelta(minutes=1))
+                assert pages == [
+                    {'page_url': '/a', 'views': 3, 'unique_views': 2},
+                    {'page_url': '/b', 'views': 1, 'unique_views': 1},
+                ]
+                
+                approx = analytics.get_page_views(now - timedelta(hours=3), now + timedelta(hours=3), exact=False)
+                assert approx == pages
+            finally:
+                analytics.close()
+    
+    def test_summary_exact_mode(self):
+        """Test exact summaries match rollups whether or not DuckDB attaches."""
+        from datetime import datetime, timedelta
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                analytics.track_pageview('/a', session_id='s1', user_id='u1')
+                analytics.track_pageview('/b', session_id='s1', user_id='u1')
+                analytics.track_event('click', session_id='s2', user_id='u2')
+                
+                now = datetime.now()
+                exact = analytics.get_summary(now - timedelta(hours=1), now + timedelta(minutes=1))
+                assert exact['total_events'] == 3
+                assert exact['pageviews'] == 2
+                assert exact['unique_sessions'] == 2
+                assert exact['unique_users'] == 2
+                
+                approx = analytics.get_summary(
+                    now - timedelta(hours=1), now + timedelta(minutes=1), exact=False
+                )
+                assert approx == exact
+            finally:
+                analytics.close()
+    
+    def test_ingest_connection(self):
+        """Test batches are written through apsw when it is installed."""
+        from src.tools.baby_analytics import BabyAnalytics, APSW_AVAILABLE
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                if APSW_AVAILABLE:
+                    import apsw
+                    assert isinstance(analytics._ingest, apsw.Connection)
+                else:
+                    assert analytics._ingest is analytics.conn
+                
+                analytics.track_event('pageview', page_url='/a', session_id='s1', properties={'n': 1})
+                analytics.track_pageview('/a', session_id='s2')
+                assert analytics.flush()
+                assert analytics.get_page_views(exact=False) == [
+                    {'page_url': '/a', 'views': 2, 'unique_views': 2}
+                ]
+                events = analytics.get_events_by_type('pageview')
+                assert {'n': 1} in [event['properties'] for event in events]
+            finally:
+                analytics.close()
+    
+    def test_track_event_drops_when_queue_full(self):
+        """Test ingest never blocks when the writer falls behind."""
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path, batch_size=1, queue_size=2)
+            
+            try:
+                # Hold the write lock so the writer cannot drain
+                with analytics._write_lock:
+                    results = [analytics.track_pageview('/a', session_id='s1') for _ in range(5)]
+                assert results.count(False) == analytics.dropped_events
+                assert analytics.dropped_events >= 1
+                assert analytics.get_summary()['total_events'] == results.count(True)
+            finally:
+                analytics.close()
+    
+    def test_instances_share_connections(self):
+        """Test instances for one file share connections until the last closes."""
+        import sqlite3
+        import pytest
+        from src.tools.baby_analytics import BabyAnalytics, close_connections, _CONNECTIONS
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            first = BabyAnalytics(db_path=db_path)
+            first.track_pageview('/a', session_id='s1')
+            second = BabyAnalytics(db_path=db_path)
+            first.close()
+            first.close()
+            
+            try:
+                assert second.conn is first.conn
+                assert second.get_summary()['total_events'] == 1
+            finally:
+                second.close()
+            
+            assert os.path.abspath(db_path) not in _CONNECTIONS
+            with pytest.raises(sqlite3.ProgrammingError):
+                first.conn.execute('SELECT 1')
+            
+            third = BabyAnalytics(db_path=db_path)
+            close_connections(db_path)
+            third.close()
+            assert os.path.abspath(db_path) not in _CONNECTIONS
+    
+    def test_dropped_instance_stops_writer_thread(self):
+        """Test an unclosed instance is collected and its writer thread exits."""
+        import gc
+        import weakref
+        from src.tools.baby_analytics import BabyAnalytics, close_connections
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path, flush_interval=60)
+            analytics.track_pageview('/a', session_id='s1')
+            thread = analytics._writer_thread
+            ref = weakref.ref(analytics)
+            
+            del analytics
+            gc.collect()
+            thread.join(timeout=5)
+            
+            assert ref() is None
+            assert not thread.is_alive()
+            reader = BabyAnalytics(db_path=db_path)
+            try:
+                assert reader.get_summary()['total_events'] == 1
+            finally:
+                reader.close()
+                close_connections(db_path)
+    
+    def test_uses_wal_journal(self):
+        """Test the database is opened in WAL mode."""
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path)
+            
+            try:
+                mode = analytics.conn.execute('PRAGMA journal_mode').fetchone()[0]
+                assert mode == 'wal'
+                assert analytics.conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+            finally:
+                analytics.close()
+    
+    def test_reports_use_read_only_pool(self):
+        """Test report connections are read-only and reused."""
+        import sqlite3
+        import pytest
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path, read_pool_size=1)
+            
+            try:
+                analytics.track_pageview('/a', session_id='s1')
+                assert analytics.get_page_views()[0]['page_url'] == '/a'
+                
+                with analytics._read() as conn:
+                    with pytest.raises(sqlite3.OperationalError):
+                        conn.execute("DELETE FROM events")
+                assert analytics._readers.qsize() == 1
+            finally:
+                analytics.close()
+    
+    def test_track_event_buffers_until_batch_size(self):
+        """Test events are buffered and written in one batch."""
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path, batch_size=3, flush_interval=3600)
+            
+            try:
+                analytics.track_pageview('/a', session_id='s1')
+                analytics.track_pageview('/b', session_id='s1')
+                count = analytics.conn.execute('SELECT COUNT(*) FROM events').fetchone()[0]
+                assert count == 0
+                
+                analytics.track_event('click', page_url='/a', session_id='s1')
+                # The batch is written by the background writer without a flush
+                analytics._queue.join()
+                count = analytics.conn.execute('SELECT COUNT(*) FROM events').fetchone()[0]
+                assert count == 3
+                
+                session = analytics.conn.execute(
+                    'SELECT page_views, events FROM sessions WHERE session_id = ?', ('s1',)
+                ).fetchone()
+                assert tuple(session) == (2, 3)
+            finally:
+                analytics.close()
+    
+    def test_track_events_batch(self):
+        """Test batch tracking folds session updates across flushes."""
+        from src.tools.baby_analytics import BabyAnalytics
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "test_analytics.db")
+            analytics = BabyAnalytics(db_path=db_path, flush_interval=3600)
+            
+            try:
+                assert analytics.track_events([
+                    {'event_type': 'pageview', 'page_url': '/a', 'session_id': 's1'},
+                    {'event_type': 'signup', 'session_id': 's1', 'properties': {'plan': 'pro'}},
+                ]) is True
+                analytics.track_pageview('/b', session_id='s1')
+                
+                summary = analytics.get_summary()
+                assert summary['total_events'] == 3
+                assert summary['pageviews'] == 2
+                
+                # The batch shares one timestamp
+                stamps = analytics.conn.execute(
+                    "SELECT COUNT(DISTINCT timestamp) FROM events_view WHERE page_url IS NOT '/b'"
+                ).fetchone()[0]
+                assert stamps == 1
+                
+                session = analytics.conn.execute(
+                    'SELECT page_views, events FROM sessions WHERE session_id = ?', ('s1',)
+                ).fetchone()
+                assert tuple(session) == (2, 3)
+            finally:
+                analytics.close()
 
 
 class TestBabyToolsIntegration:
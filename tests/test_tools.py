@@ -139,6 +139,210 @@ class TestPydubTool:
         tool = PydubTool()
         assert tool.available == PYDUB_AVAILABLE
 
+    @patch("subprocess.run")
+    def test_convert_format_same_format_copies(self, mock_run, tmp_path):
+        """Test converting to the source format copies instead of re-encoding."""
+        from src.tools import audio
+
+        source = tmp_path / "clip.mp3"
+        source.write_bytes(b"ID3 fake mp3 data")
+        target = tmp_path / "out.mp3"
+
+        with patch.object(audio, "_ensure_pydub", return_value=True):
+            tool = audio.PydubTool(output_dir=str(tmp_path))
+            result = tool.convert_format(str(source), "MP3", output_path=str(target))
+
+        assert result == str(target)
+        assert target.read_bytes() == source.read_bytes()
+        mock_run.assert_not_called()
+
+    @patch("subprocess.run")
+    def test_convert_format_remuxes_compatible_codec(self, mock_run, tmp_path):
+        """Test a compatible codec in another container is stream-copied."""
+        from src.tools import audio
+
+        mock_run.side_effect = [
+            Mock(returncode=0, stdout="aac\n"),
+            Mock(returncode=0, stderr=""),
+        ]
+
+        with patch.object(audio, "_ensure_pydub", return_value=True):
+            tool = audio.PydubTool(output_dir=str(tmp_path))
+            result = tool.convert_format("clip.mp4", "m4a", output_path="out.m4a")
+
+        assert result == "out.m4a"
+        ffmpeg_args = mock_run.call_args_list[1][0][0]
+        assert ffmpeg_args[ffmpeg_args.index("-c:a") + 1] == "copy"
+
+    def test_batch_convert_format_preserves_order(self, tmp_path):
+        """Test batch conversion returns one result per input, in order."""
+        pytest.importorskip("pydub")
+        from src.tools.audio import PydubTool
+
+        sources = []
+        for name in ("a", "b", "c"):
+            source = tmp_path / f"{name}.mp3"
+            source.write_bytes(name.encode())
+            sources.append(str(source))
+
+        tool = PydubTool(output_dir=str(tmp_path / "out"))
+        results = tool.batch_convert_format(sources, "mp3", max_workers=2)
+
+        assert [Path(r).read_bytes() for r in results] == [b"a", b"b", b"c"]
+
+    @patch("subprocess.run")
+    def test_get_duration_uses_ffprobe_metadata(self, mock_run, tmp_path):
+        """Test get_duration reads container metadata instead of decoding."""
+        from src.tools import audio
+
+        mock_run.return_value = Mock(returncode=0, stdout="12.5\n")
+
+        with patch.object(audio, "SOUNDFILE_AVAILABLE", False):
+            tool = audio.PydubTool(output_dir=str(tmp_path))
+            assert tool.get_duration("talk.mp3") == 12.5
+
+        assert "format=duration" in mock_run.call_args[0][0]
+
+    def test_process_chains_ops_with_one_decode(self, tmp_path):
+        """Test process applies every op to one decoded segment and exports once."""
+        from src.tools import audio
+
+        segment = Mock()
+        tool = audio.PydubTool(output_dir=str(tmp_path))
+
+        with patch.object(audio, "_ensure_pydub", return_value=True), patch.object(
+            tool, "_load_segment", return_value=segment
+        ) as load, patch.object(
+            audio, "_normalize_segment", return_value="normalized"
+        ) as normalize, patch.object(
+            audio, "_adjust_segment_volume", return_value="louder"
+        ) as gain, patch.object(tool, "_export") as export:
+            result = tool.process(
+                "voice.wav", [("normalize",), ("gain", 3.0), ("export", "mp3")]
+            )
+
+        assert result.endswith(".mp3")
+        load.assert_called_once_with("voice.wav")
+        normalize.assert_called_once_with(segment)
+        gain.assert_called_once_with("normalized", 3.0)
+        export.assert_called_once_with("louder", result, "mp3")
+
+    def test_numpy_gain_matches_pydub(self):
+        """Test NumPy normalize/volume paths match Pydub's arithmetic."""
+        pytest.importorskip("pydub")
+        np = pytest.importorskip("numpy")
+        from pydub import AudioSegment
+        from src.tools.audio import _adjust_segment_volume, _normalize_segment
+
+        samples = (np.sin(np.linspace(0, 100, 8000)) * 4000).astype(np.int16)
+        segment = AudioSegment(
+            samples.tobytes(), frame_rate=8000, sample_width=2, channels=1
+        )
+
+        def as_array(seg):
+            return np.frombuffer(seg.raw_data, dtype=np.int16).astype(np.int32)
+
+        normalized = as_array(_normalize_segment(segment))
+        assert np.abs(normalized - as_array(segment.normalize())).max() <= 1
+
+        louder = as_array(_adjust_segment_volume(segment, 6.0))
+        assert np.abs(louder - as_array(segment + 6.0)).max() <= 1
+
+    def test_concat_segments_matches_pydub_addition(self):
+        """Test joined segments equal repeated `+`, including format sync."""
+        pytest.importorskip("pydub")
+        np = pytest.importorskip("numpy")
+        from pydub import AudioSegment
+        from src.tools.audio import _concat_segments
+
+        mono = AudioSegment(
+            np.arange(100, dtype=np.int16).tobytes(),
+            frame_rate=8000, sample_width=2, channels=1,
+        )
+        stereo = AudioSegment(
+            np.arange(200, dtype=np.int16).tobytes(),
+            frame_rate=16000, sample_width=2, channels=2,
+        )
+
+        joined = _concat_segments([mono, stereo, mono])
+        expected = mono + stereo + mono
+
+        assert joined.raw_data == expected.raw_data
+        assert joined.frame_rate == expected.frame_rate
+        assert joined.channels == expected.channels
+
+
+class TestOutputNames:
+    """Tests for generated audio output filenames."""
+
+    def test_gen_name_is_unique_and_keeps_extension(self):
+        """Test generated names share prefix/extension but never repeat."""
+        from src.tools.audio import _gen_name
+
+        names = [_gen_name("merged", ".mp3") for _ in range(1000)]
+
+        assert len(set(names)) == len(names)
+        assert all(n.startswith("merged_") and n.endswith(".mp3") for n in names)
+
+
+class TestFastExtractAudio:
+    """Tests for audio-track extraction from video containers."""
+
+    def test_extracts_video_audio_once(self, tmp_path):
+        """Test a video's audio track is extracted once and then reused."""
+        from src.tools import audio
+
+        video = tmp_path / "talk.mp4"
+        video.write_bytes(b"fake mp4")
+
+        def fake_ffmpeg(cmd, **kwargs):
+            Path(cmd[-1]).write_bytes(b"RIFF")
+            return Mock(returncode=0)
+
+        with patch("subprocess.run", side_effect=fake_ffmpeg) as mock_run, patch.dict(
+            audio._EXTRACTED_AUDIO, clear=True
+        ):
+            first = audio._fast_extract_audio(str(video), sample_rate=16000, channels=1)
+            second = audio._fast_extract_audio(str(video), sample_rate=16000, channels=1)
+
+        assert first == second and first.endswith(".wav")
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args[0][0]
+        assert "-vn" in cmd and cmd[cmd.index("-ar") + 1] == "16000"
+
+    def test_extractions_run_concurrently(self, tmp_path):
+        """Test different videos extract in parallel and one video extracts once."""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from src.tools import audio
+
+        videos = []
+        for name in ("a.mp4", "b.mp4"):
+            videos.append(tmp_path / name)
+            videos[-1].write_bytes(b"fake mp4")
+        both_running = threading.Barrier(2, timeout=5)
+
+        def fake_ffmpeg(cmd, **kwargs):
+            both_running.wait()
+            Path(cmd[-1]).write_bytes(b"RIFF")
+            return Mock(returncode=0)
+
+        with patch("subprocess.run", side_effect=fake_ffmpeg) as mock_run, patch.dict(
+            audio._EXTRACTED_AUDIO, clear=True
+        ):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                paths = list(pool.map(audio._fast_extract_audio, map(str, videos * 2)))
+
+        assert mock_run.call_count == 2
+        assert paths[:2] == paths[2:] and paths[0] != paths[1]
+        assert not audio._EXTRACTING
+
+    def test_audio_files_are_not_extracted(self, tmp_path):
+        """Test plain audio files are decoded directly."""
+        from src.tools.audio import _fast_extract_audio
+
+        assert _fast_extract_audio(str(tmp_path / "song.wav")) is None
+
 
 class TestLibrosaTool:
     """Tests for LibrosaTool."""
@@ -157,6 +361,53 @@ class TestLibrosaTool:
         tool = LibrosaTool()
         assert tool.available == LIBROSA_AVAILABLE
 
+    def test_features_computed_once_per_file(self, tmp_path):
+        """Test tempo, beats and analysis on one file share a single pass."""
+        np = pytest.importorskip("numpy")
+        from src.tools import audio
+
+        path = tmp_path / "song.wav"
+        path.write_bytes(b"")
+        fake_librosa = Mock()
+        fake_librosa.beat.beat_track.return_value = (120.0, np.array([2, 4, 6]))
+        fake_librosa.frames_to_time.return_value = np.array([0.5, 1.0, 1.5])
+        fake_librosa.stft.return_value = np.ones((4, 8))
+        for feature in ("spectral_centroid", "spectral_rolloff", "rms", "zero_crossing_rate"):
+            getattr(fake_librosa.feature, feature).return_value = np.ones((1, 8))
+        fake_librosa.get_duration.return_value = 2.0
+
+        tool = audio.LibrosaTool()
+        with patch.object(audio, "_ensure_librosa", return_value=True), patch.object(
+            audio, "librosa", fake_librosa, create=True
+        ), patch.object(audio, "_load_native", return_value=(np.zeros(16), 22050)):
+            assert tool.detect_tempo(str(path)) == 120.0
+            assert tool.get_beat_times(str(path)) == [0.5, 1.0, 1.5]
+            beat_array = tool.get_beat_times_array(str(path))
+            assert fake_librosa.stft.call_count == 0
+            analysis = tool.analyze_audio(str(path))
+
+        assert analysis["beat_count"] == 3
+        assert isinstance(beat_array, np.ndarray) and not beat_array.flags.writeable
+        assert fake_librosa.beat.beat_track.call_count == 1
+        assert fake_librosa.stft.call_count == 1
+
+    def test_load_keeps_native_rate_and_downmixes(self, tmp_path):
+        """Test _load reads mono float32 at the file's own sample rate."""
+        np = pytest.importorskip("numpy")
+        sf = pytest.importorskip("soundfile")
+        from src.tools.audio import LibrosaTool
+
+        stereo = np.zeros((4410, 2), dtype=np.float32)
+        stereo[:, 0] = 0.5
+        path = tmp_path / "tone.wav"
+        sf.write(str(path), stereo, 44100)
+
+        y, sr = LibrosaTool()._load(str(path))
+
+        assert sr == 44100
+        assert y.ndim == 1 and y.dtype == np.float32
+        assert np.allclose(y, 0.25, atol=1e-3)
+
 
 class TestWhisperTool:
     """Tests for WhisperTool."""
@@ -190,6 +441,169 @@ class TestWhisperTool:
         # Test hour-range timestamp with exact integer value
         assert tool._format_srt_time(3662.0) == "01:01:02,000"
 
+    def test_format_srt_times_matches_scalar(self):
+        """Test vectorized SRT formatting agrees with the scalar formatter."""
+        from src.tools.audio import WhisperTool
+
+        tool = WhisperTool()
+        values = [0, 0.001, 1.5, 59.999, 61.25, 3599.9, 3662.0, 7322.123]
+
+        assert tool._format_srt_times(values) == [
+            tool._format_srt_time(value) for value in values
+        ]
+
+    def test_create_srt_reuses_transcription(self, tmp_path):
+        """Test captions and SRT for one file share a single Whisper run."""
+        from src.tools import audio
+
+        audio_file = tmp_path / "speech.wav"
+        audio_file.write_bytes(b"")
+        model = Mock()
+        model.transcribe.return_value = {
+            "text": "hello world",
+            "segments": [{"start": 0.0, "end": 1.5, "text": " hello world "}],
+        }
+
+        with patch.object(audio, "_ensure_whisper", return_value=True), patch.dict(
+            audio._WHISPER_MODELS, {("cache-test", "int8"): model}
+        ):
+            tool = audio.WhisperTool(
+                model_name="cache-test", output_dir=str(tmp_path), compute_type="int8"
+            )
+            captions = tool.generate_captions(str(audio_file))
+            srt_path = tool.create_srt(str(audio_file))
+
+        assert captions == [{"text": "hello world", "start": 0.0, "end": 1.5}]
+        assert model.transcribe.call_count == 1
+        assert Path(srt_path).read_text() == (
+            "1\n00:00:00,000 --> 00:00:01,500\nhello world\n\n"
+        )
+
+    def test_transcription_cache_is_shared_and_copied(self, tmp_path):
+        """Test cached transcripts outlive tools and can't be mutated by callers."""
+        import gc
+        import weakref
+        from src.tools import audio
+
+        audio_file = tmp_path / "speech.wav"
+        audio_file.write_bytes(b"")
+        model = Mock()
+        model.transcribe.return_value = {
+            "text": "hi",
+            "segments": [{"start": 0.0, "end": 1.0, "text": "hi"}],
+        }
+
+        with patch.object(audio, "_ensure_whisper", return_value=True), patch.dict(
+            audio._WHISPER_MODELS, {("copy-test", "int8"): model}
+        ):
+            tool = audio.WhisperTool(
+                model_name="copy-test", output_dir=str(tmp_path), compute_type="int8"
+            )
+            first = tool.transcribe(str(audio_file))
+            first["segments"].clear()
+            tool_ref = weakref.ref(tool)
+            del tool
+            gc.collect()
+            second = audio.WhisperTool(
+                model_name="copy-test", output_dir=str(tmp_path), compute_type="int8"
+            ).transcribe(str(audio_file))
+
+        assert tool_ref() is None
+        assert second["segments"] == [{"start": 0.0, "end": 1.0, "text": "hi"}]
+        assert model.transcribe.call_count == 1
+
+    def test_transcribe_passes_decoded_array(self, tmp_path):
+        """Test 16 kHz audio is decoded in-process and handed to Whisper as an array."""
+        np = pytest.importorskip("numpy")
+        sf = pytest.importorskip("soundfile")
+        from src.tools import audio
+
+        path = tmp_path / "speech.wav"
+        sf.write(str(path), np.zeros(1600, dtype=np.float32), audio.WHISPER_SAMPLE_RATE)
+        model = Mock()
+        model.transcribe.return_value = {"text": "", "segments": []}
+
+        with patch.object(audio, "_ensure_whisper", return_value=True), patch.dict(
+            audio._WHISPER_MODELS, {("array-test", "int8"): model}
+        ):
+            tool = audio.WhisperTool(
+                model_name="array-test", output_dir=str(tmp_path), compute_type="int8"
+            )
+            assert tool.transcribe(str(path)) == {"text": "", "segments": []}
+
+        passed = model.transcribe.call_args[0][0]
+        assert isinstance(passed, np.ndarray)
+        assert passed.dtype == np.float32 and passed.shape == (1600,)
+
+    def test_concurrent_tools_share_one_model_load(self):
+        """Test WhisperTools loading from many threads load the weights once."""
+        from concurrent.futures import ThreadPoolExecutor
+        from src.tools import audio
+
+        fake_whisper = Mock()
+        fake_whisper.load_model.side_effect = lambda *args, **kwargs: object()
+
+        def load(_):
+            return audio.WhisperTool(model_name="shared", compute_type="int8")._load_model()
+
+        with patch.object(audio, "_ensure_whisper", return_value=True), patch.object(
+            audio, "_ensure_faster_whisper", return_value=False
+        ), patch.object(audio, "whisper", fake_whisper, create=True), patch.dict(
+            audio._WHISPER_MODELS, clear=True
+        ):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                models = list(executor.map(load, range(16)))
+
+        assert fake_whisper.load_model.call_count == 1
+        assert all(model is models[0] for model in models)
+
+    def test_auto_compute_type_is_int8_on_cpu(self):
+        """Test "auto" precision resolves to int8 without CUDA."""
+        from src.tools import audio
+
+        with patch.object(audio, "_whisper_device", return_value="cpu"):
+            assert audio._resolve_compute_type("auto") == "int8"
+        with patch.object(audio, "_whisper_device", return_value="cuda"):
+            assert audio._resolve_compute_type("auto") == "float16"
+        assert audio._resolve_compute_type("float32") == "float32"
+
+    def test_faster_whisper_device_from_ctranslate2(self):
+        """Test CUDA is detected through CTranslate2 for faster-whisper."""
+        import sys
+        from src.tools import audio
+
+        ctranslate2 = Mock()
+        ctranslate2.get_cuda_device_count.return_value = 1
+        audio._whisper_device.cache_clear()
+        try:
+            with patch.object(audio, "_ensure_faster_whisper", return_value=True), patch.dict(
+                sys.modules, {"ctranslate2": ctranslate2, "torch": None}
+            ):
+                assert audio._whisper_device() == "cuda"
+        finally:
+            audio._whisper_device.cache_clear()
+
+    def test_faster_whisper_result_reshaped(self):
+        """Test faster-whisper output is converted to the Whisper dict shape."""
+        from src.tools import audio
+
+        class FakeFasterWhisperModel:
+            def transcribe(self, audio_path, **kwargs):
+                segments = iter([
+                    Mock(id=0, start=0.0, end=1.0, text=" Hello"),
+                    Mock(id=1, start=1.0, end=2.0, text=" there."),
+                ])
+                return segments, Mock(language="en")
+
+        with patch.object(audio, "_ensure_faster_whisper", return_value=True), patch.object(
+            audio, "FasterWhisperModel", FakeFasterWhisperModel, create=True
+        ):
+            result = audio._run_whisper(FakeFasterWhisperModel(), "speech.wav")
+
+        assert result["text"] == " Hello there."
+        assert result["language"] == "en"
+        assert [s["end"] for s in result["segments"]] == [1.0, 2.0]
+
 
 class TestPillowTool:
     """Tests for PillowTool."""
@@ -297,6 +711,180 @@ class TestDeepFaceTool:
         tool = DeepFaceTool()
         assert tool.available == DEEPFACE_AVAILABLE
 
+    def test_models_preloaded_once(self, tmp_path):
+        """Test models are built at init and reused by later calls."""
+        from src.tools import face
+
+        deepface = Mock()
+        deepface.verify.return_value = {"verified": True}
+        with patch.object(face, "DEEPFACE_AVAILABLE", True), \
+                patch.object(face, "DeepFace", deepface, create=True):
+            tool = face.DeepFaceTool(
+                preload_models=["VGG-Face", "Emotion"], database_path=str(tmp_path)
+            )
+            assert tool.verify_faces("a.jpg", "b.jpg") == {"verified": True}
+            tool.verify_faces("a.jpg", "b.jpg", model_name="Facenet")
+
+        built = [call.kwargs for call in deepface.build_model.call_args_list]
+        assert built == [
+            {"model_name": "VGG-Face", "task": "facial_recognition"},
+            {"model_name": "Emotion", "task": "facial_attribute"},
+            {"model_name": "Facenet", "task": "facial_recognition"},
+        ]
+        deepface.represent.assert_not_called()
+
+    def test_analyze_faces_batch(self):
+        """Test batch analysis warms attribute models once and keeps order."""
+        from src.tools import face
+
+        deepface = Mock()
+
+        def analyze(img_path, **kwargs):
+            if img_path == "bad.jpg":
+                raise ValueError("unreadable image")
+            return {"dominant_emotion": img_path}
+
+        deepface.analyze.side_effect = analyze
+        with patch.object(face, "DEEPFACE_AVAILABLE", True), \
+                patch.object(face, "DeepFace", deepface, create=True):
+            tool = face.DeepFaceTool(preload_models=[])
+            results = tool.analyze_faces_batch(
+                ["a.jpg", "bad.jpg", "c.jpg"], actions=["emotion", "age"]
+            )
+
+        assert results == [
+            [{"dominant_emotion": "a.jpg"}],
+            None,
+            [{"dominant_emotion": "c.jpg"}],
+        ]
+        built = [call.kwargs["model_name"] for call in deepface.build_model.call_args_list]
+        assert built == ["Emotion", "Age"]
+
+    def test_analyze_faces_batch_runs_images_concurrently(self):
+        """Test batch images are analyzed at the same time, not one by one."""
+        import threading
+
+        from src.tools import face
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def analyze(img_path, **kwargs):
+            # Only returns once all three images are in flight together
+            barrier.wait()
+            return [{"dominant_emotion": img_path}]
+
+        deepface = Mock()
+        deepface.analyze.side_effect = analyze
+        with patch.object(face, "DEEPFACE_AVAILABLE", True), \
+                patch.object(face, "DeepFace", deepface, create=True):
+            tool = face.DeepFaceTool(preload_models=[])
+            results = tool.analyze_faces_batch(
+                ["a.jpg", "b.jpg", "c.jpg"], actions=["emotion"], max_workers=3
+            )
+            assert tool.analyze_faces_batch([]) == []
+
+        assert [r[0]["dominant_emotion"] for r in results] == ["a.jpg", "b.jpg", "c.jpg"]
+
+    def test_find_face_searches_persisted_index(self, tmp_path):
+        """Test database search embeds images once and reuses the saved index."""
+        from src.tools import face
+
+        vectors = {"alice.jpg": [1.0, 0.0], "bob.png": [0.0, 1.0], "query.jpg": [0.9, 0.1]}
+        for name in ("alice.jpg", "bob.png", "notes.txt"):
+            (tmp_path / name).write_text("x")
+        deepface = Mock()
+        deepface.represent.side_effect = lambda img_path, **kwargs: [
+            {"embedding": vectors[Path(img_path).name]}
+        ]
+        with patch.object(face, "DEEPFACE_AVAILABLE", True), \
+                patch.object(face, "FAISS_AVAILABLE", False), \
+                patch.object(face, "DeepFace", deepface, create=True):
+            tool = face.DeepFaceTool(preload_models=[], database_path=str(tmp_path))
+            assert deepface.represent.call_count == 2
+
+            matches = tool.find_face_in_database("query.jpg", str(tmp_path))
+            reloaded = face.DeepFaceTool(preload_models=[]).find_face_in_database(
+                "query.jpg", str(tmp_path)
+            )
+
+        assert [Path(m["identity"]).name for m in matches] == ["alice.jpg"]
+        assert matches[0]["distance"] < 0.01
+        assert reloaded == matches
+        assert deepface.represent.call_count == 4
+        deepface.find.assert_not_called()
+
+    def test_find_face_rebuilds_stale_index(self, tmp_path):
+        """Test images added after the index was saved trigger a rebuild."""
+        import os
+
+        from src.tools import face
+
+        vectors = {"alice.jpg": [1.0, 0.0], "bob.png": [0.0, 1.0], "query.jpg": [0.1, 0.9]}
+        (tmp_path / "alice.jpg").write_text("x")
+        deepface = Mock()
+        deepface.represent.side_effect = lambda img_path, **kwargs: [
+            {"embedding": vectors[Path(img_path).name]}
+        ]
+        with patch.object(face, "DEEPFACE_AVAILABLE", True), \
+                patch.object(face, "FAISS_AVAILABLE", False), \
+                patch.object(face, "DeepFace", deepface, create=True):
+            tool = face.DeepFaceTool(preload_models=[], database_path=str(tmp_path))
+            assert tool.find_face_in_database("query.jpg", str(tmp_path)) == []
+
+            (tmp_path / "bob.png").write_text("x")
+            matches = tool.find_face_in_database("query.jpg", str(tmp_path))
+            assert [Path(m["identity"]).name for m in matches] == ["bob.png"]
+
+            # A replaced image is re-embedded by a fresh instance as well
+            vectors["bob.png"] = [1.0, 0.0]
+            os.utime(tmp_path / "bob.png", ns=(0, 0))
+            reloaded = face.DeepFaceTool(preload_models=[])
+            assert reloaded.find_face_in_database("query.jpg", str(tmp_path)) == []
+
+        deepface.find.assert_not_called()
+
+    def test_find_face_falls_back_when_index_unavailable(self, tmp_path):
+        """Test an unsaved index is kept in memory and an unbuildable one uses DeepFace.find."""
+        from src.tools import face
+
+        (tmp_path / "alice.jpg").write_text("x")
+        deepface = Mock()
+        deepface.represent.return_value = [{"embedding": [1.0, 0.0]}]
+        deepface.find.return_value = []
+        with patch.object(face, "DEEPFACE_AVAILABLE", True), \
+                patch.object(face, "FAISS_AVAILABLE", False), \
+                patch.object(face, "DeepFace", deepface, create=True), \
+                patch.object(face.np, "save", side_effect=OSError("read-only")):
+            tool = face.DeepFaceTool(preload_models=[])
+            matches = tool.find_face_in_database("query.jpg", str(tmp_path))
+            assert [Path(m["identity"]).name for m in matches] == ["alice.jpg"]
+            deepface.find.assert_not_called()
+
+            deepface.represent.side_effect = ValueError("no face")
+            empty = tmp_path / "empty"
+            empty.mkdir()
+            assert tool.find_face_in_database("query.jpg", str(empty)) == []
+            deepface.find.assert_called_once()
+
+    def test_find_face_without_index_flattens_dataframes(self, tmp_path):
+        """Test the DeepFace.find fallback returns one dict per matched row."""
+        from src.tools import face
+
+        frame = Mock(empty=False)
+        frame.columns.tolist.return_value = ["identity", "distance"]
+        frame.to_numpy.return_value = [["a.jpg", 0.1], ["b.jpg", 0.3]]
+        deepface = Mock()
+        deepface.find.return_value = [frame, Mock(empty=True)]
+        with patch.object(face, "DEEPFACE_AVAILABLE", True), \
+                patch.object(face, "DeepFace", deepface, create=True):
+            tool = face.DeepFaceTool(preload_models=[])
+            matches = tool.find_face_in_database("q.jpg", str(tmp_path), use_index=False)
+
+        assert matches == [
+            {"identity": "a.jpg", "distance": 0.1},
+            {"identity": "b.jpg", "distance": 0.3},
+        ]
+
 
 class TestToolsModuleImport:
     """Tests for tools module imports."""